@@ -6,6 +6,7 @@ from sqlmodel import SQLModel
 
 from app import models  # noqa: F401
 from app.core.config import settings
+from app.data.task_partitions import DEFAULT_PARTITION, partition_month
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -23,6 +24,14 @@ def get_url():
   return str(settings.db.SQLALCHEMY_DATABASE_URI)
 
 
+def include_name(name, type_, parent_names):
+  # Partitions of tasks are managed by the partition worker, not the models
+  if type_ == "table":
+    return name != DEFAULT_PARTITION and partition_month(name) is None
+
+  return True
+
+
 def run_migrations_offline():
   """Run migrations in 'offline' mode.
 
@@ -41,6 +50,7 @@ def run_migrations_offline():
     target_metadata=target_metadata,
     literal_binds=True,
     compare_type=True,
+    include_name=include_name,
   )
 
   with context.begin_transaction():
@@ -52,8 +62,24 @@ def run_migrations_online():
 
   In this scenario we need to create an Engine
   and associate a connection with the context.
+  A connection passed in `config.attributes["connection"]` (e.g. by tests
+  migrating a scratch database) is used instead.
 
   """
+  connection = config.attributes.get("connection")
+  if connection is not None:
+    context.configure(
+      connection=connection,
+      target_metadata=target_metadata,
+      compare_type=True,
+      include_name=include_name,
+    )
+
+    with context.begin_transaction():
+      context.run_migrations()
+
+    return
+
   configuration = config.get_section(config.config_ini_section)
   configuration["sqlalchemy.url"] = get_url()
   connectable = engine_from_config(
@@ -67,6 +93,7 @@ def run_migrations_online():
       connection=connection,
       target_metadata=target_metadata,
       compare_type=True,
+      include_name=include_name,
     )
 
     with context.begin_transaction():
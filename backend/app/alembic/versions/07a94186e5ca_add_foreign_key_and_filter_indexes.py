@@ -0,0 +1,51 @@
+"""add foreign key and filter indexes
+
+Revision ID: 07a94186e5ca
+Revises: 7fe6b4642dc3
+Create Date: 2026-10-19 16:41:07.552903
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "07a94186e5ca"
+down_revision = "7fe6b4642dc3"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+# compliments.image_id is covered by ix_compliments_image_id_created_at and
+# posts.user_id by ix_posts_user_id.
+INDEXES = [
+  ("ix_images_post_id", "images", ["post_id"], None),
+  ("ix_images_post_id_primary", "images", ["post_id"], "is_primary"),
+  ("ix_compliments_generation_id", "compliments", ["generation_id"], None),
+  ("ix_posts_author_id", "posts", ["author_id"], None),
+  ("ix_tasks_post_id", "tasks", ["post_id"], None),
+  ("ix_tasks_image_id", "tasks", ["image_id"], None),
+  ("ix_authors_username", "authors", ["username"], None),
+]
+
+
+def upgrade():
+  # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and does not
+  # block writes to the table while the index is built. If a build fails,
+  # drop the INVALID index it leaves behind before retrying.
+  with op.get_context().autocommit_block():
+    for name, table, columns, where in INDEXES:
+      op.create_index(
+        name,
+        table,
+        columns,
+        unique=False,
+        postgresql_concurrently=True,
+        postgresql_where=sa.text(where) if where else None,
+      )
+
+
+def downgrade():
+  with op.get_context().autocommit_block():
+    for name, table, _, _ in reversed(INDEXES):
+      op.drop_index(name, table_name=table, postgresql_concurrently=True)
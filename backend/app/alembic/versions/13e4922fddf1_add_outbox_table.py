@@ -0,0 +1,32 @@
+"""add outbox table
+
+Revision ID: 13e4922fddf1
+Revises: 07a94186e5ca
+Create Date: 2026-10-19 18:22:45.301672
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "13e4922fddf1"
+down_revision = "07a94186e5ca"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+  op.create_table(
+    "outbox",
+    sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column("stream", sa.Text(), nullable=False),
+    sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint("id"),
+  )
+
+
+def downgrade():
+  op.drop_table("outbox")
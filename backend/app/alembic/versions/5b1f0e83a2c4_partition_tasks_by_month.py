@@ -0,0 +1,154 @@
+"""partition tasks by month
+
+Revision ID: 5b1f0e83a2c4
+Revises: 13e4922fddf1
+Create Date: 2026-10-19 19:05:12.418236
+
+"""
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5b1f0e83a2c4"
+down_revision = "13e4922fddf1"
+branch_labels = None
+depends_on = None
+
+# Must match app.data.task_partitions
+PARTITION_PREFIX = "tasks_p"
+DEFAULT_PARTITION = "tasks_default"
+# Partitions created ahead of the current month; the maintenance worker
+# (app.workers.task_partition_worker) keeps extending them.
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+  "id, type, status, error_message, started_at, ended_at, duration, "
+  "post_id, image_id, user_id, created_at, updated_at"
+)
+
+# (name, columns); the primary key (id, created_at) serves lookups by id
+INDEXES = [
+  ("ix_tasks_user_id", ["user_id"]),
+  ("ix_tasks_post_id", ["post_id"]),
+  ("ix_tasks_image_id", ["image_id"]),
+  ("ix_tasks_user_id_created_at_id", ["user_id", "created_at", "id"]),
+  ("ix_tasks_created_at_id", ["created_at", "id"]),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+  index = month.year * 12 + month.month - 1 + months
+  return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition(month: date) -> None:
+  op.execute(
+    f"CREATE TABLE {PARTITION_PREFIX}{month.year:04d}{month.month:02d} "
+    f"PARTITION OF tasks "
+    f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+    f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+  )
+
+
+def _create_tasks_table(*args, **kwargs) -> None:
+  op.create_table(
+    "tasks",
+    sa.Column("id", sa.Uuid(), nullable=False),
+    sa.Column(
+      "type",
+      postgresql.ENUM(name="tasktype", create_type=False),
+      nullable=False,
+    ),
+    sa.Column(
+      "status",
+      postgresql.ENUM(name="taskstatus", create_type=False),
+      server_default="pending",
+      nullable=False,
+    ),
+    sa.Column("error_message", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column("started_at", sa.DateTime(), nullable=True),
+    sa.Column("ended_at", sa.DateTime(), nullable=True),
+    sa.Column("duration", sa.Interval(), nullable=True),
+    sa.Column("post_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column("image_id", sa.Uuid(), nullable=True),
+    sa.Column("user_id", sa.Uuid(), nullable=True),
+    sa.Column(
+      "created_at",
+      sa.TIMESTAMP(timezone=True),
+      server_default=sa.text("now()"),
+      nullable=False,
+    ),
+    sa.Column("updated_at", sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(["image_id"], ["images.id"]),
+    sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    *args,
+    **kwargs,
+  )
+
+
+def upgrade():
+  # Rebuilds tasks as a table range-partitioned by created_at, one partition
+  # per month, and copies the existing rows over. This takes an exclusive
+  # lock on tasks for the duration of the copy; run it with the workers
+  # stopped. A partitioned table's primary key must include the partition
+  # key, so ids are only unique together with created_at.
+  op.rename_table("tasks", "tasks_unpartitioned")
+  op.execute(
+    "ALTER TABLE tasks_unpartitioned RENAME CONSTRAINT tasks_pkey "
+    "TO tasks_unpartitioned_pkey"
+  )
+
+  _create_tasks_table(
+    sa.PrimaryKeyConstraint("id", "created_at"),
+    postgresql_partition_by="RANGE (created_at)",
+  )
+
+  # Partition bounds are in UTC, from the oldest task to MONTHS_AHEAD ahead
+  oldest = op.get_bind().scalar(
+    sa.text("SELECT min(created_at) FROM tasks_unpartitioned")
+  )
+  now = datetime.now(timezone.utc)
+  oldest = (oldest or now).astimezone(timezone.utc)
+
+  month = date(oldest.year, oldest.month, 1)
+  last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+  while month <= last:
+    _create_partition(month)
+    month = _add_months(month, 1)
+
+  # Catches tasks of months the worker has not created a partition for yet
+  op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF tasks DEFAULT")
+
+  op.execute(f"INSERT INTO tasks ({COLUMNS}) SELECT {COLUMNS} FROM tasks_unpartitioned")
+  op.drop_table("tasks_unpartitioned")
+
+  # Created on the parent, these cascade to every current and future partition
+  for name, columns in INDEXES:
+    op.create_index(name, "tasks", columns, unique=False)
+
+
+def downgrade():
+  # Rows of partitions already detached and archived are not restored
+  op.rename_table("tasks", "tasks_partitioned")
+  op.execute(
+    "ALTER TABLE tasks_partitioned RENAME CONSTRAINT tasks_pkey "
+    "TO tasks_partitioned_pkey"
+  )
+  for name, _ in INDEXES:
+    op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+
+  _create_tasks_table(sa.PrimaryKeyConstraint("id"))
+  op.execute(f"INSERT INTO tasks ({COLUMNS}) SELECT {COLUMNS} FROM tasks_partitioned")
+
+  # Dropping the parent drops its partitions
+  op.drop_table("tasks_partitioned")
+
+  op.create_index("ix_tasks_id", "tasks", ["id"], unique=False)
+  for name, columns in INDEXES:
+    op.create_index(name, "tasks", columns, unique=False)
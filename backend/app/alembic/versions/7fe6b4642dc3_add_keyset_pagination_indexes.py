@@ -0,0 +1,51 @@
+"""add keyset pagination indexes
+
+Revision ID: 7fe6b4642dc3
+Revises: 9c368ae7509f
+Create Date: 2026-10-19 14:03:52.118734
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7fe6b4642dc3"
+down_revision = "9c368ae7509f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+  op.create_index(
+    "ix_tasks_user_id_created_at_id",
+    "tasks",
+    ["user_id", "created_at", "id"],
+    unique=False,
+  )
+  op.create_index(
+    "ix_tasks_created_at_id",
+    "tasks",
+    ["created_at", "id"],
+    unique=False,
+  )
+  op.create_index(op.f("ix_posts_user_id"), "posts", ["user_id"], unique=False)
+  op.create_index(
+    "ix_compliments_created_at_id",
+    "compliments",
+    ["created_at", "id"],
+    unique=False,
+  )
+  op.create_index(
+    "ix_compliments_image_id_created_at",
+    "compliments",
+    ["image_id", "created_at"],
+    unique=False,
+  )
+
+
+def downgrade():
+  op.drop_index("ix_compliments_image_id_created_at", table_name="compliments")
+  op.drop_index("ix_compliments_created_at_id", table_name="compliments")
+  op.drop_index(op.f("ix_posts_user_id"), table_name="posts")
+  op.drop_index("ix_tasks_created_at_id", table_name="tasks")
+  op.drop_index("ix_tasks_user_id_created_at_id", table_name="tasks")
@@ -0,0 +1,76 @@
+"""add user task stats table
+
+Revision ID: a3d9c41f7e26
+Revises: 5b1f0e83a2c4
+Create Date: 2026-10-19 20:12:38.604117
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a3d9c41f7e26"
+down_revision = "5b1f0e83a2c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+  op.create_table(
+    "user_task_stats",
+    sa.Column("user_id", sa.Uuid(), nullable=False),
+    sa.Column("day", sa.Date(), nullable=False),
+    sa.Column(
+      "type",
+      postgresql.ENUM(name="tasktype", create_type=False),
+      nullable=False,
+    ),
+    sa.Column("done_count", sa.Integer(), nullable=False),
+    sa.Column("failed_count", sa.Integer(), nullable=False),
+    sa.Column("skipped_count", sa.Integer(), nullable=False),
+    sa.Column("duration_ms_total", sa.BigInteger(), nullable=False),
+    sa.Column("duration_count", sa.Integer(), nullable=False),
+    sa.Column("prompt_token_count", sa.BigInteger(), nullable=False),
+    sa.Column("candidates_token_count", sa.BigInteger(), nullable=False),
+    sa.Column("total_token_count", sa.BigInteger(), nullable=False),
+    sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+    sa.PrimaryKeyConstraint("user_id", "day", "type"),
+  )
+  op.create_index("ix_user_task_stats_day", "user_task_stats", ["day"], unique=False)
+
+  # Backfill counts and durations from the tasks still in the table. Tasks
+  # do not reference their generation metadata, so token totals start at 0
+  # and are counted from here on.
+  op.execute(
+    """
+    INSERT INTO user_task_stats (
+      user_id, day, type,
+      done_count, failed_count, skipped_count,
+      duration_ms_total, duration_count,
+      prompt_token_count, candidates_token_count, total_token_count,
+      updated_at
+    )
+    SELECT
+      user_id,
+      coalesce(ended_at, updated_at, created_at AT TIME ZONE 'UTC')::date,
+      type,
+      count(*) FILTER (WHERE status = 'done'),
+      count(*) FILTER (WHERE status = 'failed'),
+      count(*) FILTER (WHERE status = 'skipped'),
+      coalesce(sum(round(extract(epoch FROM duration) * 1000)), 0),
+      count(duration),
+      0, 0, 0,
+      now()
+    FROM tasks
+    WHERE user_id IS NOT NULL AND status IN ('done', 'failed', 'skipped')
+    GROUP BY 1, 2, 3
+    """
+  )
+
+
+def downgrade():
+  op.drop_index("ix_user_task_stats_day", table_name="user_task_stats")
+  op.drop_table("user_task_stats")
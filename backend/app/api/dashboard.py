@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Query, Request
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from app.api.deps import TaskServiceDep
+from app.utils.pagination import InvalidCursorError
 
 router = APIRouter(
   prefix="/dashboard",
@@ -17,24 +20,51 @@ templates = Jinja2Templates(directory="app/templates")
 async def list_tasks(
   request: Request,
   task_service: TaskServiceDep,
-  skip: int = Query(0, ge=0),
+  cursor: Optional[str] = Query(None),
   limit: int = Query(20, ge=1, le=100),
 ):
-  """List all tasks."""
+  """List all tasks, newest first."""
+
+  try:
+    page = await task_service.get_all_tasks(
+      limit=limit,
+      cursor=cursor,
+      include_total=cursor is None,
+    )
 
-  tasks = await task_service.get_all_tasks(skip=skip, limit=limit)
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
   return templates.TemplateResponse(
     request=request,
     name="tasks/list.html",
     context={
-      "tasks": tasks,
-      "skip": skip,
+      "tasks": page.items,
+      "cursor": cursor,
+      "next_cursor": page.next_cursor,
+      "total_estimate": page.total_estimate,
       "limit": limit,
     },
   )
 
 
+@router.get("/tasks/stats", response_class=HTMLResponse)
+async def task_stats(
+  request: Request,
+  task_service: TaskServiceDep,
+  days: int = Query(30, ge=1, le=366),
+):
+  """Task outcomes of all users per day, from the maintained stats table."""
+
+  stats = await task_service.get_task_stats(days=days)
+
+  return templates.TemplateResponse(
+    request=request,
+    name="tasks/stats.html",
+    context={"stats": stats, "days": days},
+  )
+
+
 @router.get("/tasks/{id}", response_class=HTMLResponse)
 async def view_task(request: Request, id: str):
   """View a single task."""
@@ -17,6 +17,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core import security
 from app.core.config import settings
 from app.core.db import async_session
+from app.core.db_routing import READ_ONLY_KEY, USER_KEY
 from app.models import User
 from app.schemas import TokenPayload
 from app.service import (
@@ -38,6 +39,21 @@ async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
 
 
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_db_async)]
+
+
+def get_db_read_only(session: AsyncSessionDep) -> AsyncSession:
+  """
+  Get the request's session marked read-only.
+
+  Its SELECTs may be served by the replica, except shortly after the
+  current user's own writes. Writes still go to the primary.
+  """
+
+  session.info[READ_ONLY_KEY] = True
+  return session
+
+
+ReadOnlySessionDep = Annotated[AsyncSession, Depends(get_db_read_only)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
@@ -120,6 +136,8 @@ async def get_current_user(
     )
 
   request.state.user = user
+  # Lets the session keep this user's reads on the primary after a write
+  session.info[USER_KEY] = user.id
 
   return user
 
@@ -129,12 +147,15 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 
 async def get_current_user_ws(
   websocket: WebSocket,
-  session: AsyncSessionDep,
   token: str | None = None,
 ) -> User:
   """
   Dependency for WebSocket authentication.
   Gets token from query params and validates the user.
+
+  The user is loaded with a short-lived session that is returned to the
+  pool before the handler runs, so a long-lived connection does not hold a
+  database connection for its whole lifetime.
   """
   if not token:
     token = websocket.query_params.get("token")
@@ -147,7 +168,9 @@ async def get_current_user_ws(
     raise WebSocketDisconnect()
 
   try:
-    user = await _get_user_from_token(token=token, session=session)
+    async with async_session() as session:
+      user = await _get_user_from_token(token=token, session=session)
+
     return user
 
   except HTTPException as e:
@@ -212,6 +235,15 @@ def get_post_service(session: AsyncSessionDep) -> PostService:
 PostServiceDep = Annotated[PostService, Depends(get_post_service)]
 
 
+def get_post_service_read_only(session: ReadOnlySessionDep) -> PostService:
+  """Get the post service for read-only endpoints."""
+
+  return PostService(session=session)
+
+
+PostServiceReadOnlyDep = Annotated[PostService, Depends(get_post_service_read_only)]
+
+
 def get_task_service(session: AsyncSessionDep) -> TaskService:
   """Get the task service."""
 
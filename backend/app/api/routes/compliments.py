@@ -1,8 +1,8 @@
-import base64
-import io
+import asyncio
+import logging
 import os
 import uuid
-from typing import List
+from typing import Optional
 
 from fastapi import (
   APIRouter,
@@ -16,8 +16,6 @@ from fastapi import (
 )
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from PIL import Image as PILImage
-from redis.exceptions import RedisError
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.deps import (
@@ -28,12 +26,14 @@ from app.api.deps import (
   PostServiceDep,
   TaskServiceDep,
 )
+from app.core.config import settings
 from app.core.rate_limit import rate_limit_default
-from app.data.image import create_images
+from app.data.image import create_images, find_similar_images, make_image_ref
 from app.models import Image
 from app.schemas import (
-  ComplimentPublic,
+  ComplimentFeedPage,
   ComplimentRequest,
+  ComplimentsPage,
   ImageUploadResponse,
   TaskCreate,
   TaskPublic,
@@ -41,6 +41,17 @@ from app.schemas import (
   TranslateRequest,
   TranslateResponse,
 )
+from app.utils.image_hash import dhash, is_informative
+from app.utils.pagination import InvalidCursorError
+from app.utils.upload import (
+  ALLOWED_IMAGE_FORMATS,
+  UploadTooLargeError,
+  probe_image,
+  read_upload,
+  to_data_url,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/compliments", tags=["compliments"])
 
@@ -71,19 +82,15 @@ async def create_compliment(
   task_id = uuid.uuid4()
 
   try:
-    task_data = await task_service.create_task(
+    task_data = await task_service.enqueue_task(
       task_create=TaskCreate(
         id=task_id,
         type=TaskType.llm_generate,
         post_id=post_id,
         user_id=current_user.id,
-      )
-    )
-
-    redis_client = request.app.state.redis_client
-    await redis_client.xadd(
-      STREAM_NAME,
-      {
+      ),
+      stream=STREAM_NAME,
+      message={
         "task_id": str(task_id),
         "post_id": post_id,
         "user_id": str(current_user.id),
@@ -92,7 +99,7 @@ async def create_compliment(
 
     return JSONResponse(content=jsonable_encoder(task_data.model_dump()))
 
-  except (SQLAlchemyError, RedisError) as e:
+  except SQLAlchemyError as e:
     raise HTTPException(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
       detail=f"An unexpected error occurred: {e}",
@@ -139,34 +146,26 @@ async def upload_image(
       detail="File must be an image",
     )
 
-  allowed_formats = ["image/jpeg", "image/jpg", "image/png"]
-  if file.content_type not in allowed_formats:
+  expected_format = ALLOWED_IMAGE_FORMATS.get(file.content_type)
+  if not expected_format:
     raise HTTPException(
       status_code=status.HTTP_400_BAD_REQUEST,
       detail=f"Image format not supported. Allowed formats: jpg, jpeg, png. Got: {file.content_type}",
     )
 
-  # Read file content
-  file_content = await file.read()
+  # Read file content in chunks, rejecting oversized files early
+  try:
+    upload = await read_upload(file)
 
-  # Validate file size (10MB limit)
-  max_size = 10 * 1024 * 1024  # 10MB in bytes
-  if len(file_content) > max_size:
+  except UploadTooLargeError as e:
     raise HTTPException(
       status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-      detail=f"File size exceeds maximum allowed size of 10MB. File size: {len(file_content) / 1024 / 1024:.2f}MB",
+      detail=str(e),
     )
 
-  # Validate it's a valid image and get dimensions
+  # Validate it's a valid image and get dimensions off the event loop
   try:
-    image = PILImage.open(io.BytesIO(file_content))
-    width, height = image.size
-
-    # Verify it's actually a valid image
-    image.verify()
-
-    # Re-open after verify (verify closes the file)
-    image = PILImage.open(io.BytesIO(file_content))
+    probe = await asyncio.to_thread(probe_image, upload.content, expected_format)
 
   except Exception as e:
     raise HTTPException(
@@ -174,6 +173,15 @@ async def upload_image(
       detail=f"Invalid image file: {str(e)}",
     )
 
+  # Hash the content so duplicate uploads can share stored content
+  image_hash = None
+  if settings.ai.IMAGE_DEDUP_ENABLED:
+    try:
+      image_hash = await asyncio.to_thread(dhash, upload.content)
+
+    except Exception as e:
+      logger.warning("Could not hash uploaded image: %s", e)
+
   # Generate a unique post_id for the upload
   post_id = f"upload_{uuid.uuid4().hex[:11]}"
   task_id = uuid.uuid4()
@@ -185,42 +193,60 @@ async def upload_image(
       user_id=current_user.id,
     )
 
-    # Convert image to base64 data URL for storage
-    # For uploaded images, we'll store them as base64 data URLs
-    mime_type = file.content_type
-    base64_data = base64.b64encode(file_content).decode("utf-8")
-    storage_key = f"data:{mime_type};base64,{base64_data}"
-
     # Create image record
     image_record = Image(
       post_id=post_id,
-      storage_key=storage_key,
-      height=height,
-      width=width,
+      storage_key="",
+      height=probe.height,
+      width=probe.width,
       is_primary=True,
+      dhash=image_hash,
     )
 
+    duplicates = []
+    if image_hash is not None and is_informative(image_hash):
+      duplicates = await find_similar_images(
+        session=session,
+        dhash=image_hash,
+        uploads_only=True,
+      )
+
+    if duplicates:
+      # Point at the already stored copy instead of storing the bytes again
+      image_record.storage_key = make_image_ref(duplicates[0].id, image_record.id)
+
+    else:
+      # For uploaded images, we store them as base64 data URLs
+      image_record.storage_key = await asyncio.to_thread(
+        to_data_url,
+        upload.content,
+        file.content_type,
+      )
+
     # Save the image record to the database
     await create_images(
       session=session,
       images=[image_record],
     )
 
-    # Create task for compliment generation
-    task_data = await task_service.create_task(
+    logger.info(
+      "Stored upload for post %s (%d bytes, sha256=%s, duplicate=%s)",
+      post_id,
+      len(upload.content),
+      upload.sha256,
+      bool(duplicates),
+    )
+
+    # Create the compliment generation task and its queue message together
+    task_data = await task_service.enqueue_task(
       task_create=TaskCreate(
         id=task_id,
         type=TaskType.llm_generate,
         post_id=post_id,
         user_id=current_user.id,
-      )
-    )
-
-    # Add to Redis stream for worker processing
-    redis_client = request.app.state.redis_client
-    await redis_client.xadd(
-      STREAM_NAME,
-      {
+      ),
+      stream=STREAM_NAME,
+      message={
         "task_id": str(task_id),
         "post_id": post_id,
         "user_id": str(current_user.id),
@@ -229,7 +255,7 @@ async def upload_image(
 
     return JSONResponse(content=jsonable_encoder(task_data.model_dump()))
 
-  except (SQLAlchemyError, RedisError) as e:
+  except SQLAlchemyError as e:
     raise HTTPException(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
       detail=f"An unexpected error occurred: {e}",
@@ -238,7 +264,7 @@ async def upload_image(
 
 @router.get(
   "/",
-  response_model=List[ComplimentPublic],
+  response_model=ComplimentsPage,
   status_code=status.HTTP_200_OK,
 )
 @rate_limit_default
@@ -247,10 +273,9 @@ async def list_compliments(
   *,
   current_user: CurrentUser,
   compliment_service: ComplimentServiceDep,
-  skip: int = Query(
-    0,
-    ge=0,
-    description="Number of compliments to skip",
+  cursor: Optional[str] = Query(
+    None,
+    description="Opaque cursor from the previous page's next_cursor",
   ),
   limit: int = Query(
     20,
@@ -258,23 +283,74 @@ async def list_compliments(
     le=100,
     description="Number of compliments to return",
   ),
+  include_total: bool = Query(
+    False,
+    description="Include an estimated total (from planner statistics)",
+  ),
 ) -> JSONResponse:
   """
-  List all compliments for the current user.
+  List compliments for the current user, newest first.
 
   Superusers will see all compliments in the system.
   Regular users will only see their own compliments.
+  Pass `next_cursor` back as `cursor` to fetch the following page.
   """
 
-  compliments_data = await compliment_service.get_all_compliments(
-    skip=skip,
-    limit=limit,
-    user_id=(None if current_user.is_superuser else current_user.id),
-  )
+  try:
+    page = await compliment_service.get_all_compliments(
+      limit=limit,
+      cursor=cursor,
+      user_id=(None if current_user.is_superuser else current_user.id),
+      include_total=include_total,
+    )
+
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+  return JSONResponse(content=jsonable_encoder(page.model_dump()))
+
+
+@router.get(
+  "/feed",
+  response_model=ComplimentFeedPage,
+  status_code=status.HTTP_200_OK,
+)
+@rate_limit_default
+async def list_compliment_feed(
+  request: Request,
+  *,
+  current_user: CurrentUser,
+  compliment_service: ComplimentServiceDep,
+  cursor: Optional[str] = Query(
+    None,
+    description="Opaque cursor from the previous page's next_cursor",
+  ),
+  limit: int = Query(
+    20,
+    ge=1,
+    le=100,
+    description="Number of compliments to return",
+  ),
+) -> JSONResponse:
+  """
+  List compliment cards for the current user, newest first.
+
+  Unlike `/compliments/`, every item embeds the image dimensions and URL,
+  the post caption and author and the generation metadata, so a card can
+  be rendered without further requests.
+  """
+
+  try:
+    page = await compliment_service.get_compliment_feed(
+      limit=limit,
+      cursor=cursor,
+      user_id=(None if current_user.is_superuser else current_user.id),
+    )
 
-  compliments = [compliment.model_dump() for compliment in compliments_data]
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-  return JSONResponse(content=jsonable_encoder(compliments))
+  return JSONResponse(content=jsonable_encoder(page.model_dump()))
 
 
 @router.post(
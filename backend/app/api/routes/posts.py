@@ -8,7 +8,7 @@ from fastapi import (
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
-from app.api.deps import CurrentUser, PostServiceDep
+from app.api.deps import CurrentUser, PostServiceReadOnlyDep
 from app.core.rate_limit import rate_limit_default
 from app.schemas import PostPublic
 
@@ -25,7 +25,7 @@ async def get_post_by_id(
   request: Request,
   *,
   current_user: CurrentUser,
-  post_service: PostServiceDep,
+  post_service: PostServiceReadOnlyDep,
   post_id: str,
 ) -> JSONResponse:
   """Get a post by its ID."""
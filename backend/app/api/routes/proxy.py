@@ -1,13 +1,17 @@
 import asyncio
 import base64
-import io
 import logging
+import time
 import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict
 
 import httpx
+from cachetools import TTLCache
 from fastapi import (
   APIRouter,
   HTTPException,
+  Query,
   Request,
   status,
 )
@@ -15,42 +19,68 @@ from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.deps import CurrentUser, ImageServiceDep
-from app.core.rate_limit import rate_limit_default
+from app.core.rate_limit import limiter, rate_limit_default
+from app.core.security import verify_image_signature
+from app.utils.instagram import parse_cdn_expiry
 
 logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/images", tags=["images"])
 
+CORS_HEADERS = {
+  "Access-Control-Allow-Origin": "*",
+  "Cross-Origin-Resource-Policy": "cross-origin",
+}
 
-@router.get("/{image_id}/view")
-@rate_limit_default
-async def view_image_by_id(
-  request: Request,
-  *,
-  current_user: CurrentUser,
-  image_service: ImageServiceDep,
-  image_id: str,
-):
-  """View an image by its ID."""
+# Resolved storage keys, so that signed views can skip the database once an
+# image has been seen. Keys do change: the CDN refresh worker re-signs remote
+# URLs ahead of their expiry and deleting a canonical image re-points its
+# references (to the same content). A cached key is therefore only served
+# while it stays valid, see _is_cacheable. The cache is bounded by the total
+# length of the keys, as uploads are stored inline as data URLs of up to a
+# few megabytes.
+STORAGE_KEY_CACHE_SECONDS = 600
+_storage_key_cache: TTLCache[uuid.UUID, str] = TTLCache(
+  maxsize=64 * 1024 * 1024,
+  ttl=STORAGE_KEY_CACHE_SECONDS,
+  getsizeof=len,
+)
 
-  try:
-    uuid.UUID(image_id)
+# Images that were not found, so that repeated views of a deleted image do
+# not query the database either. Kept briefly, as a signed URL outlives it.
+_missing_image_cache: TTLCache[uuid.UUID, bool] = TTLCache(maxsize=4096, ttl=60)
 
-  except ValueError:
-    raise HTTPException(
-      status_code=status.HTTP_400_BAD_REQUEST,
-      detail=f"Invalid image_id: {image_id}",
-    )
 
-  image = await image_service.get_image_by_id(
-    image_id=image_id,
-    user_id=current_user.id,
+def _is_cacheable(storage_key: str) -> bool:
+  """
+  Whether a storage key can be cached for STORAGE_KEY_CACHE_SECONDS.
+
+  A signed CDN URL is only cached if it outlives the cache entry, so a URL
+  that the refresh worker replaced is at worst served while it still works.
+  """
+
+  if len(storage_key) > _storage_key_cache.maxsize:
+    return False
+
+  expires_at = parse_cdn_expiry(storage_key)
+  if expires_at is None:
+    return True
+
+  cached_until = datetime.now(timezone.utc) + timedelta(
+    seconds=STORAGE_KEY_CACHE_SECONDS
   )
-  if not image:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+  return expires_at > cached_until
+
 
-  storage_key = image.storage_key
+def _image_response(
+  storage_key: str,
+  image_id: str,
+  extra_headers: Dict[str, str] | None = None,
+) -> Response:
+  """Build a response serving the image content behind a storage key."""
+
+  headers = {**CORS_HEADERS, **(extra_headers or {})}
 
   # Handle base64 data URLs (from file uploads)
   if storage_key.startswith("data:"):
@@ -71,10 +101,7 @@ async def view_image_by_id(
       return Response(
         content=image_bytes,
         media_type=mime_type,
-        headers={
-          "Access-Control-Allow-Origin": "*",
-          "Cross-Origin-Resource-Policy": "cross-origin",
-        },
+        headers=headers,
       )
 
     except Exception as e:
@@ -98,10 +125,7 @@ async def view_image_by_id(
     return StreamingResponse(
       stream_body(),
       media_type="image/jpeg",
-      headers={
-        "Access-Control-Allow-Origin": "*",
-        "Cross-Origin-Resource-Policy": "cross-origin",
-      },
+      headers=headers,
     )
 
   except httpx.HTTPStatusError as e:
@@ -120,7 +144,7 @@ async def view_image_by_id(
       detail="Could not connect to the upstream server.",
     )
 
-  except (SQLAlchemyError, asyncio.TimeoutError) as e:
+  except asyncio.TimeoutError as e:
     logger.exception(
       "Unexpected error while fetching image %s: %s",
       image_id,
@@ -131,3 +155,104 @@ async def view_image_by_id(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
       detail="Internal server error",
     )
+
+
+@router.get("/{image_id}/view")
+@rate_limit_default
+async def view_image_by_id(
+  request: Request,
+  *,
+  current_user: CurrentUser,
+  image_service: ImageServiceDep,
+  image_id: str,
+):
+  """View an image by its ID."""
+
+  try:
+    uuid.UUID(image_id)
+
+  except ValueError:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Invalid image_id: {image_id}",
+    )
+
+  try:
+    image = await image_service.get_image_by_id(
+      image_id=image_id,
+      user_id=current_user.id,
+    )
+    if not image:
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    # Duplicate uploads reference the content of the first stored copy
+    storage_key = await image_service.resolve_storage_key(image.storage_key)
+    if not storage_key:
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+  except SQLAlchemyError as e:
+    logger.exception("Unexpected error while fetching image %s: %s", image_id, e)
+
+    raise HTTPException(
+      status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+      detail="Internal server error",
+    )
+
+  return _image_response(storage_key=storage_key, image_id=image_id)
+
+
+@router.get("/{image_id}/signed")
+@limiter.exempt
+async def view_signed_image(
+  request: Request,
+  *,
+  image_service: ImageServiceDep,
+  image_id: uuid.UUID,
+  exp: int = Query(..., description="Expiry of the signed URL (unix time)"),
+  sig: str = Query(..., description="URL signature"),
+):
+  """
+  View an image through a signed URL.
+
+  The signature is verified statelessly, so no user lookup or ownership
+  query is needed. Responses are publicly cacheable until the URL expires,
+  which lets a CDN or the browser serve repeated views.
+  """
+
+  if not verify_image_signature(image_id, exp, sig):
+    raise HTTPException(
+      status_code=status.HTTP_403_FORBIDDEN,
+      detail="Invalid or expired image signature",
+    )
+
+  if image_id in _missing_image_cache:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+  storage_key = _storage_key_cache.get(image_id)
+
+  if not storage_key:
+    try:
+      storage_key = await image_service.get_storage_key(image_id)
+
+    except SQLAlchemyError as e:
+      logger.exception("Unexpected error while fetching image %s: %s", image_id, e)
+
+      raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="Internal server error",
+      )
+
+    if not storage_key:
+      _missing_image_cache[image_id] = True
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if _is_cacheable(storage_key):
+      _storage_key_cache[image_id] = storage_key
+
+  max_age = max(exp - int(time.time()), 0)
+
+  return _image_response(
+    storage_key=storage_key,
+    image_id=str(image_id),
+    extra_headers={"Cache-Control": f"public, max-age={max_age}, immutable"},
+  )
@@ -1,7 +1,8 @@
+import json
 import logging
 import os
 import uuid
-from typing import List
+from typing import Dict, List, Optional
 
 from fastapi import (
   APIRouter,
@@ -12,27 +13,35 @@ from fastapi import (
 )
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from redis.exceptions import RedisError
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.deps import (
   CurrentUser,
-  PostServiceDep,
   TaskServiceDep,
 )
 from app.core.rate_limit import rate_limit_default
+from app.core.redis_keys import BATCH_KEY
+from app.core.security import create_subscription_token
 from app.schemas import (
-  TaskCreate,
+  TaskBatchItem,
+  TaskBatchPublic,
+  TaskCreatedPublic,
   TaskPublic,
-  TaskType,
+  TasksPage,
+  TaskStatsPublic,
 )
 from app.utils.instagram import extract_shortcode_from_url
+from app.utils.pagination import InvalidCursorError
 
 STREAM_NAME = os.getenv("REDIS_STREAM", "tasks:instagram_download:stream")
 
 REDIS_CHANNEL_OUTPUT = "tasks:instagram_download:output"
 
+BATCH_TTL_SECONDS = 24 * 60 * 60
+MAX_BATCH_SIZE = 50
+
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
@@ -42,12 +51,18 @@ class CreateTaskDownload(BaseModel):
   url: str
 
 
+class CreateTaskDownloadBatch(BaseModel):
+  """Schema for creating many download tasks at once."""
+
+  urls: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 logger = logging.getLogger(__name__)
 
 
 @router.post(
   "/download",
-  response_model=TaskPublic,
+  response_model=TaskCreatedPublic,
   status_code=status.HTTP_202_ACCEPTED,
 )
 @rate_limit_default
@@ -55,7 +70,6 @@ async def create_task_download(
   request: Request,
   *,
   current_user: CurrentUser,
-  post_service: PostServiceDep,
   task_service: TaskServiceDep,
   obj_in: CreateTaskDownload,
 ) -> JSONResponse:
@@ -63,10 +77,12 @@ async def create_task_download(
   Create a new Instagram download task.
 
   Requires authentication. The task will be associated with the current user.
+  The post, the task and its queue message are written in one transaction.
+  The returned `subscription_token` lets `/ws/{task_id}` be watched without
+  a database lookup.
   """
 
   try:
-    task_id = uuid.uuid4()
     post_id = extract_shortcode_from_url(obj_in.url)
 
     if not post_id:
@@ -75,41 +91,20 @@ async def create_task_download(
         detail="Invalid Instagram URL or shortcode not found.",
       )
 
-    user_id = current_user.id
-
-    existing_post = await post_service.get_post_by_id(
-      post_id=post_id,
-      user_id=user_id,
+    tasks = await task_service.create_download_tasks(
+      urls={post_id: obj_in.url},
+      user_id=current_user.id,
+      stream=STREAM_NAME,
     )
-    if existing_post:
+
+    task_data = tasks.get(post_id)
+    if not task_data:
       raise HTTPException(
         status_code=status.HTTP_409_CONFLICT,
         detail=f"Post with id {post_id} already exists",
       )
 
-    await post_service.create_post(
-      post_id=post_id,
-      user_id=user_id,
-    )
-
-    task_data = await task_service.create_task(
-      task_create=TaskCreate(
-        id=task_id,
-        type=TaskType.instagram_download,
-        post_id=post_id,
-        user_id=current_user.id,
-      )
-    )
-
-    redis_client = request.app.state.redis_client
-    await redis_client.xadd(
-      STREAM_NAME,
-      {
-        "task_id": str(task_id),
-        "url": obj_in.url,
-        "user_id": str(current_user.id),
-      },
-    )
+    task_id = task_data.id
 
     logger.info(
       "Task %s created by user %s for post %s",
@@ -118,7 +113,11 @@ async def create_task_download(
       post_id,
     )
 
-    return JSONResponse(content=jsonable_encoder(task_data.model_dump()))
+    task_created = TaskCreatedPublic(
+      **task_data.model_dump(),
+      subscription_token=create_subscription_token(f"task:{task_id}"),
+    )
+    return JSONResponse(content=jsonable_encoder(task_created.model_dump()))
 
   except ValueError as e:
     logger.error("ValueError while creating task: %s", e)
@@ -127,7 +126,7 @@ async def create_task_download(
   except HTTPException:
     raise
 
-  except (SQLAlchemyError, RedisError) as e:
+  except SQLAlchemyError as e:
     logger.exception("Unexpected error while creating task: %s", e)
     raise HTTPException(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -135,6 +134,155 @@ async def create_task_download(
     )
 
 
+@router.post(
+  "/download/batch",
+  response_model=TaskBatchPublic,
+  status_code=status.HTTP_202_ACCEPTED,
+)
+@rate_limit_default
+async def create_task_download_batch(
+  request: Request,
+  *,
+  current_user: CurrentUser,
+  task_service: TaskServiceDep,
+  obj_in: CreateTaskDownloadBatch,
+) -> JSONResponse:
+  """
+  Create Instagram download tasks for many URLs in one request.
+
+  All posts, tasks and their queue messages are inserted in a single
+  transaction. Each URL gets its own outcome, and the
+  returned batch ID can be watched over `/ws/batch/{batch_id}`, using the
+  `subscription_token` to skip authentication there.
+  """
+
+  batch_id = uuid.uuid4()
+  user_id = current_user.id
+
+  # (url, post_id, error) for every requested URL, in request order
+  parsed: List[tuple[str, Optional[str], Optional[str]]] = []
+  urls: Dict[str, str] = {}
+
+  for url in obj_in.urls:
+    try:
+      shortcode = extract_shortcode_from_url(url)
+
+    except ValueError as e:
+      parsed.append((url, None, str(e)))
+      continue
+
+    if shortcode in urls:
+      parsed.append((url, shortcode, "Duplicate URL in batch"))
+      continue
+
+    urls[shortcode] = url
+    parsed.append((url, shortcode, None))
+
+  try:
+    tasks = await task_service.create_download_tasks(
+      urls=urls,
+      user_id=user_id,
+      stream=STREAM_NAME,
+    )
+
+    items: List[TaskBatchItem] = []
+    for url, post_id, error in parsed:
+      if not post_id:
+        items.append(TaskBatchItem(url=url, status="invalid", detail=error))
+
+      elif error or post_id not in tasks:
+        items.append(
+          TaskBatchItem(
+            url=url,
+            status="conflict",
+            post_id=post_id,
+            detail=error or f"Post with id {post_id} already exists",
+          )
+        )
+
+      else:
+        items.append(
+          TaskBatchItem(
+            url=url,
+            status="accepted",
+            post_id=post_id,
+            task_id=tasks[post_id].id,
+          )
+        )
+
+    accepted = [item for item in items if item.task_id]
+
+    redis_client = request.app.state.redis_client
+    async with redis_client.pipeline(transaction=False) as pipe:
+      batch_key = BATCH_KEY.format(batch_id=batch_id)
+      pipe.hset(
+        batch_key,
+        mapping={
+          "user_id": str(user_id),
+          "task_ids": json.dumps([str(item.task_id) for item in accepted]),
+        },
+      )
+      pipe.expire(batch_key, BATCH_TTL_SECONDS)
+
+      await pipe.execute()
+
+    logger.info(
+      "Batch %s created by user %s: %d of %d URLs accepted",
+      batch_id,
+      user_id,
+      len(accepted),
+      len(items),
+    )
+
+    batch = TaskBatchPublic(
+      batch_id=batch_id,
+      items=items,
+      subscription_token=create_subscription_token(f"batch:{batch_id}"),
+    )
+    return JSONResponse(content=jsonable_encoder(batch.model_dump()))
+
+  except (SQLAlchemyError, RedisError) as e:
+    logger.exception("Unexpected error while creating task batch: %s", e)
+    raise HTTPException(
+      status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+      detail="Internal server error",
+    )
+
+
+@router.get(
+  "/stats",
+  response_model=TaskStatsPublic,
+  status_code=status.HTTP_200_OK,
+)
+@rate_limit_default
+async def get_task_stats(
+  request: Request,
+  *,
+  current_user: CurrentUser,
+  task_service: TaskServiceDep,
+  days: int = Query(
+    30,
+    ge=1,
+    le=366,
+    description="Number of days to report, ending today (UTC)",
+  ),
+) -> JSONResponse:
+  """
+  Get counts, success rate, average duration and token usage of finished
+  tasks, per day and type.
+
+  Superusers see the totals of all users.
+  Regular users only see their own tasks.
+  """
+
+  stats = await task_service.get_task_stats(
+    days=days,
+    user_id=(None if current_user.is_superuser else current_user.id),
+  )
+
+  return JSONResponse(content=jsonable_encoder(stats.model_dump()))
+
+
 @router.get(
   "/{task_id}",
   response_model=TaskPublic,
@@ -198,7 +346,7 @@ async def get_task_by_id(
 
 @router.get(
   "/",
-  response_model=List[TaskPublic],
+  response_model=TasksPage,
   status_code=status.HTTP_200_OK,
 )
 @rate_limit_default
@@ -207,10 +355,9 @@ async def list_user_tasks(
   *,
   current_user: CurrentUser,
   task_service: TaskServiceDep,
-  skip: int = Query(
-    0,
-    ge=0,
-    description="Number of tasks to skip",
+  cursor: Optional[str] = Query(
+    None,
+    description="Opaque cursor from the previous page's next_cursor",
   ),
   limit: int = Query(
     20,
@@ -218,20 +365,28 @@ async def list_user_tasks(
     le=100,
     description="Number of tasks to return",
   ),
+  include_total: bool = Query(
+    False,
+    description="Include an estimated total (from planner statistics)",
+  ),
 ) -> JSONResponse:
   """
-  List all tasks for the current user.
+  List tasks for the current user, newest first.
 
   Superusers will see all tasks in the system.
   Regular users will only see their own tasks.
+  Pass `next_cursor` back as `cursor` to fetch the following page.
   """
 
-  tasks_data = await task_service.get_all_tasks(
-    skip=skip,
-    limit=limit,
-    user_id=(None if current_user.is_superuser else current_user.id),
-  )
+  try:
+    page = await task_service.get_all_tasks(
+      limit=limit,
+      cursor=cursor,
+      user_id=(None if current_user.is_superuser else current_user.id),
+      include_total=include_total,
+    )
 
-  tasks = [task.model_dump() for task in tasks_data]
+  except InvalidCursorError as e:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-  return JSONResponse(content=jsonable_encoder(tasks))
+  return JSONResponse(content=jsonable_encoder(page.model_dump()))
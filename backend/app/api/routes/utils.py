@@ -1,4 +1,16 @@
-from fastapi import APIRouter
+import json
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from app.api.deps import get_current_active_superuser
+from app.core.db import get_pool_stats
+from app.schemas import ScraperBackendPublic, ScraperRoutingPublic
+from app.service.scrape_router import ROUTER_STATS_KEY
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -8,3 +20,45 @@ async def health_check() -> bool:
   """Health check endpoint."""
 
   return True
+
+
+@router.get(
+  "/scrapers",
+  response_model=ScraperRoutingPublic,
+  dependencies=[Depends(get_current_active_superuser)],
+)
+async def scraper_routing(request: Request) -> ScraperRoutingPublic:
+  """
+  Current routing weights of the scraper backends.
+
+  Published by the download workers when INSTAGRAM_SCRAPER is AUTO; empty
+  when no worker has routed a scrape recently.
+  """
+
+  try:
+    stats = await request.app.state.redis_client.hgetall(ROUTER_STATS_KEY)
+
+  except RedisError as e:
+    logger.error("Failed to read scraper weights: %s", e)
+
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Scraper weights are unavailable",
+    )
+
+  return ScraperRoutingPublic(
+    backends=[
+      ScraperBackendPublic.model_validate(json.loads(value))
+      for _, value in sorted(stats.items())
+    ]
+  )
+
+
+@router.get(
+  "/db-pool",
+  dependencies=[Depends(get_current_active_superuser)],
+)
+async def db_pool_stats() -> Dict[str, Any]:
+  """Connection pool occupancy and checkout wait metrics of this process."""
+
+  return get_pool_stats()
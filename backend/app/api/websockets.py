@@ -13,32 +13,44 @@ from fastapi import (
 )
 from redis.asyncio import Redis
 from redis.exceptions import RedisError
+from redis.typing import KeyT, StreamIdT
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.api.deps import CurrentUserWS, TaskServiceDep
+from app.api.deps import get_current_user_ws
+from app.core.db import async_session
+from app.core.redis_keys import BATCH_KEY
+from app.core.security import verify_subscription_token
+from app.models import User
+from app.service import TaskService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["websockets"])
 
 
-async def _forward_redis_stream(
+FINAL_STATUSES = ("done", "failed", "skipped")
+
+
+async def _forward_redis_streams(
   redis: Redis,
-  stream_name: str,
+  streams: Dict[str, Dict[str, Any]],
   websocket: WebSocket,
   start_id: str,
-  extra_payload: Dict[str, Any] | None = None,
 ) -> None:
   """
-  Reads a Redis Stream and sends messages to a WebSocket
-  until a final status ('done', 'failed', 'skipped') is received.
+  Reads Redis Streams and sends messages to a WebSocket until every
+  stream has received a final status ('done', 'failed', 'skipped').
+
+  Args:
+    streams: Maps each stream name to the extra payload merged into its
+      messages, e.g. the task ID the stream belongs to.
   """
 
-  last_id = start_id
+  last_ids: Dict[KeyT, StreamIdT] = {stream_name: start_id for stream_name in streams}
 
-  while True:
+  while last_ids:
     try:
-      resp = await redis.xread({stream_name: last_id}, block=15_000, count=50)
+      resp = await redis.xread(last_ids, block=15_000, count=50)
     except RedisError as exc:
       logger.exception("Redis XREAD failed: %s", exc)
       await asyncio.sleep(1)
@@ -47,48 +59,75 @@ async def _forward_redis_stream(
     if not resp:
       continue
 
-    _, messages = resp[0]
+    for stream_name, messages in resp:
+      extra_payload = streams[stream_name]
 
-    for msg_id, fields in messages:
-      last_id = msg_id
+      for msg_id, fields in messages:
+        last_ids[stream_name] = msg_id
 
-      payload = {}
-      if extra_payload:
-        payload.update(extra_payload)
+        payload = dict(extra_payload)
 
-      for key, value in fields.items():
-        if isinstance(value, str) and (value.startswith("{") or value.startswith("[")):
-          try:
-            payload[key] = json.loads(value)
+        for key, value in fields.items():
+          if isinstance(value, str) and (
+            value.startswith("{") or value.startswith("[")
+          ):
+            try:
+              payload[key] = json.loads(value)
 
-          except json.JSONDecodeError:
+            except json.JSONDecodeError:
+              payload[key] = value
+
+          else:
             payload[key] = value
 
-        else:
-          payload[key] = value
+        await websocket.send_json(payload)
 
-      await websocket.send_json(payload)
+        status = fields.get("status")
+        if status in FINAL_STATUSES:
+          logger.info(
+            "Final status '%s' received for task %s. Terminating stream listener.",
+            status,
+            extra_payload.get("task_id"),
+          )
+          del last_ids[stream_name]
+          break
 
-      status = fields.get("status")
-      if extra_payload and status in ("done", "failed", "skipped"):
-        logger.info(
-          "Final status '%s' received for task %s. Terminating stream listener.",
-          status,
-          extra_payload.get("task_id"),
-        )
-        return
+
+async def _authenticate_ws(
+  websocket: WebSocket,
+  resource: str,
+  subscription: str | None,
+) -> User | None:
+  """
+  Authorizes a WebSocket subscription to `resource`.
+
+  A valid signed subscription token short-circuits authentication without
+  touching the database and `None` is returned. Otherwise the user is
+  authenticated from the `token` query parameter.
+
+  Raises:
+    WebSocketDisconnect: If the connection was closed during authentication.
+  """
+
+  if subscription and verify_subscription_token(resource, subscription):
+    return None
+
+  return await get_current_user_ws(websocket)
 
 
 @router.websocket("/ws/{task_id}")
 async def websocket_post_status(
   websocket: WebSocket,
   task_id: str,
-  current_user: CurrentUserWS,
-  task_service: TaskServiceDep,
+  subscription: str | None = None,
 ):
   """
   Sends task status updates from a Redis Stream to the client.
   The connection is closed after receiving a final status.
+
+  Pass the `subscription` token returned when the task was created to skip
+  user and ownership lookups. Without it, the JWT `token` is checked and
+  ownership is verified with a session that is closed before streaming.
   """
 
   try:
@@ -105,37 +144,50 @@ async def websocket_post_status(
     )
     return
 
-  task = await task_service.get_task_by_id(
-    task_id=task_id,
-    user_id=current_user.id,
-  )
-
-  if not task:
-    await websocket.close(
-      code=status.WS_1011_INTERNAL_ERROR,
-      reason="Task not found",
-    )
+  try:
+    current_user = await _authenticate_ws(websocket, f"task:{task_id}", subscription)
 
+  except WebSocketDisconnect:
     return
 
+  if current_user:
+    try:
+      async with async_session() as session:
+        task = await TaskService(session=session).get_task_by_id(
+          task_id=task_id,
+          user_id=current_user.id,
+        )
+
+    except SQLAlchemyError as exc:
+      logger.exception("Failed to load task %s: %s", task_id, exc)
+      await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+      return
+
+    if not task:
+      await websocket.close(
+        code=status.WS_1011_INTERNAL_ERROR,
+        reason="Task not found",
+      )
+
+      return
+
   await websocket.accept()
 
   stream_name = f"task:{task_id}:updates"
   redis_client = websocket.app.state.redis_client
 
   try:
-    await _forward_redis_stream(
+    await _forward_redis_streams(
       redis=redis_client,
-      stream_name=stream_name,
+      streams={stream_name: {"task_id": task_id}},
       websocket=websocket,
       start_id="$",
-      extra_payload={"task_id": task_id},
     )
 
   except WebSocketDisconnect:
     logger.info("Client for task %s disconnected prematurely.", task_id)
 
-  except (SQLAlchemyError, asyncio.TimeoutError) as exc:
+  except asyncio.TimeoutError as exc:
     logger.exception("WebSocket error for task %s: %s", task_id, exc)
 
   finally:
@@ -143,3 +195,82 @@ async def websocket_post_status(
 
     with contextlib.suppress(Exception):
       await websocket.close(code=1000)
+
+
+@router.websocket("/ws/batch/{batch_id}")
+async def websocket_batch_status(
+  websocket: WebSocket,
+  batch_id: str,
+  subscription: str | None = None,
+):
+  """
+  Sends status updates for every task of a batch over one connection.
+  The connection is closed once all tasks have reached a final status.
+
+  Pass the `subscription` token returned when the batch was created to skip
+  authentication; ownership is then implied by the signature.
+  """
+
+  try:
+    uuid.UUID(batch_id)
+
+  except ValueError:
+    await websocket.close(
+      code=status.WS_1007_INVALID_FRAME_PAYLOAD_DATA,
+      reason="Invalid batch ID format",
+    )
+    return
+
+  try:
+    current_user = await _authenticate_ws(websocket, f"batch:{batch_id}", subscription)
+
+  except WebSocketDisconnect:
+    return
+
+  redis_client = websocket.app.state.redis_client
+
+  try:
+    batch = await redis_client.hgetall(BATCH_KEY.format(batch_id=batch_id))
+
+  except RedisError as exc:
+    logger.exception("Failed to load batch %s: %s", batch_id, exc)
+    await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    return
+
+  if not batch or (
+    current_user
+    and batch.get("user_id") != str(current_user.id)
+    and not current_user.is_superuser
+  ):
+    await websocket.close(
+      code=status.WS_1011_INTERNAL_ERROR,
+      reason="Batch not found",
+    )
+    return
+
+  await websocket.accept()
+
+  streams = {
+    f"task:{task_id}:updates": {"task_id": task_id, "batch_id": batch_id}
+    for task_id in json.loads(batch.get("task_ids", "[]"))
+  }
+
+  try:
+    # Tasks of a batch often finish before the client connects. Each stream
+    # belongs to one task, so it is replayed from the start to pick up
+    # final statuses that were already published.
+    await _forward_redis_streams(
+      redis=redis_client,
+      streams=streams,
+      websocket=websocket,
+      start_id="0",
+    )
+
+  except WebSocketDisconnect:
+    logger.info("Client for batch %s disconnected prematurely.", batch_id)
+
+  finally:
+    logger.info("Closing WebSocket connection for batch %s.", batch_id)
+
+    with contextlib.suppress(Exception):
+      await websocket.close(code=1000)
@@ -7,8 +7,8 @@ class AISettings(BaseAppConfig):
   # LLM Provider selection
   LLM_PROVIDER: Literal["GEMINI", "LLAMA"] = "GEMINI"
 
-  # Instagram Scraper backend selection
-  INSTAGRAM_SCRAPER: Literal["INSTALOADER", "PLAYWRIGHT"] = "INSTALOADER"
+  # Instagram Scraper backend selection; AUTO routes between both by health
+  INSTAGRAM_SCRAPER: Literal["INSTALOADER", "PLAYWRIGHT", "AUTO"] = "INSTALOADER"
 
   # Gemini settings
   GEMINI_API_KEY: Optional[str] = None
@@ -17,3 +17,7 @@ class AISettings(BaseAppConfig):
   # Llama.cpp settings
   LLAMA_SERVER_URL: Optional[str] = "http://localhost:8080"
   LLAMA_MODEL: Optional[str] = "llama-vision"
+
+  # Image dedup settings
+  IMAGE_DEDUP_ENABLED: bool = True
+  IMAGE_DEDUP_MAX_DISTANCE: int = 3
@@ -1,5 +1,5 @@
 import warnings
-from typing import Self
+from typing import Any, Dict, Literal, Optional, Self
 
 from pydantic import computed_field, model_validator
 from pydantic_core import MultiHostUrl
@@ -14,6 +14,53 @@ class DatabaseSettings(BaseAppConfig):
   POSTGRES_PASSWORD: str
   POSTGRES_DB: str
 
+  # Streaming replica for read-only queries; unset routes everything to the
+  # primary. Credentials and database name are shared with the primary.
+  POSTGRES_REPLICA_SERVER: Optional[str] = None
+  POSTGRES_REPLICA_PORT: Optional[int] = None
+  # Seconds after a user's write during which their reads stay on the primary
+  DB_READ_YOUR_WRITES_SECONDS: float = 5
+
+  # Which kind of process this is; selects the pool size below
+  DB_ROLE: Literal["api", "worker"] = "api"
+
+  # Connection pool, per process role
+  DB_POOL_SIZE_API: int = 10
+  DB_MAX_OVERFLOW_API: int = 10
+  DB_POOL_SIZE_WORKER: int = 5
+  DB_MAX_OVERFLOW_WORKER: int = 2
+  # Seconds to wait for a pooled connection before failing
+  DB_POOL_TIMEOUT: float = 10
+  # Seconds after which a connection is replaced, ahead of server/LB timeouts
+  DB_POOL_RECYCLE: int = 30 * 60
+  DB_POOL_PRE_PING: bool = True
+  # Checkouts waiting longer than this are logged
+  DB_POOL_SLOW_WAIT_MS: int = 250
+
+  # Server-side limits; 0 disables
+  DB_STATEMENT_TIMEOUT_MS: int = 30_000
+  # Per process role: workers wait on scrapes and media downloads between
+  # statements, for longer than any sensible limit for the API
+  DB_IDLE_IN_TRANSACTION_TIMEOUT_MS_API: int = 60_000
+  DB_IDLE_IN_TRANSACTION_TIMEOUT_MS_WORKER: int = 0
+
+  # Connecting through PgBouncer in transaction mode: disables psycopg's
+  # prepared statements and startup options, which PgBouncer cannot route.
+  # Set the timeouts on the database role instead.
+  DB_PGBOUNCER: bool = False
+
+  # Transactional outbox relay (app.workers.outbox_relay_worker)
+  OUTBOX_BATCH_SIZE: int = 100
+  OUTBOX_POLL_INTERVAL_SECONDS: float = 0.2
+
+  # Monthly task partitions (app.workers.task_partition_worker)
+  TASKS_PARTITION_MONTHS_AHEAD: int = 3
+  # Months of tasks kept attached, including the current one; older
+  # partitions are detached, archived to TASKS_ARCHIVE_DIR and dropped
+  TASKS_RETENTION_MONTHS: int = 6
+  TASKS_ARCHIVE_DIR: str = "archive/tasks"
+  TASKS_MAINTENANCE_INTERVAL_SECONDS: int = 60 * 60
+
   @computed_field
   @property
   def SQLALCHEMY_DATABASE_URI(self) -> str:
@@ -28,6 +75,58 @@ class DatabaseSettings(BaseAppConfig):
       )
     )
 
+  @computed_field
+  @property
+  def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> Optional[str]:
+    if not self.POSTGRES_REPLICA_SERVER:
+      return None
+
+    return str(
+      MultiHostUrl.build(
+        scheme="postgresql+psycopg",
+        username=self.POSTGRES_USER,
+        password=self.POSTGRES_PASSWORD,
+        host=self.POSTGRES_REPLICA_SERVER,
+        port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+        path=self.POSTGRES_DB,
+      )
+    )
+
+  def engine_options(self) -> Dict[str, Any]:
+    """Keyword arguments for `create_async_engine` for this process role."""
+
+    if self.DB_ROLE == "worker":
+      pool_size, max_overflow = self.DB_POOL_SIZE_WORKER, self.DB_MAX_OVERFLOW_WORKER
+      idle_in_transaction_timeout = self.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS_WORKER
+    else:
+      pool_size, max_overflow = self.DB_POOL_SIZE_API, self.DB_MAX_OVERFLOW_API
+      idle_in_transaction_timeout = self.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS_API
+
+    connect_args: Dict[str, Any] = {}
+
+    if self.DB_PGBOUNCER:
+      connect_args["prepare_threshold"] = None
+
+    else:
+      server_options = []
+      if self.DB_STATEMENT_TIMEOUT_MS:
+        server_options.append(f"-c statement_timeout={self.DB_STATEMENT_TIMEOUT_MS}")
+      if idle_in_transaction_timeout:
+        server_options.append(
+          f"-c idle_in_transaction_session_timeout={idle_in_transaction_timeout}"
+        )
+      if server_options:
+        connect_args["options"] = " ".join(server_options)
+
+    return {
+      "pool_size": pool_size,
+      "max_overflow": max_overflow,
+      "pool_timeout": self.DB_POOL_TIMEOUT,
+      "pool_recycle": self.DB_POOL_RECYCLE,
+      "pool_pre_ping": self.DB_POOL_PRE_PING,
+      "connect_args": connect_args,
+    }
+
   @model_validator(mode="after")
   def _enforce_non_default_secrets(self) -> Self:
     if self.POSTGRES_PASSWORD == "changethis":
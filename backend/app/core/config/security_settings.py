@@ -16,6 +16,14 @@ class SecuritySettings(BaseAppConfig):
   EMAIL_RESET_TOKEN_EXPIRE_MINUTES: int = 30
   EMAIL_VERIFY_TOKEN_EXPIRE_HOURS: int = 24
 
+  # Signed image URLs
+  IMAGE_URL_BASE: str = ""
+  IMAGE_URL_EXPIRE_MINUTES: int = 60
+  IMAGE_URL_EXPIRE_BUCKET_SECONDS: int = 300
+
+  # Signed WebSocket subscriptions to task and batch updates
+  SUBSCRIPTION_TOKEN_EXPIRE_MINUTES: int = 30
+
   # Superuser
   FIRST_SUPERUSER: EmailStr
   FIRST_SUPERUSER_PASSWORD: str
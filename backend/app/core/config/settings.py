@@ -8,6 +8,7 @@ from .cors_settings import CorsSettings
 from .db_settings import DatabaseSettings
 from .email_settings import EmailSettings
 from .rate_limit_settings import RateLimitSettings
+from .scraper_settings import ScraperSettings
 from .security_settings import SecuritySettings
 
 
@@ -26,6 +27,7 @@ class Settings(BaseAppConfig):
   db: DatabaseSettings = DatabaseSettings()  # type: ignore[call-arg]
   email: EmailSettings = EmailSettings()
   rate_limit: RateLimitSettings = RateLimitSettings()
+  scraper: ScraperSettings = ScraperSettings()
   security: SecuritySettings = SecuritySettings()  # type: ignore[call-arg]
 
   @model_validator(mode="after")
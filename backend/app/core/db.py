@@ -1,4 +1,5 @@
 from sqlalchemy.ext.asyncio import (
+  AsyncEngine,
   async_sessionmaker,
   create_async_engine,
 )
@@ -6,18 +7,61 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.db_pool import InstrumentedAsyncQueuePool, PoolMetrics
+from app.core.db_routing import RoutingSession, WriteTracker
 from app.core.security import get_password_hash
 from app.models import Language, User
 
-async_engine = create_async_engine(
-  str(settings.db.SQLALCHEMY_DATABASE_URI),
-  echo=False,
+
+def _create_engine(url: str) -> AsyncEngine:
+  """Creates an engine with the instrumented pool for this process role."""
+
+  return create_async_engine(
+    url,
+    echo=False,
+    poolclass=InstrumentedAsyncQueuePool,
+    metrics=PoolMetrics(slow_wait_seconds=settings.db.DB_POOL_SLOW_WAIT_MS / 1000),
+    **settings.db.engine_options(),
+  )
+
+
+async_engine = _create_engine(str(settings.db.SQLALCHEMY_DATABASE_URI))
+
+replica_engine = (
+  _create_engine(settings.db.SQLALCHEMY_REPLICA_DATABASE_URI)
+  if settings.db.SQLALCHEMY_REPLICA_DATABASE_URI
+  else None
 )
 
+write_tracker = WriteTracker(settings.db.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def _pool_stats(engine: AsyncEngine) -> dict:
+  pool = engine.sync_engine.pool
+  if isinstance(pool, InstrumentedAsyncQueuePool):
+    return pool.stats()
+
+  return {"status": pool.status()}
+
+
+def get_pool_stats() -> dict:
+  """Returns the connection pool occupancy and checkout wait metrics."""
+
+  stats = _pool_stats(async_engine)
+  if replica_engine is not None:
+    stats["replica"] = _pool_stats(replica_engine)
+
+  return stats
+
+
+# Sessions use the primary unless marked read-only, see app.core.db_routing
 async_session = async_sessionmaker(
   async_engine,
   class_=AsyncSession,
+  sync_session_class=RoutingSession,
   expire_on_commit=False,
+  replica=replica_engine,
+  write_tracker=write_tracker,
 )
 
 
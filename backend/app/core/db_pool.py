@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, cast
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+  """Counters for connection checkouts and the time spent waiting for them."""
+
+  def __init__(self, slow_wait_seconds: float = 0.25):
+    self.slow_wait_seconds = slow_wait_seconds
+    self.checkouts = 0
+    self.timeouts = 0
+    self.slow_checkouts = 0
+    self.wait_seconds_total = 0.0
+    self.wait_seconds_max = 0.0
+    self.connects = 0
+    self.connect_seconds_total = 0.0
+    self.connect_seconds_max = 0.0
+    self._lock = threading.Lock()
+
+  def observe_wait(self, seconds: float, timed_out: bool) -> None:
+    with self._lock:
+      self.checkouts += 1
+      self.wait_seconds_total += seconds
+      self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+      if timed_out:
+        self.timeouts += 1
+
+      if seconds >= self.slow_wait_seconds:
+        self.slow_checkouts += 1
+
+    if seconds >= self.slow_wait_seconds:
+      logger.warning("Waited %.0f ms for a database connection", seconds * 1000)
+
+  def observe_connect(self, seconds: float) -> None:
+    with self._lock:
+      self.connects += 1
+      self.connect_seconds_total += seconds
+      self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+
+  def snapshot(self) -> Dict[str, Any]:
+    with self._lock:
+      return {
+        "checkouts_total": self.checkouts,
+        "checkout_timeouts_total": self.timeouts,
+        "slow_checkouts_total": self.slow_checkouts,
+        "wait_seconds_total": round(self.wait_seconds_total, 4),
+        "wait_seconds_max": round(self.wait_seconds_max, 4),
+        "connects_total": self.connects,
+        "connect_seconds_total": round(self.connect_seconds_total, 4),
+        "connect_seconds_max": round(self.connect_seconds_max, 4),
+      }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+  """
+  Queue pool that records how long each checkout waited.
+
+  Pool events fire after a connection is handed out, so the wait itself is
+  only observable by timing the pool's own `_do_get`. Opening a new
+  connection happens inside it too; that time is reported separately and
+  not counted as waiting for the pool.
+
+  `metrics` is a regular keyword argument, so `create_engine` passes it
+  through to the pool.
+  """
+
+  metrics: PoolMetrics
+
+  def __init__(
+    self,
+    creator: Any,
+    metrics: Optional[PoolMetrics] = None,
+    **kwargs: Any,
+  ):
+    super().__init__(creator, **kwargs)
+    self.metrics = metrics or PoolMetrics()
+    # Connect time of records opened by a checkout still in progress
+    self._connect_seconds: Dict[Any, float] = {}
+
+  def recreate(self) -> "InstrumentedAsyncQueuePool":
+    # Engine disposal recreates the pool; carry the metrics over
+    pool = cast("InstrumentedAsyncQueuePool", super().recreate())
+    pool.metrics = self.metrics
+    return pool
+
+  def _create_connection(self) -> Any:
+    start = time.perf_counter()
+    record = super()._create_connection()
+    seconds = time.perf_counter() - start
+
+    self.metrics.observe_connect(seconds)
+    self._connect_seconds[record] = seconds
+
+    return record
+
+  def _do_get(self) -> Any:
+    start = time.perf_counter()
+
+    try:
+      record = super()._do_get()
+
+    except PoolTimeoutError:
+      self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+      raise
+
+    elapsed = time.perf_counter() - start
+    connect_seconds = self._connect_seconds.pop(record, 0.0)
+    self.metrics.observe_wait(elapsed - connect_seconds, timed_out=False)
+
+    return record
+
+  def stats(self) -> Dict[str, Any]:
+    """Current occupancy plus cumulative checkout metrics."""
+
+    return {
+      "size": self.size(),
+      "checked_out": self.checkedout(),
+      "idle": self.checkedin(),
+      "overflow": max(self.overflow(), 0),
+      **self.metrics.snapshot(),
+    }
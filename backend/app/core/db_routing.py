@@ -0,0 +1,152 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from cachetools import TTLCache
+from sqlalchemy import Select, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Session.info keys
+READ_ONLY_KEY = "read_only"
+USER_KEY = "user_id"
+WROTE_KEY = "wrote"
+
+T = TypeVar("T")
+
+
+class WriteTracker:
+  """
+  Remembers which users wrote recently, for read-your-writes consistency.
+
+  Reads of a user who committed within the window go to the primary, so
+  they never observe a replica that has not caught up with their own
+  writes yet. The state is per process, which matches the single API
+  process per container.
+  """
+
+  def __init__(self, window_seconds: float, maxsize: int = 65536):
+    self.window_seconds = window_seconds
+    self._writes: TTLCache[Any, float] = TTLCache(
+      maxsize=maxsize,
+      ttl=window_seconds,
+    )
+    self._lock = threading.Lock()
+
+  def mark(self, user_id: Any) -> None:
+    """Records a committed write by `user_id`."""
+
+    if user_id is None or self.window_seconds <= 0:
+      return
+
+    with self._lock:
+      self._writes[user_id] = time.monotonic()
+
+  def is_recent(self, user_id: Any) -> bool:
+    """Whether `user_id` wrote within the window."""
+
+    if user_id is None:
+      return False
+
+    with self._lock:
+      return user_id in self._writes
+
+
+class RoutingSession(Session):
+  """
+  Session that sends read-only SELECTs to a replica engine.
+
+  Statements go to the replica only when the session was marked read-only
+  (see `read_only`), the session has not written anything itself, the
+  statement is a plain SELECT without FOR UPDATE, and the current user has
+  not written recently. Everything else uses the primary the session was
+  bound to.
+  """
+
+  def __init__(
+    self,
+    *args: Any,
+    replica: Optional[AsyncEngine] = None,
+    write_tracker: Optional[WriteTracker] = None,
+    **kwargs: Any,
+  ):
+    super().__init__(*args, **kwargs)
+    self.replica = replica.sync_engine if replica is not None else None
+    self.write_tracker = write_tracker
+
+  def uses_replica(self, clause: Any) -> bool:
+    """Whether `clause` should be executed on the replica."""
+
+    if self.replica is None or self._flushing:
+      return False
+
+    if not self.info.get(READ_ONLY_KEY) or self.info.get(WROTE_KEY):
+      return False
+
+    if not isinstance(clause, Select) or clause._for_update_arg is not None:
+      return False
+
+    return not (
+      self.write_tracker and self.write_tracker.is_recent(self.info.get(USER_KEY))
+    )
+
+  def get_bind(self, mapper=None, clause=None, **kwargs):
+    if self.uses_replica(clause):
+      return self.replica
+
+    return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_flush(session: RoutingSession, flush_context: Any) -> None:
+  # Rows written by this session must be read back from the primary
+  session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _record_execute(orm_execute_state: ORMExecuteState) -> None:
+  # INSERT/UPDATE/DELETE statements executed directly, e.g. with RETURNING,
+  # write without a flush
+  if (
+    orm_execute_state.is_insert
+    or orm_execute_state.is_update
+    or orm_execute_state.is_delete
+  ):
+    orm_execute_state.session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_commit(session: RoutingSession) -> None:
+  if session.info.get(WROTE_KEY) and session.write_tracker:
+    session.write_tracker.mark(session.info.get(USER_KEY))
+
+
+@contextmanager
+def read_only(session: AsyncSession) -> Iterator[AsyncSession]:
+  """Marks `session` as read-only for the duration of the block."""
+
+  previous = session.info.get(READ_ONLY_KEY, False)
+  session.info[READ_ONLY_KEY] = True
+
+  try:
+    yield session
+
+  finally:
+    session.info[READ_ONLY_KEY] = previous
+
+
+def read_only_method(
+  func: Callable[..., Awaitable[T]],
+) -> Callable[..., Awaitable[T]]:
+  """Runs a service method with its `self.session` marked read-only."""
+
+  @functools.wraps(func)
+  async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+    with read_only(self.session):
+      return await func(self, *args, **kwargs)
+
+  return wrapper
@@ -0,0 +1,4 @@
+# Redis keys shared between the HTTP routes, WebSockets and workers
+
+# Hash recording the owner and tasks of a batch, watched over one WebSocket
+BATCH_KEY = "tasks:batch:{batch_id}"
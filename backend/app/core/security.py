@@ -1,5 +1,11 @@
+import base64
+import hashlib
+import hmac
+import math
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
+from uuid import UUID
 
 import jwt
 from passlib.context import CryptContext
@@ -32,3 +38,75 @@ def get_password_hash(password: str) -> str:
   """Hash a password for storing."""
 
   return pwd_context.hash(password)
+
+
+def sign_value(value: str, expires: int) -> str:
+  """Create an HMAC signature for a value that is valid until `expires`."""
+
+  digest = hmac.new(
+    settings.security.SECRET_KEY.encode(),
+    f"{value}:{expires}".encode(),
+    hashlib.sha256,
+  ).digest()
+
+  return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def verify_signed_value(value: str, expires: int, signature: str) -> bool:
+  """Verify a signature created by `sign_value` and check it has not expired."""
+
+  if expires < time.time():
+    return False
+
+  return hmac.compare_digest(sign_value(value, expires), signature)
+
+
+def create_signed_image_url(image_id: UUID | str) -> str:
+  """
+  Create an expiring, signed URL for viewing an image.
+
+  The expiry is rounded up to a fixed bucket so that every listing within
+  the same window mints the same URL, which keeps it cacheable.
+  """
+
+  bucket = settings.security.IMAGE_URL_EXPIRE_BUCKET_SECONDS
+  ttl = settings.security.IMAGE_URL_EXPIRE_MINUTES * 60
+  expires = math.ceil((time.time() + ttl) / bucket) * bucket
+  signature = sign_value(f"image:{image_id}", expires)
+
+  return (
+    f"{settings.security.IMAGE_URL_BASE.rstrip('/')}"
+    f"/images/{image_id}/signed?exp={expires}&sig={signature}"
+  )
+
+
+def verify_image_signature(image_id: UUID | str, expires: int, signature: str) -> bool:
+  """Verify the signature of a URL created by `create_signed_image_url`."""
+
+  return verify_signed_value(f"image:{image_id}", expires, signature)
+
+
+def create_subscription_token(resource: str) -> str:
+  """
+  Create a token that allows watching `resource` over a WebSocket.
+
+  The token is a signed `<expires>.<signature>` pair, so WebSocket endpoints
+  can authorize a subscription without a user or ownership lookup.
+  """
+
+  ttl = settings.security.SUBSCRIPTION_TOKEN_EXPIRE_MINUTES * 60
+  expires = int(time.time()) + ttl
+
+  return f"{expires}.{sign_value(f'subscribe:{resource}', expires)}"
+
+
+def verify_subscription_token(resource: str, token: str) -> bool:
+  """Verify a token created by `create_subscription_token` for `resource`."""
+
+  expires, _, signature = token.partition(".")
+
+  try:
+    return verify_signed_value(f"subscribe:{resource}", int(expires), signature)
+
+  except ValueError:
+    return False
@@ -1,7 +1,8 @@
 import uuid
 from typing import Optional
 
-from sqlmodel import select
+from sqlalchemy import insert
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Author
@@ -13,16 +14,15 @@ async def create_author(
 ) -> Optional[uuid.UUID]:
   """Create a new author."""
 
-  author = Author(
-    id=uuid.uuid4(),
-    username=username,
-  )
+  author = Author(username=username)
 
-  session.add(author)
+  result = await session.scalars(
+    insert(Author).values(**author.model_dump()).returning(col(Author.id))
+  )
+  author_id = result.one()
   await session.commit()
-  await session.refresh(author)
 
-  return author.id
+  return author_id
 
 
 async def get_author_by_id(
@@ -0,0 +1,107 @@
+from typing import Any, List, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Author, Compliment, GenerationMetadata, Image, Post
+from app.schemas import (
+  ComplimentFeedItem,
+  FeedGeneration,
+  FeedImage,
+  FeedPost,
+)
+from app.utils.pagination import Cursor, after_cursor
+
+
+def _feed_query() -> Select:
+  """
+  Column projection of compliments and everything their cards show.
+
+  Selecting columns instead of entities returns plain rows, so nothing is
+  added to the session's identity map and no relationship is loaded lazily.
+  """
+
+  return (
+    select(
+      Compliment.id,
+      Compliment.lang_id,
+      Compliment.text,
+      Compliment.tone_breakdown,
+      Compliment.created_at,
+      Image.id.label("image_id"),  # type: ignore
+      Image.width,
+      Image.height,
+      Post.id.label("post_id"),  # type: ignore
+      Post.description,
+      Post.taken_at,
+      Author.username.label("author_username"),  # type: ignore
+      GenerationMetadata.model_used,
+      GenerationMetadata.total_token_count,
+      GenerationMetadata.analysis_duration_ms,
+    )
+    .join(Image, Image.id == Compliment.image_id)  # type: ignore
+    .join(Post, Post.id == Image.post_id)  # type: ignore
+    .join(
+      GenerationMetadata,
+      GenerationMetadata.id == Compliment.generation_id,  # type: ignore
+    )
+    .outerjoin(Author, Author.id == Post.author_id)  # type: ignore
+  )
+
+
+def feed_item_from_row(row: Mapping[Any, Any]) -> ComplimentFeedItem:
+  """Builds a feed item from one row of the feed projection."""
+
+  return ComplimentFeedItem(
+    id=row["id"],
+    lang_id=row["lang_id"],
+    text=row["text"],
+    tone_breakdown=row["tone_breakdown"],
+    created_at=row["created_at"],
+    image=FeedImage(
+      id=row["image_id"],
+      width=row["width"],
+      height=row["height"],
+    ),
+    post=FeedPost(
+      id=row["post_id"],
+      description=row["description"],
+      taken_at=row["taken_at"],
+      author_username=row["author_username"],
+    ),
+    generation=FeedGeneration(
+      model_used=row["model_used"],
+      total_token_count=row["total_token_count"],
+      analysis_duration_ms=row["analysis_duration_ms"],
+    ),
+  )
+
+
+async def get_compliment_feed(
+  session: AsyncSession,
+  limit: int,
+  cursor: Optional[Cursor] = None,
+  user_id: Optional[UUID] = None,
+) -> List[ComplimentFeedItem]:
+  """
+  Get up to `limit` feed items after `cursor`, newest first, in one query.
+  """
+
+  stmt = _feed_query()
+
+  if user_id:
+    stmt = stmt.where(Post.user_id == user_id)  # type: ignore
+
+  condition = after_cursor(Compliment.created_at, Compliment.id, cursor)
+  if condition is not None:
+    stmt = stmt.where(condition)
+
+  stmt = stmt.order_by(
+    Compliment.created_at.desc(),  # type: ignore
+    Compliment.id.desc(),  # type: ignore
+  ).limit(limit)
+
+  result = await session.execute(stmt)
+
+  return [feed_item_from_row(row) for row in result.mappings()]
@@ -1,10 +1,21 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlmodel import select
+from sqlalchemy import ColumnElement, cast, exists, func, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import BIT
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Image, Post
+from app.models import Compliment, Image, Post
+from app.models.image import IMAGE_REF_PREFIX
+from app.utils.image_hash import (
+  BAND_BITS,
+  BAND_MASK,
+  HASH_BANDS,
+  HASH_BITS,
+  MAX_INDEXED_DISTANCE,
+  hash_band,
+)
 
 
 async def get_primary_image_by_post_id(
@@ -32,17 +43,79 @@ async def create_images(
   session: AsyncSession,
   images: List[Image],
 ) -> List[Image]:
-  """Bulk insert image records into the database."""
+  """
+  Bulk insert image records into the database.
+
+  The rows are flushed as one multi-row INSERT. Every column is set on the
+  objects beforehand, so they are not refreshed after the commit.
+  """
 
   session.add_all(images)
   await session.commit()
 
-  for image in images:
-    await session.refresh(image)
-
   return images
 
 
+async def get_remote_images_page(
+  session: AsyncSession,
+  after_id: Optional[UUID] = None,
+  limit: int = 500,
+) -> Sequence[Tuple[UUID, str, str]]:
+  """
+  Fetches a page of images stored as remote (CDN) URLs.
+
+  Only (id, post_id, storage_key) is selected, and pages are keyed on the
+  primary key, so a full scan stays cheap.
+  """
+
+  stmt = (
+    select(Image.id, Image.post_id, Image.storage_key)
+    .where(Image.storage_key.startswith("http"))  # type: ignore
+    .order_by(Image.id)  # type: ignore
+    .limit(limit)
+  )
+
+  if after_id:
+    stmt = stmt.where(Image.id > after_id)
+
+  result = await session.exec(stmt)
+  return result.all()
+
+
+async def get_remote_images_by_post_ids(
+  session: AsyncSession,
+  post_ids: Sequence[str],
+) -> Sequence[Tuple[UUID, str, str]]:
+  """Fetches (id, post_id, storage_key) of the remote images of the given posts."""
+
+  stmt = select(Image.id, Image.post_id, Image.storage_key).where(
+    col(Image.post_id).in_(post_ids),
+    col(Image.storage_key).startswith("http"),
+  )
+
+  result = await session.exec(stmt)
+  return result.all()
+
+
+async def update_storage_keys(
+  session: AsyncSession,
+  storage_keys: Dict[UUID, str],
+) -> None:
+  """Replaces the storage keys of many images with one bulk UPDATE."""
+
+  if not storage_keys:
+    return
+
+  await session.execute(
+    update(Image),
+    [
+      {"id": image_id, "storage_key": storage_key}
+      for image_id, storage_key in storage_keys.items()
+    ],
+  )
+  await session.commit()
+
+
 async def get_image_by_id(
   session: AsyncSession,
   image_id: str,
@@ -54,3 +127,163 @@ async def get_image_by_id(
 
   result = await session.exec(stmt)
   return result.one_or_none()
+
+
+def make_image_ref(canonical_id: UUID, image_id: UUID) -> str:
+  """
+  Builds a storage key that points at another image's stored content.
+
+  The image's own ID is part of the key to keep `storage_key` unique.
+  """
+
+  return f"{IMAGE_REF_PREFIX}{canonical_id}/{image_id}"
+
+
+def parse_image_ref(storage_key: str) -> Optional[UUID]:
+  """Returns the canonical image ID of a reference storage key, if any."""
+
+  if not storage_key.startswith(IMAGE_REF_PREFIX):
+    return None
+
+  canonical_id, _, _ = storage_key[len(IMAGE_REF_PREFIX) :].partition("/")
+  return UUID(canonical_id)
+
+
+async def resolve_storage_key(
+  session: AsyncSession,
+  storage_key: str,
+) -> Optional[str]:
+  """Follows a reference storage key to the content it points at."""
+
+  canonical_id = parse_image_ref(storage_key)
+  if not canonical_id:
+    return storage_key
+
+  stmt = select(Image.storage_key).where(Image.id == canonical_id)
+  result = await session.exec(stmt)
+  return result.first()
+
+
+async def get_image_storage_key(
+  session: AsyncSession,
+  image_id: UUID,
+) -> Optional[str]:
+  """
+  Get the resolved storage key of an image by its ID.
+
+  This is a primary-key lookup without any ownership check; callers must
+  have authorized the access, e.g. through a signed URL.
+  """
+
+  stmt = select(Image.storage_key).where(Image.id == image_id)
+  result = await session.exec(stmt)
+  storage_key = result.first()
+
+  if not storage_key:
+    return None
+
+  return await resolve_storage_key(session=session, storage_key=storage_key)
+
+
+async def get_image_dhash(
+  session: AsyncSession,
+  image_id: UUID,
+) -> Optional[int]:
+  """Get the content hash of an image, if it has been hashed."""
+
+  stmt = select(Image.dhash).where(Image.id == image_id)
+  result = await session.exec(stmt)
+  return result.first()
+
+
+async def set_image_dhash(
+  session: AsyncSession,
+  image_id: UUID,
+  dhash: int,
+) -> None:
+  """Stores the content hash of an image."""
+
+  stmt = update(Image).where(Image.id == image_id).values(dhash=dhash)  # type: ignore
+  await session.exec(stmt)  # type: ignore
+  await session.commit()
+
+
+def _dhash_band(band: int) -> ColumnElement[int]:
+  """
+  Builds the SQL expression for a hash band.
+
+  Shifts and masks are rendered as literals so the expression matches the
+  `ix_images_dhash_band_*` expression indexes.
+  """
+
+  shifted = Image.dhash.op(">>")(literal_column(str(band * BAND_BITS)))  # type: ignore
+  return shifted.op("&")(literal_column(str(BAND_MASK)))
+
+
+def _dhash_distance(dhash: int) -> ColumnElement[int]:
+  """Builds the SQL expression for the Hamming distance to a content hash."""
+
+  xor = Image.dhash.op("#")(dhash)  # type: ignore
+  return func.bit_count(cast(xor, BIT(HASH_BITS)))
+
+
+async def find_similar_images(
+  session: AsyncSession,
+  dhash: int,
+  max_distance: int = 0,
+  exclude_image_id: Optional[UUID] = None,
+  analyzed_only: bool = False,
+  uploads_only: bool = False,
+  limit: int = 1,
+) -> List[Image]:
+  """
+  Finds images whose content hash is within `max_distance` bits of `dhash`.
+
+  Exact lookups use the plain `dhash` index. Radius lookups match any of the
+  hash bands through the bit-sliced indexes and compute the real Hamming
+  distance on the candidates, which is exact up to MAX_INDEXED_DISTANCE.
+
+  Args:
+    dhash: The content hash to look up.
+    max_distance: Maximum Hamming distance, capped at MAX_INDEXED_DISTANCE.
+    exclude_image_id: An image to leave out, typically the one being matched.
+    analyzed_only: Only return images that already have compliments.
+    uploads_only: Only return uploaded images that own their content.
+    limit: Maximum number of images to return.
+
+  Returns:
+    Matching images, closest first.
+  """
+
+  max_distance = min(max_distance, MAX_INDEXED_DISTANCE)
+
+  stmt = select(Image).where(Image.dhash.is_not(None))  # type: ignore
+
+  if max_distance == 0:
+    stmt = stmt.where(Image.dhash == dhash)
+
+  else:
+    # The bands only narrow the rows down; the distance itself is computed in
+    # SQL so near-constant hashes cannot pull every banded row into memory.
+    distance = _dhash_distance(dhash)
+    stmt = (
+      stmt.where(
+        or_(
+          *(_dhash_band(band) == hash_band(dhash, band) for band in range(HASH_BANDS))
+        )
+      )
+      .where(distance <= max_distance)
+      .order_by(distance)
+    )
+
+  if exclude_image_id:
+    stmt = stmt.where(Image.id != exclude_image_id)
+
+  if analyzed_only:
+    stmt = stmt.where(exists().where(col(Compliment.image_id) == Image.id))
+
+  if uploads_only:
+    stmt = stmt.where(Image.storage_key.startswith("data:"))  # type: ignore
+
+  result = await session.exec(stmt.limit(limit))
+  return list(result.all())
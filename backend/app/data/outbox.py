@@ -0,0 +1,66 @@
+from typing import Dict, List, Sequence
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import OutboxMessage
+from app.utils.utc_now import utc_now
+
+
+async def add_outbox_messages(
+  session: AsyncSession,
+  stream: str,
+  payloads: Sequence[Dict[str, str]],
+) -> None:
+  """
+  Queue messages for a Redis Stream in a single multi-row insert.
+
+  The insert is not committed, so the messages are published if and only
+  if the caller's transaction commits.
+  """
+
+  if not payloads:
+    return
+
+  created_at = utc_now()
+  await session.execute(
+    insert(OutboxMessage),
+    [
+      {"stream": stream, "payload": payload, "created_at": created_at}
+      for payload in payloads
+    ],
+  )
+
+
+async def claim_outbox_messages(
+  session: AsyncSession,
+  limit: int,
+) -> List[OutboxMessage]:
+  """
+  Lock the oldest unpublished messages.
+
+  Rows locked by another relay are skipped, so several relays can run
+  without publishing the same message twice.
+  """
+
+  stmt = (
+    select(OutboxMessage)
+    .order_by(OutboxMessage.id)  # type: ignore
+    .limit(limit)
+    .with_for_update(skip_locked=True)
+  )
+  result = await session.exec(stmt)
+
+  return list(result.all())
+
+
+async def delete_outbox_messages(
+  session: AsyncSession,
+  message_ids: Sequence[int],
+) -> None:
+  """Delete published messages. The caller commits."""
+
+  await session.execute(
+    delete(OutboxMessage).where(OutboxMessage.id.in_(message_ids))  # type: ignore
+  )
@@ -1,6 +1,8 @@
-from typing import Optional
+from typing import Optional, Sequence, Set
 from uuid import UUID
 
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -8,6 +10,7 @@ from sqlmodel.sql.expression import Select, SelectOfScalar
 
 from app.models import Post
 from app.schemas import PostUpdate
+from app.utils.utc_now import utc_now
 
 T = Post
 Statement = Select[T] | SelectOfScalar[T]
@@ -18,23 +21,54 @@ async def create_post(
   post_id: str,
   user_id: UUID,
 ) -> Post:
-  """Create a new post."""
-
-  post = Post(
-    id=post_id,
-    user_id=user_id,
-    author_id=None,
-    description=None,
-    taken_at=None,
-  )
+  """Create a new post, returning the inserted row in the same round trip."""
 
-  session.add(post)
+  result = await session.scalars(
+    insert(Post)
+    .values(id=post_id, user_id=user_id, created_at=utc_now())
+    .returning(Post)
+  )
+  post = result.one()
   await session.commit()
-  await session.refresh(post)
 
   return post
 
 
+async def insert_posts(
+  session: AsyncSession,
+  post_ids: Sequence[str],
+  user_id: UUID,
+) -> Set[str]:
+  """
+  Insert many posts in a single statement, skipping existing IDs.
+
+  The insert is not committed, so it can share a transaction with the
+  rows that depend on it.
+
+  Returns:
+    The IDs of the posts that were actually inserted.
+  """
+
+  if not post_ids:
+    return set()
+
+  created_at = utc_now()
+  stmt = (
+    insert(Post)
+    .values(
+      [
+        {"id": post_id, "user_id": user_id, "created_at": created_at}
+        for post_id in post_ids
+      ]
+    )
+    .on_conflict_do_nothing(index_elements=["id"])
+    .returning(Post.id)  # type: ignore
+  )
+  result = await session.exec(stmt)  # type: ignore
+
+  return set(result.scalars().all())
+
+
 async def get_post_by_id(
   session: AsyncSession,
   post_id: str,
@@ -72,22 +106,25 @@ async def update_post(
   user_id: UUID,
   post_update: PostUpdate,
 ) -> Optional[Post]:
-  """Update a post."""
+  """
+  Update a post with a single UPDATE ... RETURNING.
 
-  post = await get_post_by_id(
-    session=session,
-    post_id=post_id,
-    user_id=user_id,
-  )
-  if not post:
-    return None
+  Like `get_post_by_id`, the returned post has its images loaded.
+  """
 
   post_data = post_update.model_dump(exclude_unset=True)
-  for key, value in post_data.items():
-    setattr(post, key, value)
-
-  session.add(post)
+  if not post_data:
+    return await get_post_by_id(session=session, post_id=post_id, user_id=user_id)
+
+  result = await session.scalars(
+    update(Post)
+    .where(Post.id == post_id, Post.user_id == user_id)  # type: ignore
+    .values(**post_data)
+    .returning(Post)
+    .options(selectinload(Post.images))  # type: ignore
+    .execution_options(populate_existing=True)
+  )
+  post = result.one_or_none()
   await session.commit()
-  await session.refresh(post)
 
   return post
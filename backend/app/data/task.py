@@ -1,34 +1,74 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import insert, update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.models import Task
+from app.data.task_stats import is_terminal, record_task_outcome
+from app.models import GenerationMetadata, Task
 from app.schemas import TaskCreate, TaskStatus, TaskUpdate
+from app.utils.pagination import Cursor, after_cursor, estimate_count
 
 
 async def create_task(session: AsyncSession, task_create: TaskCreate) -> Task:
-  """Create a new task."""
-
-  task = Task(
-    id=task_create.id,
-    type=task_create.type,
-    post_id=task_create.post_id,
-    image_id=task_create.image_id,
-    user_id=task_create.user_id,
-    status=TaskStatus.pending,
-    created_at=datetime.now(timezone.utc),
+  """Create a new task, returning the inserted row in the same round trip."""
+
+  result = await session.scalars(
+    insert(Task)
+    .values(
+      id=task_create.id,
+      type=task_create.type,
+      post_id=task_create.post_id,
+      image_id=task_create.image_id,
+      user_id=task_create.user_id,
+      status=TaskStatus.pending,
+      created_at=datetime.now(timezone.utc),
+    )
+    .returning(Task)
   )
-
-  session.add(task)
+  task = result.one()
   await session.commit()
-  await session.refresh(task)
 
   return task
 
 
+async def create_tasks(
+  session: AsyncSession,
+  task_creates: Sequence[TaskCreate],
+) -> List[Task]:
+  """
+  Insert many pending tasks in a single multi-row statement.
+
+  The insert is not committed, so it can share a transaction with the
+  rows it depends on.
+  """
+
+  if not task_creates:
+    return []
+
+  created_at = datetime.now(timezone.utc)
+  result = await session.scalars(
+    insert(Task).returning(Task),
+    [
+      {
+        "id": task_create.id,
+        "type": task_create.type,
+        "post_id": task_create.post_id,
+        "image_id": task_create.image_id,
+        "user_id": task_create.user_id,
+        "status": TaskStatus.pending,
+        "created_at": created_at,
+      }
+      for task_create in task_creates
+    ],
+  )
+
+  return list(result.all())
+
+
 async def get_task_by_id(
   session: AsyncSession,
   task_id: str,
@@ -43,32 +83,81 @@ async def get_task_by_id(
   return result.first()
 
 
+async def _update_task(
+  session: AsyncSession,
+  task_id: str,
+  user_id: UUID,
+  values: Dict[str, Any],
+  generation: Optional[GenerationMetadata] = None,
+) -> Optional[Task]:
+  """
+  Updates a user's task and returns the new row, or None if it is not theirs.
+
+  The row is locked and returned by a single UPDATE ... RETURNING, along
+  with its previous status. When that moves the task to a terminal status
+  the user's stats are incremented in the same transaction, once per task.
+  """
+
+  previous = (
+    select(Task.id, Task.created_at, Task.status.label("previous_status"))  # type: ignore
+    .where(Task.id == task_id, Task.user_id == user_id)
+    .with_for_update()
+    .cte("previous")
+  )
+  result = await session.execute(
+    update(Task)
+    .where(
+      Task.id == previous.c.id,  # type: ignore
+      Task.created_at == previous.c.created_at,  # type: ignore
+    )
+    .values(**values, updated_at=datetime.now(timezone.utc))
+    .returning(Task, previous.c.previous_status)
+    .execution_options(populate_existing=True)
+  )
+  row = result.one_or_none()
+
+  task = None
+  if row is not None:
+    task, previous_status = row
+
+    if is_terminal(task.status) and not is_terminal(previous_status):
+      await record_task_outcome(
+        session=session,
+        user_id=user_id,
+        day=datetime.now(timezone.utc).date(),
+        task_type=task.type,
+        status=task.status,
+        duration=task.duration,
+        generation=generation,
+      )
+
+  await session.commit()
+
+  return task
+
+
 async def update_task(
   session: AsyncSession,
   task_id: str,
   user_id: UUID,
   task_update: TaskUpdate,
+  generation: Optional[GenerationMetadata] = None,
 ) -> Optional[Task]:
-  """Update a task."""
+  """
+  Update a task with a single UPDATE ... RETURNING.
 
-  task = await get_task_by_id(
+  Args:
+    generation: Metadata of the model call the task made, whose token
+      counts are added to the user's stats when the task finishes.
+  """
+
+  return await _update_task(
     session=session,
     task_id=task_id,
     user_id=user_id,
+    values=task_update.model_dump(exclude_unset=True),
+    generation=generation,
   )
-  if not task:
-    return None
-
-  for key, value in task_update.model_dump(exclude_unset=True).items():
-    setattr(task, key, value)
-
-  task.updated_at = datetime.now(timezone.utc)
-
-  session.add(task)
-  await session.commit()
-  await session.refresh(task)
-
-  return task
 
 
 async def set_task_status(
@@ -80,43 +169,63 @@ async def set_task_status(
 ) -> Optional[Task]:
   """Set the status of a task."""
 
-  task = await get_task_by_id(
+  return await _update_task(
     session=session,
     task_id=task_id,
     user_id=user_id,
+    values={"status": status, "duration": duration},
   )
-  if not task:
-    return None
 
-  task.status = status
-  task.duration = duration
-  task.updated_at = datetime.now(timezone.utc)
 
-  session.add(task)
-  await session.commit()
-  await session.refresh(task)
+def _tasks_query(
+  status: Optional[str] = None,
+  user_id: Optional[UUID] = None,
+) -> SelectOfScalar[Task]:
+  query = select(Task)
 
-  return task
+  if status:
+    query = query.where(Task.status == status)
+
+  if user_id:
+    query = query.where(Task.user_id == user_id)
+
+  return query
 
 
 async def get_all_tasks(
   session: AsyncSession,
-  skip: int,
   limit: int,
+  cursor: Optional[Cursor] = None,
   status: Optional[str] = None,
   user_id: Optional[UUID] = None,
 ) -> Sequence[Task]:
-  """Get all tasks."""
+  """
+  Get a page of tasks, newest first.
 
-  query = select(Task)
+  Pages are keyed on (created_at, id), served by the
+  (user_id, created_at, id) and (created_at, id) indexes.
+  """
 
-  if status:
-    query = query.where(Task.status == status)
+  query = _tasks_query(status=status, user_id=user_id)
 
-  if user_id:
-    query = query.where(Task.user_id == user_id)
+  condition = after_cursor(Task.created_at, Task.id, cursor)
+  if condition is not None:
+    query = query.where(condition)
 
-  query = query.offset(skip).limit(limit)
+  query = query.order_by(
+    Task.created_at.desc(),  # type: ignore
+    Task.id.desc(),  # type: ignore
+  ).limit(limit)
 
   result = await session.exec(query)
   return result.all()
+
+
+async def estimate_tasks(
+  session: AsyncSession,
+  status: Optional[str] = None,
+  user_id: Optional[UUID] = None,
+) -> int:
+  """Estimate the number of tasks matching the filters, without COUNT(*)."""
+
+  return await estimate_count(session, _tasks_query(status=status, user_id=user_id))
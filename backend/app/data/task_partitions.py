@@ -0,0 +1,189 @@
+import re
+from datetime import date, datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Monthly partitions of `tasks` are named tasks_pYYYYMM. Must match the
+# naming in the 5b1f0e83a2c4 migration that partitioned the table.
+PARTITION_PREFIX = "tasks_p"
+PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+# Catches tasks created in a month that has no partition, so inserts never
+# fail; the maintenance worker moves its rows into monthly partitions.
+DEFAULT_PARTITION = "tasks_default"
+
+
+class TaskPartition(NamedTuple):
+  """A monthly task table and whether it is attached to `tasks`."""
+
+  name: str
+  month: date
+  attached: bool
+  detach_pending: bool = False
+
+
+def month_start(value: date | datetime) -> date:
+  """Returns the first day of the month of `value`."""
+
+  return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+  """Returns the first day of the month `months` after `month`."""
+
+  index = month.year * 12 + month.month - 1 + months
+  return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+  """Returns the name of the partition holding tasks created in `month`."""
+
+  return f"{PARTITION_PREFIX}{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+  """Parses the month out of a partition name, or None if it is not one."""
+
+  match = PARTITION_NAME.match(name)
+  if not match:
+    return None
+
+  return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def _bounds(month: date) -> str:
+  return (
+    f"FROM ('{month.isoformat()} 00:00:00+00') "
+    f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+  )
+
+
+def _in_month(month: date) -> str:
+  return (
+    f"created_at >= '{month.isoformat()} 00:00:00+00' "
+    f"AND created_at < '{add_months(month, 1).isoformat()} 00:00:00+00'"
+  )
+
+
+async def create_task_partitions(
+  conn: AsyncConnection,
+  months: Iterable[date],
+) -> List[str]:
+  """
+  Creates the partitions for the given months, if missing.
+
+  Tasks of a month that landed in the default partition are moved into the
+  new partition, so `conn` should be in a transaction.
+
+  Returns:
+    The names of the partitions.
+  """
+
+  names = []
+
+  for month in months:
+    name = partition_name(month)
+    names.append(name)
+
+    # Bounds are literal SQL; the name and dates are generated here
+    stranded = await conn.scalar(
+      text(f"SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} WHERE {_in_month(month)})")
+    )
+    if not stranded:
+      await conn.execute(
+        text(
+          f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF tasks "
+          f"FOR VALUES {_bounds(month)}"
+        )
+      )
+      continue
+
+    # A partition overlapping rows of the default one cannot be created, so
+    # the rows are moved into a plain table that is then attached
+    await conn.execute(
+      text(f"CREATE TABLE {name} (LIKE tasks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    await conn.execute(
+      text(
+        f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {_in_month(month)}"
+      )
+    )
+    await conn.execute(
+      text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {_in_month(month)}")
+    )
+    await conn.execute(
+      text(f"ALTER TABLE tasks ATTACH PARTITION {name} FOR VALUES {_bounds(month)}")
+    )
+
+  return names
+
+
+async def list_default_months(conn: AsyncConnection) -> List[date]:
+  """Lists the months of the tasks held by the default partition, oldest first."""
+
+  result = await conn.execute(
+    text(
+      "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+      f"FROM {DEFAULT_PARTITION} ORDER BY 1"
+    )
+  )
+
+  return list(result.scalars())
+
+
+async def list_task_partitions(conn: AsyncConnection) -> List[TaskPartition]:
+  """
+  Lists the monthly task tables, oldest first.
+
+  Tables detached from `tasks` but not yet archived are included.
+  """
+
+  result = await conn.execute(
+    text(
+      "SELECT c.relname, i.inhrelid IS NOT NULL, coalesce(i.inhdetachpending, false) "
+      "FROM pg_class c "
+      "LEFT JOIN pg_inherits i "
+      "  ON i.inhrelid = c.oid AND i.inhparent = 'tasks'::regclass "
+      "WHERE c.relkind = 'r' "
+      "  AND c.relnamespace = current_schema()::regnamespace "
+      "  AND c.relname LIKE :prefix "
+      "ORDER BY c.relname"
+    ),
+    {"prefix": f"{PARTITION_PREFIX}%"},
+  )
+
+  partitions = []
+  for name, attached, detach_pending in result.all():
+    month = partition_month(name)
+    if month is not None:
+      partitions.append(TaskPartition(name, month, attached, detach_pending))
+
+  return partitions
+
+
+async def detach_task_partition(
+  conn: AsyncConnection, partition: TaskPartition
+) -> None:
+  """
+  Detaches a partition from `tasks`.
+
+  DETACH ... CONCURRENTLY is not allowed while `tasks` has a default
+  partition, so this takes an exclusive lock on `tasks` until the
+  transaction ends; commit right after, and bound the wait for the lock
+  with lock_timeout. A detach that was interrupted is finalized.
+  """
+
+  mode = "FINALIZE" if partition.detach_pending else ""
+  await conn.execute(
+    text(f"ALTER TABLE tasks DETACH PARTITION {partition.name} {mode}".rstrip())
+  )
+
+
+async def drop_task_partition(conn: AsyncConnection, partition: TaskPartition) -> None:
+  """Drops a detached partition."""
+
+  if partition.attached:
+    raise ValueError(f"{partition.name} is still attached to tasks")
+
+  await conn.execute(text(f"DROP TABLE {partition.name}"))
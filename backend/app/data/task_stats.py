@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Row, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import GenerationMetadata, UserTaskStats
+from app.schemas import TaskStatus, TaskType
+from app.utils.utc_now import utc_now
+
+# Statuses a task does not leave, and the counter each one increments
+STATUS_COUNTERS = {
+  TaskStatus.done: "done_count",
+  TaskStatus.failed: "failed_count",
+  TaskStatus.skipped: "skipped_count",
+}
+
+COUNTERS = (
+  "done_count",
+  "failed_count",
+  "skipped_count",
+  "duration_ms_total",
+  "duration_count",
+  "prompt_token_count",
+  "candidates_token_count",
+  "total_token_count",
+)
+
+
+def is_terminal(status: Optional[TaskStatus]) -> bool:
+  """Whether a task in `status` has finished."""
+
+  return status in STATUS_COUNTERS
+
+
+async def record_task_outcome(
+  session: AsyncSession,
+  user_id: UUID,
+  day: date,
+  task_type: TaskType,
+  status: TaskStatus,
+  duration: Optional[timedelta] = None,
+  generation: Optional[GenerationMetadata] = None,
+) -> None:
+  """
+  Adds a finished task to its user's stats for `day`.
+
+  A single INSERT ... ON CONFLICT DO UPDATE increments the counters, so
+  concurrent workers cannot lose updates. Not committed, so it shares the
+  transaction of the status change it records.
+  """
+
+  values = dict.fromkeys(COUNTERS, 0)
+  values[STATUS_COUNTERS[status]] = 1
+
+  if duration is not None:
+    values["duration_ms_total"] = round(duration.total_seconds() * 1000)
+    values["duration_count"] = 1
+
+  if generation is not None:
+    values["prompt_token_count"] = generation.prompt_token_count
+    values["candidates_token_count"] = generation.candidates_token_count
+    values["total_token_count"] = generation.total_token_count
+
+  stmt = insert(UserTaskStats).values(
+    user_id=user_id,
+    day=day,
+    type=task_type,
+    updated_at=utc_now(),
+    **values,
+  )
+  stmt = stmt.on_conflict_do_update(
+    index_elements=["user_id", "day", "type"],
+    set_={
+      **{
+        column: getattr(UserTaskStats, column) + getattr(stmt.excluded, column)
+        for column in COUNTERS
+      },
+      "updated_at": stmt.excluded.updated_at,
+    },
+  )
+
+  await session.execute(stmt)
+
+
+async def get_task_stats(
+  session: AsyncSession,
+  start_day: date,
+  end_day: date,
+  user_id: Optional[UUID] = None,
+) -> Sequence[Row[Any]]:
+  """
+  Get task stats per day and type, summed over users, oldest day first.
+
+  Served by the primary key for one user and by the day index otherwise.
+  """
+
+  day, task_type = col(UserTaskStats.day), col(UserTaskStats.type)
+
+  stmt = select(
+    day,
+    task_type,
+    # sum() of a bigint is numeric; the totals fit back in a bigint
+    *(
+      cast(func.sum(getattr(UserTaskStats, column)), BigInteger).label(column)
+      for column in COUNTERS
+    ),
+  ).where(day >= start_day, day <= end_day)
+
+  if user_id:
+    stmt = stmt.where(col(UserTaskStats.user_id) == user_id)
+
+  stmt = stmt.group_by(day, task_type).order_by(day, task_type)
+
+  result = await session.execute(stmt)
+  return result.all()
@@ -1,5 +1,6 @@
 from typing import Any, Optional
 
+from sqlalchemy import insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -25,9 +26,11 @@ async def create_user(
 
   db_obj = User.model_validate(db_user)
 
-  session.add(db_obj)
+  result = await session.scalars(
+    insert(User).values(**db_obj.model_dump()).returning(User)
+  )
+  db_obj = result.one()
   await session.commit()
-  await session.refresh(db_obj)
 
   return db_obj
 
@@ -50,9 +53,9 @@ async def update_user(
 
   db_user.sqlmodel_update(user_data, update=extra_data)
 
+  # expire_on_commit=False keeps the updated attributes loaded
   session.add(db_user)
   await session.commit()
-  await session.refresh(db_user)
 
   return db_user
 
@@ -1,9 +1,7 @@
 import asyncio
 import logging
 
-from sqlmodel.ext.asyncio.session import AsyncSession
-
-from app.core.db import async_engine, init_db
+from app.core.db import async_session, init_db
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,7 +10,7 @@ logger = logging.getLogger(__name__)
 async def init() -> None:
   """Initialize the database with initial data."""
 
-  async with AsyncSession(async_engine) as session:
+  async with async_session() as session:
     await init_db(session)
 
 
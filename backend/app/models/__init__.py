@@ -3,8 +3,10 @@ from .compliment import Compliment
 from .generation_metadata import GenerationMetadata
 from .image import Image
 from .language import Language
+from .outbox import OutboxMessage
 from .post import Post
 from .task import Task
+from .task_stats import UserTaskStats
 from .user import User, UserBase
 
 __all__ = [
@@ -13,8 +15,10 @@ __all__ = [
   "GenerationMetadata",
   "Image",
   "Language",
+  "OutboxMessage",
   "Post",
   "Task",
   "User",
   "UserBase",
+  "UserTaskStats",
 ]
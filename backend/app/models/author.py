@@ -17,7 +17,7 @@ class Author(SQLModel, table=True):
   __tablename__ = "authors"  # type: ignore
 
   id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-  username: str = Field(max_length=255)
+  username: str = Field(max_length=255, index=True)
   created_at: datetime = Field(
     default_factory=utc_now,
     sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import TIMESTAMP, Text
+from sqlalchemy import TIMESTAMP, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Column, Field, Relationship, SQLModel
 
@@ -21,6 +21,11 @@ class Compliment(SQLModel, table=True):
   """
 
   __tablename__ = "compliments"  # type: ignore
+  __table_args__ = (
+    # Keyset pagination, overall and per image
+    Index("ix_compliments_created_at_id", "created_at", "id"),
+    Index("ix_compliments_image_id_created_at", "image_id", "created_at"),
+  )
 
   id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
   image_id: uuid.UUID = Field(
@@ -37,6 +42,7 @@ class Compliment(SQLModel, table=True):
     foreign_key="generation_metadata.id",
     nullable=False,
     ondelete="RESTRICT",
+    index=True,
   )
   text: str = Field(sa_column=Column(Text, nullable=False))
   tone_breakdown: dict | None = Field(default=None, sa_column=Column(JSONB))
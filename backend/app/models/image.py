@@ -1,10 +1,20 @@
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import TIMESTAMP, Boolean, Column, Integer, Text
+from sqlalchemy import (
+  TIMESTAMP,
+  BigInteger,
+  Boolean,
+  Column,
+  Index,
+  Integer,
+  Text,
+  text,
+)
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.utils.image_hash import BAND_BITS, BAND_MASK, HASH_BANDS
 from app.utils.utc_now import utc_now
 
 if TYPE_CHECKING:
@@ -12,17 +22,45 @@ if TYPE_CHECKING:
   from .post import Post
   from .task import Task
 
+# Storage keys of images that reuse another image's content:
+# "ref:<canonical image id>/<own id>", see app.data.image.make_image_ref
+IMAGE_REF_PREFIX = "ref:"
+
 
 class Image(SQLModel, table=True):
   """Represents an image file associated with a post."""
 
   __tablename__ = "images"  # type: ignore
+  __table_args__ = (
+    # Primary image lookups by post
+    Index(
+      "ix_images_post_id_primary",
+      "post_id",
+      postgresql_where=text("is_primary"),
+    ),
+    # Bit-sliced hash bands for Hamming-radius lookups, see find_similar_images
+    *(
+      Index(
+        f"ix_images_dhash_band_{band}",
+        text(f"((dhash >> {band * BAND_BITS}) & {BAND_MASK})"),
+        postgresql_where=text("dhash IS NOT NULL"),
+      )
+      for band in range(HASH_BANDS)
+    ),
+    # Images whose storage key refers to another image's content
+    Index(
+      "ix_images_ref_canonical_id",
+      text(f"substring(storage_key from {len(IMAGE_REF_PREFIX) + 1} for 36)"),
+      postgresql_where=text(f"storage_key LIKE '{IMAGE_REF_PREFIX}%'"),
+    ),
+  )
 
   id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
   post_id: str = Field(
     foreign_key="posts.id",
     nullable=False,
     ondelete="CASCADE",
+    index=True,
   )
   storage_key: str = Field(
     # filename from instagram
@@ -38,6 +76,15 @@ class Image(SQLModel, table=True):
       comment="To mark the main image of a carousel",
     ),
   )
+  dhash: Optional[int] = Field(
+    default=None,
+    sa_column=Column(
+      BigInteger,
+      nullable=True,
+      index=True,
+      comment="64-bit difference hash of the image content, used for dedup",
+    ),
+  )
   created_at: datetime = Field(
     default_factory=utc_now,
     sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Identity, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+from app.utils.utc_now import utc_now
+
+
+class OutboxMessage(SQLModel, table=True):
+  """
+  A Redis Stream message written in the same transaction as the rows it
+  refers to, and published later by the outbox relay worker.
+  """
+
+  __tablename__ = "outbox"  # type: ignore
+
+  # Monotonic, so the relay publishes in insertion order
+  id: Optional[int] = Field(
+    default=None,
+    sa_column=Column(BigInteger, Identity(), primary_key=True),
+  )
+  stream: str = Field(sa_column=Column(Text, nullable=False))
+  payload: Dict[str, str] = Field(sa_column=Column(JSONB, nullable=False))
+  created_at: datetime = Field(
+    default_factory=utc_now,
+    sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+  )
+
+  def __repr__(self):
+    return f"<OutboxMessage(id={self.id}, stream='{self.stream}')>"
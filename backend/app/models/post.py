@@ -34,6 +34,7 @@ class Post(SQLModel, table=True):
     foreign_key="authors.id",
     nullable=True,
     ondelete="RESTRICT",
+    index=True,
   )
   author: "Author" = Relationship(back_populates="posts")
 
@@ -47,6 +48,7 @@ class Post(SQLModel, table=True):
     foreign_key="users.id",
     nullable=True,
     ondelete="RESTRICT",
+    index=True,
   )
   user: "User" = Relationship(back_populates="posts")
 
@@ -5,6 +5,7 @@ from uuid import UUID, uuid4
 from sqlalchemy import (
   TIMESTAMP,
   Column,
+  Index,
   Interval,
 )
 from sqlalchemy import Enum as PgEnum
@@ -24,14 +25,24 @@ if TYPE_CHECKING:
 
 
 class Task(SQLModel, table=True):
-  """Represents a background task to be executed."""
+  """
+  Represents a background task to be executed.
+
+  The table is range-partitioned by month of `created_at` (see
+  app.data.task_partitions), so the primary key is (id, created_at).
+  """
 
   __tablename__ = "tasks"  # type: ignore
+  __table_args__ = (
+    # Keyset pagination, per user and across all users
+    Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+    Index("ix_tasks_created_at_id", "created_at", "id"),
+    {"postgresql_partition_by": "RANGE (created_at)"},
+  )
 
   id: UUID = Field(
     default_factory=uuid4,
     primary_key=True,
-    index=True,
   )
   type: TaskType
   status: TaskStatus = Field(
@@ -49,10 +60,10 @@ class Task(SQLModel, table=True):
     sa_column=Column(Interval),
   )
 
-  post_id: Optional[str] = Field(default=None, foreign_key="posts.id")
+  post_id: Optional[str] = Field(default=None, foreign_key="posts.id", index=True)
   post: Optional["Post"] = Relationship(back_populates="tasks")
 
-  image_id: Optional[UUID] = Field(default=None, foreign_key="images.id")
+  image_id: Optional[UUID] = Field(default=None, foreign_key="images.id", index=True)
   image: Optional["Image"] = Relationship(back_populates="tasks")
 
   user_id: Optional[UUID] = Field(default=None, foreign_key="users.id", index=True)
@@ -63,6 +74,7 @@ class Task(SQLModel, table=True):
       TIMESTAMP(timezone=True),
       server_default=func.now(),
       nullable=False,
+      primary_key=True,
     ),
   )
   updated_at: Optional[datetime] = None
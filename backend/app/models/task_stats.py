@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Date, Index, Integer
+from sqlalchemy import Enum as PgEnum
+from sqlmodel import Field, SQLModel
+
+from app.schemas.task import TaskType
+from app.utils.utc_now import utc_now
+
+
+class UserTaskStats(SQLModel, table=True):
+  """
+  Running totals of a user's finished tasks of one type on one (UTC) day.
+
+  Rows are incremented by the workers in the same transaction that moves a
+  task to a terminal status, so reads never aggregate over `tasks`.
+  """
+
+  __tablename__ = "user_task_stats"  # type: ignore
+  __table_args__ = (
+    # Date ranges across all users, for the ops dashboard
+    Index("ix_user_task_stats_day", "day"),
+  )
+
+  user_id: UUID = Field(
+    foreign_key="users.id",
+    primary_key=True,
+    ondelete="CASCADE",
+  )
+  day: date = Field(sa_column=Column(Date, primary_key=True))
+  type: TaskType = Field(
+    sa_column=Column(
+      PgEnum(TaskType, name="tasktype", create_type=False),
+      primary_key=True,
+    ),
+  )
+
+  done_count: int = Field(default=0, sa_column=Column(Integer, nullable=False))
+  failed_count: int = Field(default=0, sa_column=Column(Integer, nullable=False))
+  skipped_count: int = Field(default=0, sa_column=Column(Integer, nullable=False))
+
+  # Sum and number of the finished tasks that recorded a duration
+  duration_ms_total: int = Field(
+    default=0, sa_column=Column(BigInteger, nullable=False)
+  )
+  duration_count: int = Field(default=0, sa_column=Column(Integer, nullable=False))
+
+  # From GenerationMetadata of the tasks that invoked a model
+  prompt_token_count: int = Field(
+    default=0, sa_column=Column(BigInteger, nullable=False)
+  )
+  candidates_token_count: int = Field(
+    default=0, sa_column=Column(BigInteger, nullable=False)
+  )
+  total_token_count: int = Field(
+    default=0, sa_column=Column(BigInteger, nullable=False)
+  )
+
+  updated_at: datetime = Field(
+    default_factory=utc_now,
+    sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+  )
+
+  def __repr__(self):
+    return f"<UserTaskStats(user_id={self.user_id}, day={self.day}, type={self.type})>"
@@ -1,6 +1,12 @@
 from .compliment import (
+  ComplimentFeedItem,
+  ComplimentFeedPage,
   ComplimentPublic,
   ComplimentRequest,
+  ComplimentsPage,
+  FeedGeneration,
+  FeedImage,
+  FeedPost,
   TranslateRequest,
   TranslateResponse,
 )
@@ -14,7 +20,20 @@ from .password import (
   UpdatePassword,
 )
 from .post import PostCreate, PostPublic, PostUpdate
-from .task import TaskCreate, TaskPublic, TaskStatus, TaskType, TaskUpdate
+from .scraper import ScraperBackendPublic, ScraperRoutingPublic
+from .task import (
+  TaskBatchItem,
+  TaskBatchPublic,
+  TaskCreate,
+  TaskCreatedPublic,
+  TaskPublic,
+  TasksPage,
+  TaskStatsDay,
+  TaskStatsPublic,
+  TaskStatus,
+  TaskType,
+  TaskUpdate,
+)
 from .token import Token, TokenPayload
 from .upload import ImageUploadRequest, ImageUploadResponse
 from .user import (
@@ -28,9 +47,15 @@ from .user import (
 )
 
 __all__ = [
+  "ComplimentFeedItem",
+  "ComplimentFeedPage",
   "ComplimentPublic",
   "ComplimentRequest",
+  "ComplimentsPage",
   "ComplimentOutput",
+  "FeedGeneration",
+  "FeedImage",
+  "FeedPost",
   "ForgotPassword",
   "InstagramUrlRequest",
   "ImagePublic",
@@ -42,8 +67,16 @@ __all__ = [
   "PostCreate",
   "PostPublic",
   "PostUpdate",
+  "ScraperBackendPublic",
+  "ScraperRoutingPublic",
+  "TaskBatchItem",
+  "TaskBatchPublic",
   "TaskCreate",
+  "TaskCreatedPublic",
   "TaskPublic",
+  "TasksPage",
+  "TaskStatsDay",
+  "TaskStatsPublic",
   "TaskStatus",
   "TaskType",
   "TaskUpdate",
@@ -1,8 +1,12 @@
 import uuid
+from datetime import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from sqlmodel import SQLModel
 
+from app.core.security import create_signed_image_url
+
 
 class ComplimentPublic(SQLModel):
   """
@@ -11,14 +15,82 @@ class ComplimentPublic(SQLModel):
   """
 
   id: uuid.UUID
+  image_id: uuid.UUID
   lang_id: str
   text: str
   tone_breakdown: dict | None = None
 
+  @computed_field  # type: ignore[prop-decorator]
+  @property
+  def image_url(self) -> str:
+    """Signed, expiring URL to view the complimented image."""
+
+    return create_signed_image_url(self.image_id)
+
   def __repr__(self):
     return f"<ComplimentPublic(id={self.id})>"
 
 
+class ComplimentsPage(SQLModel):
+  """A page of compliments, newest first."""
+
+  items: List[ComplimentPublic]
+  next_cursor: Optional[str] = None
+  total_estimate: Optional[int] = None
+
+
+class FeedImage(SQLModel):
+  """Image of a feed card."""
+
+  id: uuid.UUID
+  width: int
+  height: int
+
+  @computed_field  # type: ignore[prop-decorator]
+  @property
+  def url(self) -> str:
+    """Signed, expiring URL to view the image."""
+
+    return create_signed_image_url(self.id)
+
+
+class FeedPost(SQLModel):
+  """Post of a feed card."""
+
+  id: str
+  description: Optional[str] = None
+  taken_at: Optional[datetime] = None
+  author_username: Optional[str] = None
+
+
+class FeedGeneration(SQLModel):
+  """Generation metadata of a feed card."""
+
+  model_used: str
+  total_token_count: int
+  analysis_duration_ms: int
+
+
+class ComplimentFeedItem(SQLModel):
+  """A compliment with everything needed to render its card."""
+
+  id: uuid.UUID
+  lang_id: str
+  text: str
+  tone_breakdown: dict | None = None
+  created_at: datetime
+  image: FeedImage
+  post: FeedPost
+  generation: FeedGeneration
+
+
+class ComplimentFeedPage(SQLModel):
+  """A page of the compliment feed, newest first."""
+
+  items: List[ComplimentFeedItem]
+  next_cursor: Optional[str] = None
+
+
 class ComplimentRequest(BaseModel):
   post_id: str = Field(
     ...,
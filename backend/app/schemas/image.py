@@ -1,7 +1,10 @@
 import uuid
 
+from pydantic import computed_field
 from sqlmodel import SQLModel
 
+from app.core.security import create_signed_image_url
+
 
 class ImagePublic(SQLModel):
   """Public schema for an image."""
@@ -11,3 +14,10 @@ class ImagePublic(SQLModel):
   height: int
   width: int
   is_primary: bool
+
+  @computed_field  # type: ignore[prop-decorator]
+  @property
+  def url(self) -> str:
+    """Signed, expiring URL to view the image without authentication."""
+
+    return create_signed_image_url(self.id)
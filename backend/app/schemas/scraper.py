@@ -0,0 +1,19 @@
+from typing import List
+
+from sqlmodel import SQLModel
+
+
+class ScraperBackendPublic(SQLModel):
+  """Schema for the routing health of a scraper backend."""
+
+  name: str
+  weight: float
+  success_rate: float
+  avg_latency_ms: float
+  samples: int
+
+
+class ScraperRoutingPublic(SQLModel):
+  """Schema for the current scraper routing weights."""
+
+  backends: List[ScraperBackendPublic]
@@ -1,6 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from sqlmodel import SQLModel
@@ -48,6 +48,20 @@ class TaskPublic(TaskBase):
   updated_at: Optional[datetime]
 
 
+class TaskCreatedPublic(TaskPublic):
+  """Public schema for a newly created task."""
+
+  subscription_token: str
+
+
+class TasksPage(SQLModel):
+  """A page of tasks, newest first."""
+
+  items: List[TaskPublic]
+  next_cursor: Optional[str] = None
+  total_estimate: Optional[int] = None
+
+
 class TaskUpdate(SQLModel):
   """Schema for updating a task."""
 
@@ -57,3 +71,50 @@ class TaskUpdate(SQLModel):
   ended_at: Optional[datetime] = None
   duration: Optional[timedelta] = None
   updated_at: Optional[datetime] = None
+
+
+class TaskBatchItem(SQLModel):
+  """Outcome of a single URL in a batch download request."""
+
+  url: str
+  status: Literal["accepted", "conflict", "invalid"]
+  post_id: Optional[str] = None
+  task_id: Optional[UUID] = None
+  detail: Optional[str] = None
+
+
+class TaskBatchPublic(SQLModel):
+  """Public schema for a batch of download tasks."""
+
+  batch_id: UUID
+  items: List[TaskBatchItem]
+  subscription_token: Optional[str] = None
+
+
+class TaskStatsDay(SQLModel):
+  """Finished tasks of one type on one (UTC) day."""
+
+  day: date
+  type: TaskType
+  done: int
+  failed: int
+  skipped: int
+  avg_duration_ms: Optional[float] = None
+  prompt_tokens: int
+  candidates_tokens: int
+  total_tokens: int
+
+
+class TaskStatsPublic(SQLModel):
+  """Task outcomes over a range of days, with totals."""
+
+  start_day: date
+  end_day: date
+  done: int
+  failed: int
+  skipped: int
+  # done / (done + failed); skipped tasks are excluded
+  success_rate: Optional[float] = None
+  avg_duration_ms: Optional[float] = None
+  total_tokens: int
+  days: List[TaskStatsDay]
@@ -0,0 +1,146 @@
+"""
+Internal HTTP service wrapping the Playwright scraper.
+
+Runs Chromium and its context pool in a process of its own, so browser
+capacity scales independently of the download workers:
+
+  uvicorn app.scraper_service.main:app --port 8001
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.service.playwright_scraper import get_scraper_instance
+from app.service.scrape_cache import serialize_post_data
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(
+  level=logging.INFO,
+  format="%(asctime)s %(levelname)s: %(message)s",
+)
+
+
+class ScrapeRequest(BaseModel):
+  """Schema for a scrape request."""
+
+  url: str
+  shortcode: str
+
+
+class _Metrics:
+  """In-process request counters exposed on /metrics."""
+
+  def __init__(self):
+    self.requests = 0
+    self.failures = 0
+    self.rejected = 0
+    self.in_flight = 0
+    self.latency_seconds = 0.0
+
+
+metrics = _Metrics()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  scraper = await get_scraper_instance()
+
+  # Launch Chromium and warm the context pool before taking traffic
+  await scraper.start()
+  logger.info("Scraper service ready")
+
+  try:
+    yield
+
+  finally:
+    await scraper.close_browser()
+    logger.info("Scraper service stopped")
+
+
+app = FastAPI(title="Aura scraper", lifespan=lifespan)
+
+
+@app.post("/scrape")
+async def scrape(obj_in: ScrapeRequest) -> Response:
+  """
+  Scrape a post.
+
+  Returns the normalized post payload (the scrape cache format). Failures
+  are reported as 422 so the caller can tell them apart from an
+  overloaded (503) or unreachable service.
+  """
+
+  scraper = await get_scraper_instance()
+  pool_stats = scraper.pool_stats()
+
+  if pool_stats.get("queue_depth", 0) >= settings.scraper.SCRAPER_SERVICE_MAX_QUEUE:
+    metrics.rejected += 1
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Scraper queue is full",
+    )
+
+  metrics.requests += 1
+  metrics.in_flight += 1
+  start = time.monotonic()
+
+  try:
+    result = await scraper.scrape_instagram_post(obj_in.url, obj_in.shortcode)
+
+  finally:
+    metrics.in_flight -= 1
+    metrics.latency_seconds += time.monotonic() - start
+
+  if not result.success:
+    metrics.failures += 1
+    raise HTTPException(
+      status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+      detail={
+        "error": result.error,
+        "throttled": result.throttled,
+        "unavailable": result.unavailable,
+      },
+    )
+
+  payload = serialize_post_data(
+    {
+      "id": obj_in.shortcode,
+      "owner_username": result.owner_username or "unknown",
+      "description": result.description or "",
+      "taken_at": result.taken_at,
+      "images": result.images,
+    }
+  )
+
+  return Response(content=payload, media_type="application/json")
+
+
+@app.get("/metrics")
+async def get_metrics() -> Dict[str, Any]:
+  """Request counters and browser pool occupancy, including queue depth."""
+
+  scraper = await get_scraper_instance()
+
+  return {
+    "requests_total": metrics.requests,
+    "failures_total": metrics.failures,
+    "rejected_total": metrics.rejected,
+    "in_flight": metrics.in_flight,
+    "latency_seconds_total": round(metrics.latency_seconds, 3),
+    "pool": scraper.pool_stats(),
+  }
+
+
+@app.get("/health")
+async def health() -> bool:
+  """Health check endpoint."""
+
+  scraper = await get_scraper_instance()
+  return bool(scraper.browser and scraper.browser.is_connected())
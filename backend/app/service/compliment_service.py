@@ -1,11 +1,24 @@
 import uuid
-from typing import TYPE_CHECKING, Optional, Sequence
+from typing import TYPE_CHECKING, Optional
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.db_routing import read_only_method
+from app.data import compliment as compliment_repo
 from app.models import Compliment, Image, Post
-from app.schemas import ComplimentOutput, ComplimentPublic
+from app.schemas import (
+  ComplimentFeedPage,
+  ComplimentOutput,
+  ComplimentPublic,
+  ComplimentsPage,
+)
+from app.utils.pagination import (
+  after_cursor,
+  decode_cursor,
+  encode_cursor,
+  estimate_count,
+)
 
 if TYPE_CHECKING:
   from app.service.gemini_service import GeminiService
@@ -53,28 +66,126 @@ class ComplimentService:
 
     return compliments
 
+  async def copy_compliments(
+    self,
+    source_image_id: uuid.UUID,
+    image_id: uuid.UUID,
+  ) -> list[Compliment]:
+    """
+    Copies the compliments of a duplicate image to another image.
+
+    The copies keep the source generation metadata, so the reused analysis
+    is still attributed to the model invocation that produced it.
+    """
+
+    result = await self.session.exec(
+      select(Compliment).where(Compliment.image_id == source_image_id)
+    )
+
+    compliments = [
+      Compliment(
+        image_id=image_id,
+        lang_id=source.lang_id,
+        generation_id=source.generation_id,
+        text=source.text,
+        tone_breakdown=source.tone_breakdown,
+      )
+      for source in result.all()
+    ]
+
+    self.session.add_all(compliments)
+    await self.session.commit()
+
+    return compliments
+
+  @read_only_method
   async def get_all_compliments(
     self,
-    skip: int,
     limit: int,
+    cursor: Optional[str] = None,
     user_id: Optional[uuid.UUID] = None,
-  ) -> Sequence[ComplimentPublic]:
-    """Get all compliments."""
+    include_total: bool = False,
+  ) -> ComplimentsPage:
+    """
+    Get a page of compliments, newest first.
 
-    query = select(Compliment).join(Image).join(Post)
+    Pages are keyed on (created_at, id) rather than OFFSET.
+
+    Raises:
+      InvalidCursorError: If the cursor is malformed.
+    """
+
+    query = select(Compliment)
 
     if user_id:
-      query = query.where(Post.user_id == user_id)
+      query = query.join(Image).join(Post).where(Post.user_id == user_id)
+
+    page_query = query
+
+    condition = after_cursor(
+      Compliment.created_at,
+      Compliment.id,
+      decode_cursor(cursor) if cursor else None,
+    )
+    if condition is not None:
+      page_query = page_query.where(condition)
 
-    query = query.offset(skip).limit(limit)
+    # One extra row tells whether another page follows
+    page_query = page_query.order_by(
+      Compliment.created_at.desc(),  # type: ignore
+      Compliment.id.desc(),  # type: ignore
+    ).limit(limit + 1)
 
-    result = await self.session.exec(query)
+    result = await self.session.exec(page_query)
     compliments = result.all()
 
-    return [
-      ComplimentPublic.model_validate(compliment, from_attributes=True)
-      for compliment in compliments
-    ]
+    next_cursor = None
+    if len(compliments) > limit:
+      compliments = compliments[:limit]
+      next_cursor = encode_cursor(compliments[-1].created_at, compliments[-1].id)
+
+    return ComplimentsPage(
+      items=[
+        ComplimentPublic.model_validate(compliment, from_attributes=True)
+        for compliment in compliments
+      ],
+      next_cursor=next_cursor,
+      total_estimate=(
+        await estimate_count(self.session, query) if include_total else None
+      ),
+    )
+
+  @read_only_method
+  async def get_compliment_feed(
+    self,
+    limit: int,
+    cursor: Optional[str] = None,
+    user_id: Optional[uuid.UUID] = None,
+  ) -> ComplimentFeedPage:
+    """
+    Get a page of compliment cards, newest first.
+
+    Each item carries its image, post, author and generation metadata, so
+    a page costs one query and one request.
+
+    Raises:
+      InvalidCursorError: If the cursor is malformed.
+    """
+
+    # One extra row tells whether another page follows
+    items = await compliment_repo.get_compliment_feed(
+      session=self.session,
+      limit=limit + 1,
+      cursor=decode_cursor(cursor) if cursor else None,
+      user_id=user_id,
+    )
+
+    next_cursor = None
+    if len(items) > limit:
+      items = items[:limit]
+      next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return ComplimentFeedPage(items=items, next_cursor=next_cursor)
 
   async def get_compliment_by_id(
     self,
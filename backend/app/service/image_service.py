@@ -5,7 +5,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.data.image import (
   get_image_by_id,
+  get_image_dhash,
+  get_image_storage_key,
   get_primary_image_by_post_id,
+  resolve_storage_key,
 )
 from app.schemas import ImagePublic
 
@@ -50,3 +53,27 @@ class ImageService:
 
     if image:
       return ImagePublic.model_validate(image, from_attributes=True)
+
+  async def resolve_storage_key(self, storage_key: str) -> Optional[str]:
+    """Resolve a storage key that may reference a duplicate image's content."""
+
+    return await resolve_storage_key(
+      session=self.session,
+      storage_key=storage_key,
+    )
+
+  async def get_storage_key(self, image_id: UUID) -> Optional[str]:
+    """Get the resolved storage key of an image without an ownership check."""
+
+    return await get_image_storage_key(
+      session=self.session,
+      image_id=image_id,
+    )
+
+  async def get_dhash(self, image_id: UUID) -> Optional[int]:
+    """Get the content hash of an image, kept out of the public schema."""
+
+    return await get_image_dhash(
+      session=self.session,
+      image_id=image_id,
+    )
@@ -1,9 +1,11 @@
-from typing import NamedTuple
+from typing import Dict, NamedTuple, Optional
 from urllib.parse import urlparse
 
 import instaloader
+import requests
 
 from app.models import Image
+from app.utils.instagram import ScraperUnavailableError
 
 
 class PostSidecarNode(NamedTuple):
@@ -18,7 +20,109 @@ class PostSidecarNode(NamedTuple):
   height: int
 
 
-L = instaloader.Instaloader(quiet=True, compress_json=False)
+# Errors that mean the session was logged out: a login wall for anonymous
+# sessions, an aborted download for sessions Instagram signed out
+LOGIN_EXCEPTIONS = (
+  instaloader.exceptions.LoginRequiredException,
+  instaloader.exceptions.AbortDownloadException,
+)
+
+# Errors that mean the session is being throttled or was logged out,
+# rather than that the post itself cannot be fetched
+THROTTLE_EXCEPTIONS = (
+  instaloader.exceptions.TooManyRequestsException,
+  *LOGIN_EXCEPTIONS,
+)
+
+
+class FailFastRateController(instaloader.RateController):
+  """
+  Rate controller that surfaces 429s instead of sleeping through them.
+
+  Instaloader's default controller blocks the calling thread for minutes on
+  a 429; the scraping executor would rather put the session in its penalty
+  box and let other sessions carry on.
+  """
+
+  def handle_429(self, query_type: str) -> None:
+    raise instaloader.exceptions.TooManyRequestsException(
+      f"429 Too Many Requests ({query_type})"
+    )
+
+
+def create_loader(fail_fast: bool = False) -> instaloader.Instaloader:
+  """
+  Creates a metadata-only loader.
+
+  The worker stores CDN URLs and never reads media from disk, so nothing is
+  downloaded or written to the working directory.
+  """
+
+  return instaloader.Instaloader(
+    quiet=True,
+    download_pictures=False,
+    download_videos=False,
+    download_video_thumbnails=False,
+    download_geotags=False,
+    download_comments=False,
+    save_metadata=False,
+    compress_json=False,
+    post_metadata_txt_pattern="",
+    storyitem_metadata_txt_pattern="",
+    # Instaloader consults the rate controller about a 429 only before a
+    # retry, so fail-fast loaders still need a second attempt to raise it
+    max_connection_attempts=2 if fail_fast else 3,
+    rate_controller=FailFastRateController if fail_fast else None,
+  )
+
+
+L = create_loader()
+
+
+# Instaloader has no proxy option, so proxies go on its private requests
+# session. GraphQL queries run on copies of that session, which would drop
+# them, so copies keep the original's proxies. Written against instaloader
+# 4.14.1; keep all private access here.
+_copy_session = instaloader.instaloadercontext.copy_session
+
+
+def _copy_session_with_proxies(
+  session: requests.Session,
+  request_timeout: Optional[float] = None,
+) -> requests.Session:
+  new = _copy_session(session, request_timeout)
+  new.proxies = dict(session.proxies)
+  return new
+
+
+instaloader.instaloadercontext.copy_session = _copy_session_with_proxies
+
+
+def set_loader_proxies(
+  loader: instaloader.Instaloader, proxies: Dict[str, str]
+) -> None:
+  """Sends all requests of a loader through the given proxies."""
+
+  loader.context._session.proxies = proxies
+
+
+def throttle_cause(error: BaseException) -> Optional[BaseException]:
+  """
+  Find a throttling error behind `error`, if any.
+
+  Instaloader wraps the last error of a query that ran out of attempts in a
+  plain ConnectionException, so a 429 can only be told apart by its cause.
+  """
+
+  cause: Optional[BaseException] = error
+
+  while cause is not None:
+    if isinstance(cause, THROTTLE_EXCEPTIONS):
+      return cause
+
+    cause = cause.__cause__
+
+  return None
 
 
 def get_sidecar_nodes(post_data: instaloader.Post) -> list[PostSidecarNode]:
@@ -64,11 +168,17 @@ def extract_filename_from_url(url: str) -> str:
   return filename
 
 
-def download_instagram_post(shortcode: str):
+def download_instagram_post(
+  shortcode: str,
+  loader: Optional[instaloader.Instaloader] = None,
+):
   """
   Imports an Instagram post from a URL.
 
-  1. Fetches metadata and media from Instagram.
+  Instaloader instances are not thread-safe; concurrent callers must pass
+  a loader of their own (see InstaloaderExecutor).
+
+  1. Fetches post metadata from Instagram (no media is downloaded).
   2. Creates a new Author if they don't exist.
   3. Creates a new Post record.
   4. Creates new Image records for all images in the post.
@@ -76,13 +186,26 @@ def download_instagram_post(shortcode: str):
 
   try:
     post_data = instaloader.Post.from_shortcode(
-      L.context,
+      (loader or L).context,
       shortcode,
     )
 
-    L.download_post(post_data, shortcode)
+  except THROTTLE_EXCEPTIONS:
+    raise
 
   except instaloader.exceptions.InstaloaderException as e:
+    throttled = throttle_cause(e)
+    if throttled:
+      raise throttled from e
+
+    # A post that does not exist is a ConnectionException too
+    if isinstance(e, instaloader.exceptions.ConnectionException) and not isinstance(
+      e, instaloader.exceptions.QueryReturnedNotFoundException
+    ):
+      raise ScraperUnavailableError(
+        f'Could not fetch post "{shortcode}". Error: {e}'
+      ) from e
+
     raise ValueError(f'Could not fetch post "{shortcode}". Error: {e}')
 
   if post_data.is_video:
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import instaloader
+
+from app.core.config import settings
+from app.service.instagram import (
+  LOGIN_EXCEPTIONS,
+  THROTTLE_EXCEPTIONS,
+  create_loader,
+  download_instagram_post,
+  set_loader_proxies,
+)
+from app.service.proxy_pool import Proxy, ProxyPool, get_proxy_pool
+from app.utils.instagram import InstagramThrottledError, ScraperUnavailableError
+from app.utils.token_bucket import TokenBucket, acquire_all
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LoaderSlot:
+  """An Instaloader instance with its own budget and penalty state."""
+
+  name: str
+  loader: instaloader.Instaloader
+  bucket: TokenBucket
+  penalized_until: float = 0
+  requests: int = 0
+
+
+class InstaloaderExecutor:
+  """
+  Dedicated, rate-limited executor for instaloader scrapes.
+
+  - Runs on its own thread pool, sized for what Instagram tolerates rather
+    than for the default executor's CPU-based size.
+  - Hands each call an Instaloader of its own from a pool; instances are
+    never shared between threads.
+  - Spends a token from a global bucket and from the loader's own bucket
+    before every request.
+  - Puts loaders that hit a 429 or a login wall in a penalty box, so the
+    remaining sessions keep working instead of every task failing.
+  - Sends requests through the proxy pool when one is configured, sticking
+    each session to its proxy and spending that proxy's tokens too.
+  """
+
+  def __init__(
+    self,
+    max_workers: int,
+    session_usernames: List[str],
+    session_dir: Optional[str],
+    rate_per_minute: float,
+    burst: int,
+    session_rate_per_minute: float,
+    session_burst: int,
+    throttle_penalty_seconds: float,
+    login_penalty_seconds: float,
+    acquire_timeout_seconds: float,
+    proxy_pool: Optional[ProxyPool] = None,
+  ):
+    self.proxy_pool = proxy_pool
+    self.throttle_penalty_seconds = throttle_penalty_seconds
+    self.login_penalty_seconds = login_penalty_seconds
+    self.acquire_timeout_seconds = acquire_timeout_seconds
+
+    self._executor = ThreadPoolExecutor(
+      max_workers=max_workers,
+      thread_name_prefix="instaloader",
+    )
+    self._bucket = TokenBucket(rate=rate_per_minute / 60, capacity=burst)
+    self._slots: "queue.Queue[_LoaderSlot]" = queue.Queue()
+    self._all_slots: List[_LoaderSlot] = []
+
+    def make_slot(name: str, loader: instaloader.Instaloader) -> _LoaderSlot:
+      return _LoaderSlot(
+        name=name,
+        loader=loader,
+        bucket=TokenBucket(rate=session_rate_per_minute / 60, capacity=session_burst),
+      )
+
+    for username in session_usernames:
+      loader = create_loader(fail_fast=True)
+      filename = (
+        os.path.join(session_dir, f"session-{username}") if session_dir else None
+      )
+
+      try:
+        loader.load_session_from_file(username, filename)
+
+      except FileNotFoundError:
+        logger.warning(f"No saved instaloader session for {username}, skipping")
+        continue
+
+      self._add_slot(make_slot(username, loader))
+
+    # Without sessions, use one anonymous loader per worker thread
+    if not self._all_slots:
+      for i in range(max_workers):
+        self._add_slot(make_slot(f"anonymous-{i}", create_loader(fail_fast=True)))
+
+  def _add_slot(self, slot: _LoaderSlot) -> None:
+    self._all_slots.append(slot)
+    self._slots.put(slot)
+
+  def _checkout(self, deadline: float) -> _LoaderSlot:
+    """Takes a loader that is out of the penalty box, waiting if needed."""
+
+    while True:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        raise ScraperUnavailableError(
+          "All Instagram sessions are rate limited or cooling down. Try again later."
+        )
+
+      try:
+        slot = self._slots.get(timeout=remaining)
+
+      except queue.Empty:
+        continue
+
+      wait = slot.penalized_until - time.monotonic()
+      if wait <= 0:
+        return slot
+
+      # Still penalized; hand it back and give other slots a chance
+      self._slots.put(slot)
+      time.sleep(min(wait, remaining, 1.0))
+
+  def _penalize(self, slot: _LoaderSlot, error: Exception) -> None:
+    if isinstance(error, LOGIN_EXCEPTIONS):
+      penalty = self.login_penalty_seconds
+    else:
+      penalty = self.throttle_penalty_seconds
+
+    slot.penalized_until = time.monotonic() + penalty
+    logger.warning(f"Instaloader session {slot.name} penalized for {penalty}s: {error}")
+
+  def _lease_proxy(
+    self,
+    proxy_pool: ProxyPool,
+    slot: _LoaderSlot,
+    deadline: float,
+  ) -> Proxy:
+    """Leases the session's proxy, waiting for capacity until the deadline."""
+
+    while True:
+      proxy = proxy_pool.acquire(session_key=slot.name)
+      if proxy:
+        return proxy
+
+      if time.monotonic() >= deadline:
+        raise ScraperUnavailableError("All scraping proxies are busy or cooling down.")
+
+      time.sleep(0.5)
+
+  def _run(self, shortcode: str) -> Dict[str, Any]:
+    """Runs one scrape on an executor thread."""
+
+    deadline = time.monotonic() + self.acquire_timeout_seconds
+    slot = self._checkout(deadline)
+    proxy_pool = self.proxy_pool
+    proxy: Optional[Proxy] = None
+
+    try:
+      buckets = [self._bucket, slot.bucket]
+
+      if proxy_pool:
+        proxy = self._lease_proxy(proxy_pool, slot, deadline)
+        buckets.append(proxy.bucket)
+        set_loader_proxies(slot.loader, proxy.requests_proxies())
+
+      if not acquire_all(buckets, timeout=max(deadline - time.monotonic(), 0)):
+        raise ScraperUnavailableError(
+          "Instagram request budget exhausted. Try again later."
+        )
+
+      slot.requests += 1
+      start = time.monotonic()
+
+      try:
+        post_data = download_instagram_post(shortcode, loader=slot.loader)
+
+      except THROTTLE_EXCEPTIONS as e:
+        if proxy and proxy_pool:
+          proxy_pool.record(proxy, False, time.monotonic() - start, throttled=True)
+
+        # A 429 behind a proxy is charged to the proxy's IP, not the session
+        if not proxy or isinstance(e, LOGIN_EXCEPTIONS):
+          self._penalize(slot, e)
+        raise InstagramThrottledError(
+          f'Could not fetch post "{shortcode}". Error: {e}'
+        ) from e
+
+      except ValueError:
+        if proxy and proxy_pool:
+          proxy_pool.record(proxy, False, time.monotonic() - start)
+        raise
+
+      if proxy and proxy_pool:
+        proxy_pool.record(proxy, True, time.monotonic() - start)
+
+      return post_data
+
+    finally:
+      if proxy and proxy_pool:
+        proxy_pool.release(proxy)
+
+      self._slots.put(slot)
+
+  async def download(self, shortcode: str) -> Dict[str, Any]:
+    """Scrapes a post on the dedicated executor."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(self._executor, self._run, shortcode)
+
+  def stats(self) -> List[Dict[str, Any]]:
+    """Returns per-session request counts and remaining penalty."""
+
+    now = time.monotonic()
+    return [
+      {
+        "name": slot.name,
+        "requests": slot.requests,
+        "penalized_for": max(slot.penalized_until - now, 0),
+      }
+      for slot in self._all_slots
+    ]
+
+  def shutdown(self) -> None:
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executor_instance: Optional[InstaloaderExecutor] = None
+
+
+def get_instaloader_executor() -> InstaloaderExecutor:
+  """Get or create the process-wide instaloader executor."""
+
+  global _executor_instance
+  if _executor_instance is None:
+    config = settings.scraper
+    _executor_instance = InstaloaderExecutor(
+      max_workers=config.INSTALOADER_MAX_WORKERS,
+      session_usernames=config.INSTALOADER_SESSION_USERNAMES,
+      session_dir=config.INSTALOADER_SESSION_DIR,
+      rate_per_minute=config.INSTALOADER_RATE_PER_MINUTE,
+      burst=config.INSTALOADER_BURST,
+      session_rate_per_minute=config.INSTALOADER_SESSION_RATE_PER_MINUTE,
+      session_burst=config.INSTALOADER_SESSION_BURST,
+      throttle_penalty_seconds=config.INSTALOADER_THROTTLE_PENALTY_SECONDS,
+      login_penalty_seconds=config.INSTALOADER_LOGIN_PENALTY_SECONDS,
+      acquire_timeout_seconds=config.INSTALOADER_ACQUIRE_TIMEOUT_SECONDS,
+      proxy_pool=get_proxy_pool(),
+    )
+
+  return _executor_instance
@@ -1,14 +1,105 @@
 import asyncio
+import contextlib
+import json
 import logging
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import urlparse
 
-from playwright.async_api import Browser, Page, async_playwright
-
+from playwright.async_api import (
+  Browser,
+  BrowserContext,
+  Page,
+  Response,
+  Route,
+  async_playwright,
+)
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.core.config import settings
 from app.models import Image
+from app.service.proxy_pool import Proxy, ProxyPool, get_proxy_pool
+from app.utils.instagram import (
+  USER_AGENT,
+  InstagramThrottledError,
+  ScraperUnavailableError,
+)
 
 logger = logging.getLogger(__name__)
 
+POST_IMAGE_SELECTOR = "article img"
+
+# XHR endpoints whose JSON responses carry the post payload
+POST_DATA_URL_PARTS = ("/graphql/query", "/api/graphql", "/api/v1/media/")
+
+# Returns the embedded JSON blobs that mention the post shortcode
+EMBEDDED_JSON_SCRIPT = """
+(shortcode) => Array.from(document.querySelectorAll('script[type="application/json"]'))
+  .map((el) => el.textContent)
+  .filter((text) => text && text.includes(shortcode))
+"""
+
+# Returns every post image's attributes in a single round trip
+IMAGE_ATTRIBUTES_SCRIPT = """
+(selector) => Array.from(document.querySelectorAll(selector)).map((el) => ({
+  src: el.currentSrc || el.getAttribute("src"),
+  width: el.naturalWidth,
+  height: el.naturalHeight,
+}))
+"""
+
+# Resource types never needed to read post data
+BLOCKED_RESOURCE_TYPES = {"font", "media", "manifest", "texttrack", "eventsource"}
+
+# Tracking and logging endpoints, matched as URL substrings
+BLOCKED_URL_PARTS = (
+  "/logging_client_events",
+  "/ajax/bz",
+  "/api/v1/web/logging",
+  "graph.instagram.com/logging",
+  "facebook.com/tr",
+  "connect.facebook.net",
+  "google-analytics.com",
+  "googletagmanager.com",
+  "doubleclick.net",
+)
+
+# Scripts are only loaded from Instagram's own hosts
+FIRST_PARTY_HOSTS = ("instagram.com", "cdninstagram.com", "fbcdn.net")
+
+
+def _should_block(resource_type: str, url: str) -> bool:
+  """Decide whether a request can be aborted without affecting scraping."""
+
+  if resource_type in BLOCKED_RESOURCE_TYPES:
+    return True
+
+  if any(part in url for part in BLOCKED_URL_PARTS):
+    return True
+
+  if resource_type == "script":
+    host = urlparse(url).hostname or ""
+    return not any(
+      host == first_party or host.endswith(f".{first_party}")
+      for first_party in FIRST_PARTY_HOSTS
+    )
+
+  return False
+
+
+async def _block_heavy_resources(route: Route) -> None:
+  """Route handler aborting fonts, media, analytics and third-party scripts."""
+
+  request = route.request
+
+  if _should_block(request.resource_type, request.url):
+    await route.abort()
+
+  else:
+    await route.continue_()
+
 
 class ScrapedPostResult:
   """Result of scraping an Instagram post."""
@@ -19,8 +110,10 @@ class ScrapedPostResult:
     images: Optional[list[Image]] = None,
     owner_username: Optional[str] = None,
     description: Optional[str] = None,
-    taken_at: Optional[str] = None,
+    taken_at: Optional[datetime] = None,
     error: Optional[str] = None,
+    throttled: bool = False,
+    unavailable: bool = False,
   ):
     self.success = success
     self.images = images or []
@@ -28,6 +121,384 @@ class ScrapedPostResult:
     self.description = description
     self.taken_at = taken_at
     self.error = error
+    # Instagram rate limited or login-walled the request
+    self.throttled = throttled
+    # The browser or network failed before the post could be read
+    self.unavailable = unavailable
+
+
+def _find_post_node(payload: Any, shortcode: str) -> Optional[Dict[str, Any]]:
+  """Find the media node for `shortcode` anywhere in a JSON payload."""
+
+  stack = [payload]
+
+  while stack:
+    node = stack.pop()
+
+    if isinstance(node, dict):
+      if shortcode in (node.get("shortcode"), node.get("code")) and (
+        "display_url" in node or "image_versions2" in node or "carousel_media" in node
+      ):
+        return node
+
+      stack.extend(node.values())
+
+    elif isinstance(node, list):
+      stack.extend(node)
+
+  return None
+
+
+def _largest_candidate(media: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  """Pick the highest resolution version of an API v1 media item."""
+
+  candidates = (media.get("image_versions2") or {}).get("candidates") or []
+  return max(candidates, key=lambda c: c.get("width", 0), default=None)
+
+
+def _parse_api_media(node: Dict[str, Any]) -> Dict[str, Any]:
+  """Parse an API v1 (`xdt_api__v1__media__shortcode__web_info`) item."""
+
+  media_items = node.get("carousel_media") or [node]
+  images = []
+
+  for media in media_items:
+    # media_type 2 is a video
+    if media.get("media_type") == 2:
+      continue
+
+    candidate = _largest_candidate(media)
+    if candidate:
+      images.append(
+        (
+          candidate["url"],
+          media.get("original_width") or candidate["width"],
+          media.get("original_height") or candidate["height"],
+        )
+      )
+
+  caption = node.get("caption") or {}
+
+  return {
+    "images": images,
+    "owner_username": (node.get("user") or node.get("owner") or {}).get("username"),
+    "description": caption.get("text") if isinstance(caption, dict) else None,
+    "taken_at": node.get("taken_at"),
+  }
+
+
+def _parse_graphql_media(node: Dict[str, Any]) -> Dict[str, Any]:
+  """Parse a GraphQL `shortcode_media` node."""
+
+  edges = (node.get("edge_sidecar_to_children") or {}).get("edges") or []
+  media_items = [edge["node"] for edge in edges] or [node]
+  images = []
+
+  for media in media_items:
+    if media.get("is_video"):
+      continue
+
+    dimensions = media.get("dimensions") or {}
+    images.append(
+      (
+        media["display_url"],
+        dimensions.get("width", 0),
+        dimensions.get("height", 0),
+      )
+    )
+
+  caption_edges = (node.get("edge_media_to_caption") or {}).get("edges") or []
+
+  return {
+    "images": images,
+    "owner_username": (node.get("owner") or {}).get("username"),
+    "description": caption_edges[0]["node"]["text"] if caption_edges else None,
+    "taken_at": node.get("taken_at_timestamp"),
+  }
+
+
+def parse_post_payload(payload: Any, shortcode: str) -> Optional[ScrapedPostResult]:
+  """
+  Parse images, owner, caption and timestamp from a post's JSON payload.
+
+  Understands both the GraphQL `shortcode_media` shape and the API v1
+  media item shape, whether embedded in the page or returned by an XHR.
+
+  Returns:
+    The parsed result, or None if the payload does not describe the post.
+  """
+
+  node = _find_post_node(payload, shortcode)
+  if not node:
+    return None
+
+  if "image_versions2" in node or "carousel_media" in node:
+    parsed = _parse_api_media(node)
+  else:
+    parsed = _parse_graphql_media(node)
+
+  images = [
+    Image(
+      post_id=shortcode,
+      storage_key=url,
+      width=int(width),
+      height=int(height),
+      is_primary=(idx == 0),
+    )
+    for idx, (url, width, height) in enumerate(parsed["images"])
+  ]
+
+  if not images:
+    return ScrapedPostResult(
+      success=False,
+      error=f'Post "{shortcode}" contains no images.',
+    )
+
+  taken_at = parsed["taken_at"]
+
+  return ScrapedPostResult(
+    success=True,
+    images=images,
+    owner_username=parsed["owner_username"],
+    description=parsed["description"],
+    taken_at=(datetime.fromtimestamp(taken_at, tz=timezone.utc) if taken_at else None),
+  )
+
+
+class _PooledContext:
+  """A browser context tracked by the pool."""
+
+  def __init__(self, context: BrowserContext, proxy: Optional[Proxy] = None):
+    self.context = context
+    self.proxy = proxy
+    self.active_pages = 0
+    self.navigations = 0
+    self.retired = False
+
+
+class BrowserContextPool:
+  """
+  Bounded pool of pre-warmed browser contexts.
+
+  At most `size * pages_per_context` pages are open at once; callers beyond
+  that wait for a free slot. A context is retired once it has served
+  `max_navigations` pages or a page reports a JS heap above
+  `max_heap_bytes`, and is closed as soon as its last page is released.
+
+  With a proxy pool, each context holds a proxy lease for its lifetime and
+  reports page outcomes to it; a throttled proxy retires its context so
+  the replacement is opened through another proxy.
+  """
+
+  def __init__(
+    self,
+    browser: Browser,
+    size: int,
+    pages_per_context: int,
+    max_navigations: int,
+    max_heap_bytes: int,
+    context_options: Optional[Dict[str, Any]] = None,
+    block_resources: bool = True,
+    proxy_pool: Optional[ProxyPool] = None,
+  ):
+    self._browser = browser
+    self._size = size
+    self._pages_per_context = pages_per_context
+    self._max_navigations = max_navigations
+    self._max_heap_bytes = max_heap_bytes
+    self._context_options = context_options or {}
+    self._block_resources = block_resources
+    self._proxy_pool = proxy_pool
+
+    self._contexts: list[_PooledContext] = []
+    self._draining: set[_PooledContext] = set()
+    self._slots = asyncio.Semaphore(size * pages_per_context)
+    self._lock = asyncio.Lock()
+    self._outcomes: Dict[Page, tuple[bool, bool]] = {}
+    self._waiting = 0
+
+  async def warm_up(self) -> None:
+    """Open contexts until the pool is full."""
+
+    async with self._lock:
+      await self._fill()
+
+  async def close(self) -> None:
+    """Close every context owned by the pool."""
+
+    async with self._lock:
+      for pooled in [*self._contexts, *self._draining]:
+        await self._close_context(pooled)
+
+      self._contexts.clear()
+      self._draining.clear()
+
+  @asynccontextmanager
+  async def page(self) -> AsyncIterator[Page]:
+    """Check out a new page from the least busy context."""
+
+    self._waiting += 1
+
+    try:
+      await self._slots.acquire()
+
+    finally:
+      self._waiting -= 1
+
+    try:
+      pooled = await self._checkout()
+
+      try:
+        page = await pooled.context.new_page()
+
+      except Exception:
+        # The context is unusable (e.g. the browser crashed); replace it
+        await self._release(pooled, heap_bytes=None, failed=True)
+        raise
+
+      start = time.monotonic()
+
+      try:
+        # Every navigation through a proxy spends one of the proxy's tokens
+        if pooled.proxy:
+          while wait := pooled.proxy.bucket.try_acquire():
+            await asyncio.sleep(wait)
+
+          start = time.monotonic()
+
+        yield page
+
+      finally:
+        heap_bytes = await self._heap_size(page)
+        success, throttled = self._outcomes.pop(page, (False, False))
+
+        if pooled.proxy and self._proxy_pool:
+          self._proxy_pool.record(
+            pooled.proxy, success, time.monotonic() - start, throttled=throttled
+          )
+
+        with contextlib.suppress(Exception):
+          await page.close()
+
+        await self._release(pooled, heap_bytes=heap_bytes, failed=throttled)
+
+    finally:
+      self._slots.release()
+
+  def stats(self) -> Dict[str, int]:
+    """Returns pool occupancy and the number of callers queued for a page."""
+
+    return {
+      "contexts": len(self._contexts),
+      "draining_contexts": len(self._draining),
+      "active_pages": sum(c.active_pages for c in self._contexts),
+      "capacity": self._size * self._pages_per_context,
+      "queue_depth": self._waiting,
+    }
+
+  def report(self, page: Page, success: bool, throttled: bool = False) -> None:
+    """Record the outcome of a page, fed to its proxy's score on release."""
+
+    self._outcomes[page] = (success, throttled)
+
+  async def _fill(self) -> None:
+    """Replace retired contexts. Must be called with the lock held."""
+
+    while len(self._contexts) < self._size:
+      options = dict(self._context_options)
+      proxy = None
+
+      if self._proxy_pool:
+        proxy = self._proxy_pool.acquire(
+          session_key=f"playwright-context-{len(self._contexts)}"
+        )
+        if not proxy:
+          # Never fall back to the worker's own IP
+          break
+
+        options["proxy"] = proxy.playwright_config()
+
+      try:
+        context = await self._browser.new_context(**options)
+
+        if self._block_resources:
+          await context.route("**/*", _block_heavy_resources)
+
+      except Exception:
+        if proxy and self._proxy_pool:
+          self._proxy_pool.release(proxy)
+        raise
+
+      self._contexts.append(_PooledContext(context, proxy))
+
+  async def _close_context(self, pooled: _PooledContext) -> None:
+    """Close a context and return its proxy lease."""
+
+    with contextlib.suppress(Exception):
+      await pooled.context.close()
+
+    if pooled.proxy and self._proxy_pool:
+      self._proxy_pool.release(pooled.proxy)
+      pooled.proxy = None
+
+  async def _checkout(self) -> _PooledContext:
+    """Reserve a page on the least busy context."""
+
+    async with self._lock:
+      await self._fill()
+
+      pooled = min(
+        (c for c in self._contexts if c.active_pages < self._pages_per_context),
+        key=lambda c: c.active_pages,
+        default=None,
+      )
+      if not pooled:
+        raise RuntimeError("No browser context available: all proxies are busy")
+
+      pooled.active_pages += 1
+
+      return pooled
+
+  async def _release(
+    self,
+    pooled: _PooledContext,
+    heap_bytes: Optional[int],
+    failed: bool,
+  ) -> None:
+    """Return a page slot and retire the context if it is due for recycling."""
+
+    async with self._lock:
+      pooled.active_pages -= 1
+      pooled.navigations += 1
+
+      exhausted = pooled.navigations >= self._max_navigations
+      bloated = heap_bytes is not None and heap_bytes > self._max_heap_bytes
+
+      if not pooled.retired and (failed or exhausted or bloated):
+        logger.info(
+          "Recycling browser context after %d navigations (heap=%s bytes)",
+          pooled.navigations,
+          heap_bytes,
+        )
+        pooled.retired = True
+        self._contexts.remove(pooled)
+        self._draining.add(pooled)
+
+      if pooled.retired and pooled.active_pages == 0:
+        self._draining.discard(pooled)
+        await self._close_context(pooled)
+
+  @staticmethod
+  async def _heap_size(page: Page) -> Optional[int]:
+    """Read the page's used JS heap size (Chromium only)."""
+
+    try:
+      return await page.evaluate(
+        "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+      )
+
+    except Exception:
+      return None
 
 
 class PlaywrightScraperService:
@@ -36,15 +507,36 @@ class PlaywrightScraperService:
   def __init__(self):
     self.browser: Optional[Browser] = None
     self._playwright = None
+    self._pool: Optional[BrowserContextPool] = None
     self._lock = asyncio.Lock()
 
+  async def start(self) -> None:
+    """Launch the browser and warm the context pool ahead of the first scrape."""
+    await self._init_browser()
+
   async def _init_browser(self) -> None:
-    """Initialize the browser if not already initialized."""
+    """
+    Initialize the browser and its context pool if not already initialized.
+
+    A browser that is no longer connected (e.g. Chromium crashed) is
+    discarded and relaunched together with a fresh pool.
+    """
     async with self._lock:
+      if self.browser and not self.browser.is_connected():
+        logger.warning("Browser disconnected, relaunching")
+        await self._shutdown()
+
       if not self.browser:
-        self._playwright = await async_playwright().start()
+        if not self._playwright:
+          self._playwright = await async_playwright().start()
+
+        proxy_pool = get_proxy_pool()
+
         self.browser = await self._playwright.chromium.launch(
           headless=True,
+          # Contexts set their own proxy; Chromium needs a launch-level
+          # placeholder for per-context proxies to take effect
+          proxy={"server": "http://per-context"} if proxy_pool else None,
           args=[
             "--no-sandbox",
             "--disable-setuid-sandbox",
@@ -53,19 +545,44 @@ class PlaywrightScraperService:
             "--disable-gpu",
           ],
         )
+        self._pool = BrowserContextPool(
+          browser=self.browser,
+          size=settings.scraper.SCRAPER_CONTEXT_POOL_SIZE,
+          pages_per_context=settings.scraper.SCRAPER_PAGES_PER_CONTEXT,
+          max_navigations=settings.scraper.SCRAPER_CONTEXT_MAX_NAVIGATIONS,
+          max_heap_bytes=settings.scraper.SCRAPER_CONTEXT_MAX_HEAP_MB * 1024 * 1024,
+          context_options={"user_agent": USER_AGENT},
+          block_resources=settings.scraper.SCRAPER_BLOCK_RESOURCES,
+          proxy_pool=proxy_pool or None,
+        )
+        await self._pool.warm_up()
         logger.info("Browser initialized")
 
+  async def _shutdown(self) -> None:
+    """Close the pool and the browser. Must be called with the lock held."""
+    if self._pool:
+      await self._pool.close()
+      self._pool = None
+
+    if self.browser:
+      with contextlib.suppress(Exception):
+        await self.browser.close()
+      self.browser = None
+      logger.info("Browser closed")
+
   async def close_browser(self) -> None:
     """Close the browser and cleanup resources."""
     async with self._lock:
-      if self.browser:
-        await self.browser.close()
-        self.browser = None
-        logger.info("Browser closed")
+      await self._shutdown()
+
       if self._playwright:
         await self._playwright.stop()
         self._playwright = None
 
+  def pool_stats(self) -> Dict[str, int]:
+    """Returns the context pool occupancy, or an empty dict before launch."""
+    return self._pool.stats() if self._pool else {}
+
   async def scrape_instagram_post(self, url: str, shortcode: str) -> ScrapedPostResult:
     """
     Scrape an Instagram post using Playwright.
@@ -77,79 +594,163 @@ class PlaywrightScraperService:
     Returns:
         ScrapedPostResult with images and metadata
     """
-    page: Optional[Page] = None
-
     try:
       await self._init_browser()
 
-      if not self.browser:
+      if not self._pool:
         raise Exception("Failed to initialize browser")
 
-      # Create new page with a realistic user agent
-      page = await self.browser.new_page(
-        user_agent=(
-          "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-          "AppleWebKit/537.36 (KHTML, like Gecko) "
-          "Chrome/120.0.0.0 Safari/537.36"
-        )
+      # Pages come from pooled contexts with a realistic user agent
+      async with self._pool.page() as page:
+        result = await self._scrape_page(page, url, shortcode)
+        self._pool.report(page, success=result.success, throttled=result.throttled)
+        return result
+
+    except Exception as error:
+      logger.exception(f"Error scraping Instagram post {shortcode}: {error}")
+      return ScrapedPostResult(
+        success=False,
+        error=str(error),
+        unavailable=True,
       )
 
-      logger.info(f"Navigating to {url}")
-      await page.goto(url, wait_until="networkidle", timeout=30000)
+  async def _scrape_page(
+    self, page: Page, url: str, shortcode: str
+  ) -> ScrapedPostResult:
+    """
+    Navigate to a post and extract its images and metadata.
 
-      # Wait a bit for page to fully load
-      await page.wait_for_timeout(2000)
+    The structured post payload is preferred: first the JSON embedded in
+    the page, then any GraphQL/XHR response captured during the load. The
+    DOM is only walked as a last resort.
+    """
+    parsed: List[ScrapedPostResult] = []
+    post_data_parsed = asyncio.Event()
 
-      # Close any modals/dialogs that might appear
-      try:
-        # Try to close "Log in" modal
-        close_button = page.locator('svg[aria-label="Close"]').first
-        if await close_button.is_visible(timeout=3000):
-          await close_button.click()
-          logger.info("Closed modal")
-          await page.wait_for_timeout(1000)
-      except Exception as e:
-        logger.debug(f"No modal to close or modal close failed: {e}")
-
-      # Extract images from the post
-      images_data = await self._extract_images(page, shortcode)
-
-      if not images_data:
-        return ScrapedPostResult(
-          success=False,
-          error="No images found on the page",
-        )
+    async def capture_post_data(response: Response) -> None:
+      if response.ok and any(part in response.url for part in POST_DATA_URL_PARTS):
+        with contextlib.suppress(Exception):
+          result = parse_post_payload(await response.json(), shortcode)
+
+          if result:
+            parsed.append(result)
+            post_data_parsed.set()
 
-      # Extract metadata
-      owner_username = await self._extract_username(page)
-      description = await self._extract_description(page)
-      taken_at = None  # Instagram doesn't expose exact timestamp easily
+    page.on("response", capture_post_data)
 
-      logger.info(f"Successfully scraped {len(images_data)} images from {shortcode}")
+    logger.info(f"Navigating to {url}")
+    response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
+    if (response and response.status == 429) or "/accounts/login" in page.url:
       return ScrapedPostResult(
-        success=True,
-        images=images_data,
-        owner_username=owner_username,
-        description=description,
-        taken_at=taken_at,
+        success=False,
+        error="Instagram rate limited the request or required a login",
+        throttled=True,
       )
 
-    except Exception as error:
-      logger.exception(f"Error scraping Instagram post {shortcode}: {error}")
+    result = await self._extract_from_embedded_json(page, shortcode)
+    if result:
+      return result
+
+    # Wait for the post media itself rather than for the network to settle,
+    # or for a GraphQL/XHR response carrying the post, whichever comes first
+    media_rendered = asyncio.ensure_future(
+      page.wait_for_selector(POST_IMAGE_SELECTOR, timeout=15000)
+    )
+    post_data_captured = asyncio.ensure_future(post_data_parsed.wait())
+
+    try:
+      await asyncio.wait(
+        {media_rendered, post_data_captured},
+        return_when=asyncio.FIRST_COMPLETED,
+      )
+
+    finally:
+      media_rendered.cancel()
+      post_data_captured.cancel()
+
+    if parsed:
+      logger.info(f"Parsed post {shortcode} from a captured response")
+      return parsed[0]
+
+    try:
+      await media_rendered
+
+    except PlaywrightTimeoutError:
       return ScrapedPostResult(
         success=False,
-        error=str(error),
+        error="No images found on the page",
       )
 
-    finally:
-      if page:
-        await page.close()
+    return await self._extract_from_dom(page, shortcode)
+
+  async def _extract_from_embedded_json(
+    self,
+    page: Page,
+    shortcode: str,
+  ) -> Optional[ScrapedPostResult]:
+    """Parse the post from the JSON blobs embedded in the page, if present."""
+    try:
+      blobs = await page.evaluate(EMBEDDED_JSON_SCRIPT, shortcode)
+
+    except Exception as e:
+      logger.debug(f"Could not read embedded JSON: {e}")
+      return None
+
+    for blob in blobs:
+      try:
+        result = parse_post_payload(json.loads(blob), shortcode)
+
+      except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        continue
+
+      if result:
+        logger.info(f"Parsed post {shortcode} from embedded JSON")
+        return result
+
+    return None
+
+  async def _extract_from_dom(self, page: Page, shortcode: str) -> ScrapedPostResult:
+    """Fall back to reading the post from the rendered DOM."""
+    # Close any modals/dialogs that might appear
+    try:
+      # Try to close "Log in" modal
+      close_button = page.locator('svg[aria-label="Close"]').first
+      if await close_button.is_visible():
+        await close_button.click()
+        logger.info("Closed modal")
+        await close_button.wait_for(state="hidden", timeout=3000)
+    except Exception as e:
+      logger.debug(f"No modal to close or modal close failed: {e}")
+
+    # Extract images from the post
+    images_data = await self._extract_images(page, shortcode)
+
+    if not images_data:
+      return ScrapedPostResult(
+        success=False,
+        error="No images found on the page",
+      )
+
+    # Extract metadata
+    owner_username = await self._extract_username(page)
+    description = await self._extract_description(page)
+
+    logger.info(f"Successfully scraped {len(images_data)} images from {shortcode}")
+
+    return ScrapedPostResult(
+      success=True,
+      images=images_data,
+      owner_username=owner_username,
+      description=description,
+    )
 
   async def _extract_images(self, page: Page, post_id: str) -> list[Image]:
     """
     Extract all images from the Instagram post page.
 
+    All image attributes are read with a single `page.evaluate` call.
+
     Args:
         page: The Playwright page
         post_id: The post shortcode
@@ -157,60 +758,52 @@ class PlaywrightScraperService:
     Returns:
         List of Image objects with storage_key, width, height
     """
-    images = []
+    images: list[Image] = []
 
     try:
-      # Wait for images to load
-      await page.wait_for_selector("article img", timeout=10000)
-
       # Get all image elements within the article (post content)
-      img_elements = await page.locator("article img").all()
-
-      logger.info(f"Found {len(img_elements)} image elements")
-
-      for idx, img_element in enumerate(img_elements):
-        try:
-          # Get image URL
-          img_url = await img_element.get_attribute("src")
-
-          if not img_url:
-            logger.warning(f"Image {idx} has no src attribute")
-            continue
-
-          # Skip profile pictures and other small images
-          # Instagram post images have specific characteristics
-          if "profile" in img_url.lower() or "avatar" in img_url.lower():
-            logger.debug(f"Skipping profile/avatar image: {img_url}")
-            continue
-
-          # Get natural dimensions
-          width = await img_element.evaluate("el => el.naturalWidth")
-          height = await img_element.evaluate("el => el.naturalHeight")
-
-          # Skip very small images (likely not post content)
-          if width < 100 or height < 100:
-            logger.debug(f"Skipping small image {idx}: {width}x{height}")
-            continue
-
-          # Create Image object
-          # storage_key is the Instagram CDN URL - same as current implementation
-          image = Image(
-            post_id=post_id,
-            storage_key=img_url,
-            width=int(width),
-            height=int(height),
-            is_primary=(idx == 0),
-          )
+      img_attributes = await page.evaluate(
+        IMAGE_ATTRIBUTES_SCRIPT,
+        POST_IMAGE_SELECTOR,
+      )
 
-          images.append(image)
-          logger.info(f"Extracted image {idx}: {width}x{height} from {img_url[:100]}")
-
-        except Exception as e:
-          logger.warning(f"Failed to extract image {idx}: {e}")
-          continue
+      logger.info(f"Found {len(img_attributes)} image elements")
 
     except Exception as e:
       logger.error(f"Error extracting images: {e}")
+      return images
+
+    for idx, attributes in enumerate(img_attributes):
+      img_url = attributes.get("src")
+      width = attributes.get("width") or 0
+      height = attributes.get("height") or 0
+
+      if not img_url:
+        logger.warning(f"Image {idx} has no src attribute")
+        continue
+
+      # Skip profile pictures and other small images
+      # Instagram post images have specific characteristics
+      if "profile" in img_url.lower() or "avatar" in img_url.lower():
+        logger.debug(f"Skipping profile/avatar image: {img_url}")
+        continue
+
+      # Skip very small images (likely not post content)
+      if width < 100 or height < 100:
+        logger.debug(f"Skipping small image {idx}: {width}x{height}")
+        continue
+
+      # storage_key is the Instagram CDN URL - same as current implementation
+      images.append(
+        Image(
+          post_id=post_id,
+          storage_key=img_url,
+          width=int(width),
+          height=int(height),
+          is_primary=not images,
+        )
+      )
+      logger.info(f"Extracted image {idx}: {width}x{height} from {img_url[:100]}")
 
     return images
 
@@ -302,7 +895,15 @@ async def scrape_instagram_post_with_playwright(url: str, shortcode: str) -> dic
   result = await scraper.scrape_instagram_post(url, shortcode)
 
   if not result.success:
-    raise ValueError(f"Failed to scrape post: {result.error}")
+    error = f"Failed to scrape post: {result.error}"
+
+    if result.throttled:
+      raise InstagramThrottledError(error)
+
+    if result.unavailable:
+      raise ScraperUnavailableError(error)
+
+    raise ValueError(error)
 
   return {
     "owner_username": result.owner_username or "unknown",
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.utils.token_bucket import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Proxy:
+  """An outbound proxy with its health score and usage."""
+
+  url: str
+  bucket: TokenBucket
+  in_use: int = 0
+  success_score: float = 1.0
+  latency_score: float = 0.0
+  cooldown_until: float = 0.0
+  requests: int = 0
+
+  @property
+  def score(self) -> float:
+    """Higher is better: recent success rate discounted by latency."""
+
+    return self.success_score / (1 + self.latency_score)
+
+  def requests_proxies(self) -> Dict[str, str]:
+    """Proxy mapping for a `requests` session (used by instaloader)."""
+
+    return {"http": self.url, "https": self.url}
+
+  def playwright_config(self) -> Dict[str, str]:
+    """Proxy settings for a Playwright browser context."""
+
+    parsed = urlparse(self.url)
+    config = {"server": f"{parsed.scheme}://{parsed.hostname}:{parsed.port}"}
+
+    if parsed.username:
+      config["username"] = parsed.username
+      config["password"] = parsed.password or ""
+
+    return config
+
+  @property
+  def label(self) -> str:
+    """The proxy address without credentials, safe to log."""
+
+    parsed = urlparse(self.url)
+    return f"{parsed.hostname}:{parsed.port}"
+
+
+class ProxyPool:
+  """
+  Thread-safe pool of outbound proxies shared by the scraper backends.
+
+  - Each proxy serves at most `max_concurrency` leases at once and has a
+    token bucket of its own.
+  - Outcomes feed exponentially weighted success and latency scores; new
+    leases go to the best scoring proxy with spare capacity.
+  - A throttled proxy (429, login wall) is put on cooldown.
+  - Leases are sticky per session key, so a logged-in session or browser
+    context keeps its IP while that proxy stays healthy.
+  """
+
+  def __init__(
+    self,
+    urls: List[str],
+    max_concurrency: int,
+    rate_per_minute: float,
+    burst: int,
+    cooldown_seconds: float,
+    ewma_alpha: float,
+  ):
+    self.max_concurrency = max_concurrency
+    self.cooldown_seconds = cooldown_seconds
+    self.ewma_alpha = ewma_alpha
+
+    self._proxies = [
+      Proxy(url=url, bucket=TokenBucket(rate=rate_per_minute / 60, capacity=burst))
+      for url in dict.fromkeys(urls)
+    ]
+    self._sticky: Dict[str, Proxy] = {}
+    self._lock = threading.Lock()
+
+  def __bool__(self) -> bool:
+    return bool(self._proxies)
+
+  def _available(self, proxy: Proxy, now: float) -> bool:
+    return proxy.cooldown_until <= now and proxy.in_use < self.max_concurrency
+
+  def acquire(self, session_key: Optional[str] = None) -> Optional[Proxy]:
+    """
+    Lease a proxy.
+
+    Returns:
+      The session's sticky proxy if it is usable, otherwise the best
+      scoring available proxy; None if every proxy is busy or cooling down.
+    """
+
+    with self._lock:
+      now = time.monotonic()
+
+      proxy = self._sticky.get(session_key) if session_key else None
+      if not proxy or not self._available(proxy, now):
+        candidates = [p for p in self._proxies if self._available(p, now)]
+        if not candidates:
+          return None
+
+        proxy = max(candidates, key=lambda p: (p.score, -p.in_use))
+
+      proxy.in_use += 1
+      proxy.requests += 1
+
+      if session_key:
+        self._sticky[session_key] = proxy
+
+      return proxy
+
+  def release(self, proxy: Proxy) -> None:
+    """Return a lease."""
+
+    with self._lock:
+      proxy.in_use = max(proxy.in_use - 1, 0)
+
+  def record(
+    self,
+    proxy: Proxy,
+    success: bool,
+    latency: float,
+    throttled: bool = False,
+  ) -> None:
+    """Feed the outcome of a request through a proxy into its score."""
+
+    alpha = self.ewma_alpha
+
+    with self._lock:
+      proxy.success_score = (1 - alpha) * proxy.success_score + alpha * success
+      proxy.latency_score = (1 - alpha) * proxy.latency_score + alpha * latency
+
+      if throttled:
+        proxy.cooldown_until = time.monotonic() + self.cooldown_seconds
+        logger.warning(
+          f"Proxy {proxy.label} throttled, cooling down for {self.cooldown_seconds}s"
+        )
+
+        # Sessions move to another proxy on their next lease
+        for key in [k for k, p in self._sticky.items() if p is proxy]:
+          del self._sticky[key]
+
+  def stats(self) -> List[Dict[str, float | int | str]]:
+    """Returns the score and usage of every proxy."""
+
+    now = time.monotonic()
+
+    with self._lock:
+      return [
+        {
+          "proxy": proxy.label,
+          "score": round(proxy.score, 4),
+          "in_use": proxy.in_use,
+          "requests": proxy.requests,
+          "cooldown_for": max(proxy.cooldown_until - now, 0),
+        }
+        for proxy in self._proxies
+      ]
+
+
+def _load_proxy_urls() -> List[str]:
+  urls = list(settings.scraper.SCRAPER_PROXIES)
+
+  if settings.scraper.SCRAPER_PROXY_FILE:
+    with open(settings.scraper.SCRAPER_PROXY_FILE) as f:
+      urls.extend(
+        line.strip() for line in f if line.strip() and not line.startswith("#")
+      )
+
+  return urls
+
+
+_proxy_pool: Optional[ProxyPool] = None
+
+
+def get_proxy_pool() -> ProxyPool:
+  """Get or create the process-wide proxy pool. Empty when unconfigured."""
+
+  global _proxy_pool
+  if _proxy_pool is None:
+    config = settings.scraper
+    _proxy_pool = ProxyPool(
+      urls=_load_proxy_urls(),
+      max_concurrency=config.SCRAPER_PROXY_MAX_CONCURRENCY,
+      rate_per_minute=config.SCRAPER_PROXY_RATE_PER_MINUTE,
+      burst=config.SCRAPER_PROXY_BURST,
+      cooldown_seconds=config.SCRAPER_PROXY_COOLDOWN_SECONDS,
+      ewma_alpha=config.SCRAPER_PROXY_EWMA_ALPHA,
+    )
+
+  return _proxy_pool
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.models import Image
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "scrape:post:{shortcode}"
+LOCK_KEY = "scrape:lock:{shortcode}"
+
+# Deletes the lock only if it is still held by the caller
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+  return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+ScrapeFn = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+def serialize_post_data(post_data: Dict[str, Any]) -> str:
+  """Normalize scraper output into a user-independent JSON payload."""
+
+  taken_at = post_data.get("taken_at")
+
+  return json.dumps(
+    {
+      "id": post_data["id"],
+      "owner_username": post_data["owner_username"],
+      "description": post_data["description"],
+      "taken_at": taken_at.isoformat() if taken_at else None,
+      "images": [
+        {
+          "storage_key": image.storage_key,
+          "width": image.width,
+          "height": image.height,
+          "is_primary": image.is_primary,
+        }
+        for image in post_data["images"]
+      ],
+    }
+  )
+
+
+def deserialize_post_data(raw: str) -> Dict[str, Any]:
+  """
+  Rebuild scraper output from a cached payload.
+
+  Fresh Image objects are created on every call, so each caller gets rows
+  of its own to insert.
+  """
+
+  payload = json.loads(raw)
+  taken_at = payload.get("taken_at")
+
+  return {
+    "id": payload["id"],
+    "owner_username": payload["owner_username"],
+    "description": payload["description"],
+    "taken_at": datetime.fromisoformat(taken_at) if taken_at else None,
+    "images": [Image(post_id=payload["id"], **image) for image in payload["images"]],
+  }
+
+
+class ScrapeCache:
+  """
+  Shortcode-level scrape cache shared by all users and workers.
+
+  Scrapes are single-flighted twice over: concurrent callers in the same
+  process share one in-flight future, and callers in different processes
+  coordinate through a Redis lock, waiting for the holder to fill the cache.
+  """
+
+  def __init__(
+    self,
+    redis: Redis,
+    ttl_seconds: int,
+    lock_ttl_seconds: int,
+    poll_interval: float = 0.5,
+  ):
+    self.redis = redis
+    self.ttl_seconds = ttl_seconds
+    self.lock_ttl_seconds = lock_ttl_seconds
+    self.poll_interval = poll_interval
+    self._inflight: Dict[str, asyncio.Future] = {}
+
+  async def get(self, shortcode: str) -> Optional[Dict[str, Any]]:
+    """Return the cached post data for a shortcode, if any."""
+
+    try:
+      raw = await self.redis.get(CACHE_KEY.format(shortcode=shortcode))
+
+    except RedisError as e:
+      logger.warning(f"Scrape cache read failed for {shortcode}: {e}")
+      return None
+
+    return deserialize_post_data(raw) if raw else None
+
+  async def put(self, shortcode: str, post_data: Dict[str, Any]) -> None:
+    """Replace the cached post data for a shortcode, e.g. after a refresh."""
+
+    try:
+      await self.redis.set(
+        CACHE_KEY.format(shortcode=shortcode),
+        serialize_post_data(post_data),
+        ex=self.ttl_seconds,
+      )
+
+    except RedisError as e:
+      logger.warning(f"Scrape cache write failed for {shortcode}: {e}")
+
+  async def get_or_scrape(self, shortcode: str, scrape: ScrapeFn) -> Dict[str, Any]:
+    """
+    Return post data for a shortcode, scraping it at most once.
+
+    Args:
+      shortcode: The post shortcode
+      scrape: Coroutine factory that scrapes the post
+
+    Returns:
+      Post data in the scraper output format
+    """
+
+    inflight = self._inflight.get(shortcode)
+    if inflight:
+      logger.info(f"Joining in-flight scrape for {shortcode}")
+      return deserialize_post_data(await asyncio.shield(inflight))
+
+    future = asyncio.get_running_loop().create_future()
+    self._inflight[shortcode] = future
+
+    try:
+      raw = await self._load_or_scrape(shortcode, scrape)
+      future.set_result(raw)
+
+    except BaseException as e:
+      future.set_exception(e)
+      # Mark the exception as retrieved when nobody joined the flight
+      future.exception()
+      raise
+
+    finally:
+      self._inflight.pop(shortcode, None)
+
+    return deserialize_post_data(raw)
+
+  async def _load_or_scrape(self, shortcode: str, scrape: ScrapeFn) -> str:
+    """Read the cache, or take the Redis lock and scrape."""
+
+    cache_key = CACHE_KEY.format(shortcode=shortcode)
+    lock_key = LOCK_KEY.format(shortcode=shortcode)
+    token = uuid.uuid4().hex
+
+    while True:
+      try:
+        raw = await self.redis.get(cache_key)
+        if raw:
+          logger.info(f"Scrape cache hit for {shortcode}")
+          return raw
+
+        acquired = await self.redis.set(
+          lock_key, token, nx=True, ex=self.lock_ttl_seconds
+        )
+
+      except RedisError as e:
+        # The cache is an optimization; never fail a task because of it
+        logger.warning(f"Scrape cache unavailable for {shortcode}: {e}")
+        return serialize_post_data(await scrape())
+
+      if acquired:
+        break
+
+      # Another worker is scraping this post; wait for its result
+      await asyncio.sleep(self.poll_interval)
+
+    try:
+      raw = serialize_post_data(await scrape())
+
+      try:
+        await self.redis.set(cache_key, raw, ex=self.ttl_seconds)
+
+      except RedisError as e:
+        logger.warning(f"Scrape cache write failed for {shortcode}: {e}")
+
+      return raw
+
+    finally:
+      try:
+        await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)  # type: ignore[misc]
+
+      except RedisError as e:
+        logger.warning(f"Failed to release scrape lock for {shortcode}: {e}")
@@ -0,0 +1,197 @@
+import json
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.utils.instagram import InstagramThrottledError, ScraperUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Redis hash of backend name -> JSON health snapshot, written by workers
+ROUTER_STATS_KEY = "scrape:router:backends"
+ROUTER_STATS_TTL_SECONDS = 60 * 60
+
+ScrapeBackend = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+# Errors that say nothing about the post, only about the backend; anything
+# else (a video or missing post) would fail the same way on every backend
+FAILOVER_EXCEPTIONS = (
+  InstagramThrottledError,
+  ScraperUnavailableError,
+  TimeoutError,
+  OSError,
+)
+
+
+class BackendHealth:
+  """Rolling window of recent outcomes for one scraper backend."""
+
+  def __init__(self, window: int):
+    self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=window)
+
+  def record(self, success: bool, latency: float) -> None:
+    self._outcomes.append((success, latency))
+
+  @property
+  def samples(self) -> int:
+    return len(self._outcomes)
+
+  @property
+  def success_rate(self) -> float:
+    """Laplace-smoothed success rate, 0.5 for a backend with no history."""
+
+    successes = sum(1 for success, _ in self._outcomes if success)
+    return (successes + 1) / (len(self._outcomes) + 2)
+
+  @property
+  def avg_latency(self) -> float:
+    """Mean latency of successful scrapes, in seconds."""
+
+    latencies = [latency for success, latency in self._outcomes if success]
+    return sum(latencies) / len(latencies) if latencies else 0.0
+
+
+class ScrapeRouter:
+  """
+  Routes scrapes between backends by rolling success rate and latency.
+
+  Each scrape goes to a backend picked at random in proportion to its
+  weight, and falls over to the remaining backends in weight order if the
+  backend is throttled or unavailable. Every backend keeps at least `min_weight` of the traffic so a
+  recovered backend is noticed.
+  """
+
+  def __init__(
+    self,
+    backends: Dict[str, ScrapeBackend],
+    window: int,
+    min_weight: float,
+    latency_scale_seconds: float,
+  ):
+    self.backends = backends
+    self.min_weight = min_weight
+    self.latency_scale_seconds = latency_scale_seconds
+    self.health = {name: BackendHealth(window) for name in backends}
+
+  def _score(self, health: BackendHealth) -> float:
+    """
+    Odds of success, discounted by latency.
+
+    Odds rather than the success rate itself, so that a backend failing
+    every scrape loses its traffic instead of keeping a share propped up by
+    the smoothing: 20 successes in a row score 21, 3 failures in a row 0.25.
+    """
+
+    latency_factor = self.latency_scale_seconds / (
+      self.latency_scale_seconds + health.avg_latency
+    )
+    success_rate = health.success_rate
+    return success_rate / (1 - success_rate) * latency_factor
+
+  def weights(self) -> Dict[str, float]:
+    """Returns the share of traffic each backend currently receives."""
+
+    scores = {name: self._score(health) for name, health in self.health.items()}
+    weights: Dict[str, float] = {}
+
+    # Backends below the floor get exactly the floor; the others split the
+    # rest in proportion to their scores, which may push more of them under
+    while True:
+      rest = {name: score for name, score in scores.items() if name not in weights}
+      share = 1 - self.min_weight * len(weights)
+      total = sum(rest.values())
+
+      floored = {
+        name for name, score in rest.items() if score / total * share < self.min_weight
+      }
+      if not floored or floored == rest.keys():
+        break
+
+      weights.update(dict.fromkeys(floored, self.min_weight))
+
+    weights.update({name: score / total * share for name, score in rest.items()})
+
+    return {name: weights[name] for name in self.health}
+
+  def _order(self) -> List[str]:
+    """Picks the first backend by weight; the rest follow in weight order."""
+
+    weights = self.weights()
+    first = random.choices(list(weights), weights=list(weights.values()))[0]
+    rest = sorted(
+      (name for name in weights if name != first),
+      key=weights.__getitem__,
+      reverse=True,
+    )
+
+    return [first, *rest]
+
+  async def scrape(self, url: str, shortcode: str) -> Dict[str, Any]:
+    """
+    Scrapes a post, failing over to the other backends when throttled.
+
+    Errors about the post itself are raised straight away and leave the
+    health of the backend alone.
+
+    Raises:
+      Exception: The error of the last backend if every backend failed.
+    """
+
+    last_error: Exception | None = None
+
+    for name in self._order():
+      start = time.monotonic()
+
+      try:
+        post_data = await self.backends[name](url, shortcode)
+
+      except FAILOVER_EXCEPTIONS as e:
+        self.health[name].record(False, time.monotonic() - start)
+        logger.warning(f"Scraper backend {name} failed for {shortcode}: {e}")
+        last_error = e
+        continue
+
+      self.health[name].record(True, time.monotonic() - start)
+      logger.info(f"Scraped {shortcode} with backend {name}")
+      return post_data
+
+    if last_error is None:
+      raise ValueError("No scraper backends configured")
+
+    raise last_error
+
+  def snapshot(self) -> Dict[str, Dict[str, Any]]:
+    """Returns the weights and health of every backend."""
+
+    weights = self.weights()
+
+    return {
+      name: {
+        "name": name,
+        "weight": round(weights[name], 4),
+        "success_rate": round(health.success_rate, 4),
+        "avg_latency_ms": round(health.avg_latency * 1000, 1),
+        "samples": health.samples,
+      }
+      for name, health in self.health.items()
+    }
+
+  async def publish(self, redis: Redis) -> None:
+    """Publishes the current weights to Redis for the API to expose."""
+
+    try:
+      async with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(
+          ROUTER_STATS_KEY,
+          mapping={name: json.dumps(stats) for name, stats in self.snapshot().items()},
+        )
+        pipe.expire(ROUTER_STATS_KEY, ROUTER_STATS_TTL_SECONDS)
+        await pipe.execute()
+
+    except RedisError as e:
+      logger.warning(f"Failed to publish scraper weights: {e}")
@@ -0,0 +1,96 @@
+import logging
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.service.instaloader_executor import get_instaloader_executor
+from app.service.scrape_cache import ScrapeCache
+from app.service.scrape_router import ScrapeRouter
+
+logger = logging.getLogger(__name__)
+
+_scrape_cache: Optional[ScrapeCache] = None
+_scrape_router: Optional[ScrapeRouter] = None
+
+
+def get_scrape_cache(redis_client: Redis) -> ScrapeCache:
+  """Returns the process-wide scrape cache bound to the Redis client."""
+
+  global _scrape_cache
+  if _scrape_cache is None or _scrape_cache.redis is not redis_client:
+    _scrape_cache = ScrapeCache(
+      redis=redis_client,
+      ttl_seconds=settings.scraper.SCRAPE_CACHE_TTL_SECONDS,
+      lock_ttl_seconds=settings.scraper.SCRAPE_LOCK_TTL_SECONDS,
+      poll_interval=settings.scraper.SCRAPE_LOCK_POLL_SECONDS,
+    )
+
+  return _scrape_cache
+
+
+async def _scrape_with_instaloader(url: str, post_id: str) -> Dict[str, Any]:
+  """Scrapes a post with instaloader on its dedicated, rate-limited executor."""
+
+  return await get_instaloader_executor().download(post_id)
+
+
+async def _scrape_with_playwright(url: str, post_id: str) -> Dict[str, Any]:
+  """
+  Scrapes a post with Playwright.
+
+  Goes through the standalone scraper service when SCRAPER_SERVICE_URL is
+  set; otherwise Chromium runs in this process. The import is deferred so
+  processes using the service do not need Playwright installed.
+  """
+
+  if settings.scraper.SCRAPER_SERVICE_URL:
+    from app.service.scraper_client import get_scraper_client
+
+    return await get_scraper_client().scrape(url, post_id)
+
+  from app.service.playwright_scraper import scrape_instagram_post_with_playwright
+
+  return await scrape_instagram_post_with_playwright(url=url, shortcode=post_id)
+
+
+def get_scrape_router() -> ScrapeRouter:
+  """Returns the process-wide router between scraper backends."""
+
+  global _scrape_router
+  if _scrape_router is None:
+    _scrape_router = ScrapeRouter(
+      backends={
+        "INSTALOADER": _scrape_with_instaloader,
+        "PLAYWRIGHT": _scrape_with_playwright,
+      },
+      window=settings.scraper.SCRAPE_ROUTER_WINDOW,
+      min_weight=settings.scraper.SCRAPE_ROUTER_MIN_WEIGHT,
+      latency_scale_seconds=settings.scraper.SCRAPE_ROUTER_LATENCY_SCALE_SECONDS,
+    )
+
+  return _scrape_router
+
+
+async def scrape_post(redis_client: Redis, url: str, post_id: str) -> Dict[str, Any]:
+  """Scrapes a post with the configured backend."""
+
+  # Choose scraper backend based on configuration
+  scraper_backend = settings.ai.INSTAGRAM_SCRAPER
+  logger.info(f"Using Instagram scraper backend: {scraper_backend}")
+
+  if scraper_backend == "AUTO":
+    # Route by backend health, failing over to the other backend
+    router = get_scrape_router()
+    try:
+      return await router.scrape(url, post_id)
+
+    finally:
+      await router.publish(redis_client)
+
+  if scraper_backend == "PLAYWRIGHT":
+    # Use Playwright scraper (browser automation)
+    return await _scrape_with_playwright(url, post_id)
+
+  # Use instaloader (default)
+  return await _scrape_with_instaloader(url, post_id)
@@ -0,0 +1,93 @@
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.service.scrape_cache import deserialize_post_data
+from app.utils.instagram import InstagramThrottledError, ScraperUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperServiceClient:
+  """Client for the standalone Playwright scraper service."""
+
+  def __init__(
+    self,
+    base_url: str,
+    timeout: float,
+    max_connections: int,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+  ):
+    # One pooled client per process keeps connections to the service warm
+    self._client = httpx.AsyncClient(
+      base_url=base_url,
+      timeout=timeout,
+      transport=transport,
+      limits=httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+      ),
+    )
+
+  async def scrape(self, url: str, shortcode: str) -> Dict[str, Any]:
+    """
+    Scrape a post through the service.
+
+    Returns:
+      Post data in the scraper output format
+
+    Raises:
+      InstagramThrottledError: If Instagram throttled the service's browser.
+      ScraperUnavailableError: If the service or its browser is unavailable.
+      ValueError: If the post could not be scraped.
+    """
+
+    try:
+      response = await self._client.post(
+        "/scrape",
+        json={"url": url, "shortcode": shortcode},
+      )
+
+    except httpx.HTTPError as e:
+      raise ScraperUnavailableError(f"Scraper service unavailable: {e}") from e
+
+    if response.status_code == 422:
+      detail = response.json().get("detail") or {}
+      error = f"Failed to scrape post: {detail.get('error')}"
+
+      if detail.get("throttled"):
+        raise InstagramThrottledError(error)
+
+      if detail.get("unavailable"):
+        raise ScraperUnavailableError(error)
+
+      raise ValueError(error)
+
+    if response.is_error:
+      raise ScraperUnavailableError(
+        f"Scraper service error: HTTP {response.status_code}"
+      )
+
+    return deserialize_post_data(response.text)
+
+  async def close(self) -> None:
+    await self._client.aclose()
+
+
+_client_instance: Optional[ScraperServiceClient] = None
+
+
+def get_scraper_client() -> ScraperServiceClient:
+  """Get or create the process-wide scraper service client."""
+
+  global _client_instance
+  if _client_instance is None:
+    _client_instance = ScraperServiceClient(
+      base_url=settings.scraper.SCRAPER_SERVICE_URL or "",
+      timeout=settings.scraper.SCRAPER_SERVICE_TIMEOUT_SECONDS,
+      max_connections=settings.scraper.SCRAPER_SERVICE_MAX_CONNECTIONS,
+    )
+
+  return _client_instance
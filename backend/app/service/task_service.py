@@ -1,15 +1,26 @@
-from typing import Optional, Sequence
-from uuid import UUID
+from datetime import date, timedelta
+from typing import Dict, Optional, Sequence
+from uuid import UUID, uuid4
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.db_routing import read_only_method
+from app.data import outbox as outbox_repo
+from app.data import post as post_repo
 from app.data import task as task_repo
+from app.data import task_stats as task_stats_repo
 from app.schemas import (
   TaskCreate,
   TaskPublic,
+  TasksPage,
+  TaskStatsDay,
+  TaskStatsPublic,
   TaskStatus,
+  TaskType,
   TaskUpdate,
 )
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.utc_now import utc_now
 
 
 class TaskService:
@@ -28,6 +39,91 @@ class TaskService:
 
     return TaskPublic.model_validate(task, from_attributes=True)
 
+  async def enqueue_task(
+    self,
+    task_create: TaskCreate,
+    stream: str,
+    message: Dict[str, str],
+  ) -> TaskPublic:
+    """
+    Create a task and its Redis Stream message in one transaction.
+
+    The message is written to the outbox and published by the outbox relay,
+    so a crash after the commit cannot leave a task that is never queued.
+    """
+
+    tasks = await task_repo.create_tasks(
+      session=self.session,
+      task_creates=[task_create],
+    )
+    await outbox_repo.add_outbox_messages(
+      session=self.session,
+      stream=stream,
+      payloads=[message],
+    )
+    await self.session.commit()
+
+    return TaskPublic.model_validate(tasks[0], from_attributes=True)
+
+  async def create_download_tasks(
+    self,
+    urls: Dict[str, str],
+    user_id: UUID,
+    stream: str,
+  ) -> Dict[str, TaskPublic]:
+    """
+    Create posts, download tasks and their stream messages in one
+    transaction, with a single commit.
+
+    Args:
+      urls: Maps each post shortcode to the URL to download.
+
+    Shortcodes whose post already exists are skipped and missing from the
+    result, which maps each created post ID to its task.
+    """
+
+    created_post_ids = await post_repo.insert_posts(
+      session=self.session,
+      post_ids=list(urls),
+      user_id=user_id,
+    )
+
+    tasks = await task_repo.create_tasks(
+      session=self.session,
+      task_creates=[
+        TaskCreate(
+          id=uuid4(),
+          type=TaskType.instagram_download,
+          post_id=post_id,
+          user_id=user_id,
+        )
+        for post_id in urls
+        if post_id in created_post_ids
+      ],
+    )
+
+    await outbox_repo.add_outbox_messages(
+      session=self.session,
+      stream=stream,
+      payloads=[
+        {
+          "task_id": str(task.id),
+          "url": urls[task.post_id],
+          "user_id": str(user_id),
+        }
+        for task in tasks
+        if task.post_id
+      ],
+    )
+
+    await self.session.commit()
+
+    return {
+      task.post_id: TaskPublic.model_validate(task, from_attributes=True)
+      for task in tasks
+      if task.post_id
+    }
+
   async def get_task_by_id(
     self,
     task_id: str,
@@ -44,6 +140,8 @@ class TaskService:
     if task:
       return TaskPublic.model_validate(task, from_attributes=True)
 
+    return None
+
   async def update_task(
     self,
     task_id: str,
@@ -62,6 +160,8 @@ class TaskService:
     if updated_task:
       return TaskPublic.model_validate(updated_task, from_attributes=True)
 
+    return None
+
   async def set_status(
     self,
     task_id: str,
@@ -80,19 +180,103 @@ class TaskService:
     if updated_task:
       return TaskPublic.model_validate(updated_task, from_attributes=True)
 
+    return None
+
+  @read_only_method
   async def get_all_tasks(
     self,
-    skip: int,
     limit: int,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
-  ) -> Sequence[TaskPublic]:
-    """Get all tasks."""
+    include_total: bool = False,
+  ) -> TasksPage:
+    """
+    Get a page of tasks, newest first.
 
+    Raises:
+      InvalidCursorError: If the cursor is malformed.
+    """
+
+    # One extra row tells whether another page follows
     tasks = await task_repo.get_all_tasks(
       session=self.session,
-      skip=skip,
-      limit=limit,
+      limit=limit + 1,
+      cursor=decode_cursor(cursor) if cursor else None,
       user_id=user_id,
     )
 
-    return [TaskPublic.model_validate(task, from_attributes=True) for task in tasks]
+    next_cursor = None
+    if len(tasks) > limit:
+      tasks = tasks[:limit]
+      next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+
+    total_estimate = None
+    if include_total:
+      total_estimate = await task_repo.estimate_tasks(
+        session=self.session,
+        user_id=user_id,
+      )
+
+    return TasksPage(
+      items=[TaskPublic.model_validate(task, from_attributes=True) for task in tasks],
+      next_cursor=next_cursor,
+      total_estimate=total_estimate,
+    )
+
+  @read_only_method
+  async def get_task_stats(
+    self,
+    days: int,
+    user_id: Optional[UUID] = None,
+    end_day: Optional[date] = None,
+  ) -> TaskStatsPublic:
+    """
+    Get task outcomes over the last `days` days, ending today (UTC).
+
+    Read from the per-user daily stats the workers maintain, so the cost
+    does not grow with the number of tasks.
+    """
+
+    end_day = end_day or utc_now().date()
+    start_day = end_day - timedelta(days=days - 1)
+
+    rows = await task_stats_repo.get_task_stats(
+      session=self.session,
+      start_day=start_day,
+      end_day=end_day,
+      user_id=user_id,
+    )
+
+    items = [
+      TaskStatsDay(
+        day=row.day,
+        type=row.type,
+        done=row.done_count,
+        failed=row.failed_count,
+        skipped=row.skipped_count,
+        avg_duration_ms=(
+          row.duration_ms_total / row.duration_count if row.duration_count else None
+        ),
+        prompt_tokens=row.prompt_token_count,
+        candidates_tokens=row.candidates_token_count,
+        total_tokens=row.total_token_count,
+      )
+      for row in rows
+    ]
+
+    done = sum(item.done for item in items)
+    failed = sum(item.failed for item in items)
+    duration_ms_total = sum(row.duration_ms_total for row in rows)
+    duration_count = sum(row.duration_count for row in rows)
+
+    return TaskStatsPublic(
+      start_day=start_day,
+      end_day=end_day,
+      done=done,
+      failed=failed,
+      skipped=sum(item.skipped for item in items),
+      success_rate=done / (done + failed) if done + failed else None,
+      avg_duration_ms=duration_ms_total / duration_count if duration_count else None,
+      total_tokens=sum(item.total_tokens for item in items),
+      days=items,
+    )
@@ -0,0 +1,82 @@
+"""Tests for detecting and refreshing expiring CDN URLs."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.instagram import cdn_filename, parse_cdn_expiry
+from app.workers import cdn_refresh_worker
+from app.workers.cdn_refresh_worker import find_stale_posts, match_fresh_urls
+
+CDN_URL = (
+  "https://scontent.cdninstagram.com/v/t51.2885-15/123_456_n.jpg"
+  "?stp=dst-jpg&_nc_ht=scontent.cdninstagram.com&oh=00_abc&oe={oe}"
+)
+
+
+def test_parse_cdn_expiry():
+  """Test that the hex `oe` parameter is read as a unix timestamp."""
+  url = CDN_URL.format(oe=format(1700000000, "X"))
+
+  assert parse_cdn_expiry(url) == datetime.fromtimestamp(1700000000, tz=timezone.utc)
+
+
+def test_parse_cdn_expiry_without_signature():
+  """Test URLs without an expiry, e.g. data URLs or unsigned links."""
+  assert parse_cdn_expiry("https://example.com/image.jpg") is None
+  assert parse_cdn_expiry(CDN_URL.format(oe="not-hex")) is None
+
+
+def test_match_fresh_urls_by_filename():
+  """Test that re-signed URLs replace the stored ones with the same file."""
+  stored_id, removed_id = uuid.uuid4(), uuid.uuid4()
+  stale = CDN_URL.format(oe="6553F100")
+  fresh = CDN_URL.format(oe="6600AA00")
+
+  updates = match_fresh_urls(
+    [(stored_id, stale), (removed_id, "https://scontent.cdninstagram.com/v/gone.jpg")],
+    [fresh],
+  )
+
+  assert cdn_filename(stale) == "123_456_n.jpg"
+  assert updates == {stored_id: fresh}
+
+
+@pytest.mark.asyncio
+async def test_find_stale_posts_loads_only_stale_posts(monkeypatch):
+  """Test that images are loaded for the posts with expiring URLs only."""
+  stale = CDN_URL.format(oe=format(1700000000, "X"))
+  fresh = CDN_URL.format(oe=format(1900000000, "X"))
+  rows = [
+    (uuid.UUID(int=1), "stale", stale),
+    (uuid.UUID(int=2), "fresh", fresh),
+    (uuid.UUID(int=3), "stale", fresh),
+  ]
+  requested = []
+
+  async def get_remote_images_page(session, after_id, limit):
+    return [row for row in rows if after_id is None or row[0] > after_id][:limit]
+
+  async def get_remote_images_by_post_ids(session, post_ids):
+    requested.extend(post_ids)
+    return [row for row in rows if row[1] in post_ids]
+
+  monkeypatch.setattr(cdn_refresh_worker, "SCAN_PAGE_SIZE", 2)
+  monkeypatch.setattr(
+    cdn_refresh_worker, "get_remote_images_page", get_remote_images_page
+  )
+  monkeypatch.setattr(
+    cdn_refresh_worker,
+    "get_remote_images_by_post_ids",
+    get_remote_images_by_post_ids,
+  )
+
+  stale_posts = await find_stale_posts(
+    None, datetime.fromtimestamp(1800000000, tz=timezone.utc)
+  )
+
+  assert requested == ["stale"]
+  assert stale_posts == {
+    "stale": [(uuid.UUID(int=1), stale), (uuid.UUID(int=3), fresh)]
+  }
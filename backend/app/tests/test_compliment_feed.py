@@ -0,0 +1,64 @@
+"""Tests for the one-query compliment feed projection."""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.data.compliment import _feed_query, feed_item_from_row
+
+
+def _row(**overrides) -> dict:
+  row = {
+    "id": uuid.uuid4(),
+    "lang_id": "en",
+    "text": "Lovely light in this one.",
+    "tone_breakdown": {"warm": 0.8},
+    "created_at": datetime(2026, 10, 1, tzinfo=timezone.utc),
+    "image_id": uuid.uuid4(),
+    "width": 1080,
+    "height": 1350,
+    "post_id": "BQvCZO6hXzv",
+    "description": "Sunset",
+    "taken_at": None,
+    "author_username": "someone",
+    "model_used": "gemini-2.5-flash",
+    "total_token_count": 900,
+    "analysis_duration_ms": 1200,
+  }
+  row.update(overrides)
+  return row
+
+
+def test_feed_query_is_a_single_projection():
+  """Test that the feed selects columns of every table in one statement."""
+  sql = str(_feed_query().compile(dialect=postgresql.dialect()))
+
+  assert sql.count("SELECT") == 1
+  assert "JOIN images" in sql
+  assert "JOIN posts" in sql
+  assert "JOIN generation_metadata" in sql
+  # Posts imported without an author still appear in the feed
+  assert "LEFT OUTER JOIN authors" in sql
+  # Plain columns, not whole entities
+  assert "images.storage_key" not in sql
+
+
+def test_feed_item_nests_related_columns():
+  """Test that a projected row becomes a nested card model."""
+  row = _row()
+  item = feed_item_from_row(row)
+
+  assert item.id == row["id"]
+  assert item.image.id == row["image_id"]
+  assert (item.image.width, item.image.height) == (1080, 1350)
+  assert item.post.author_username == "someone"
+  assert item.generation.model_used == "gemini-2.5-flash"
+  assert f"/images/{row['image_id']}/signed" in item.image.url
+
+
+def test_feed_item_without_author():
+  """Test that the outer-joined author may be missing."""
+  item = feed_item_from_row(_row(author_username=None))
+
+  assert item.post.author_username is None
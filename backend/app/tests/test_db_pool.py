@@ -0,0 +1,112 @@
+"""Tests for connection pool settings and metrics."""
+
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.config.db_settings import DatabaseSettings
+from app.core.db_pool import InstrumentedAsyncQueuePool, PoolMetrics
+
+
+def _settings(**overrides) -> DatabaseSettings:
+  return DatabaseSettings(
+    POSTGRES_SERVER="localhost",
+    POSTGRES_USER="postgres",
+    POSTGRES_PASSWORD="secret",
+    POSTGRES_DB="app",
+    **overrides,
+  )
+
+
+def test_pool_size_follows_role():
+  """Test that workers get their own, smaller pool budget."""
+  api = _settings(DB_ROLE="api").engine_options()
+  worker = _settings(DB_ROLE="worker", DB_POOL_SIZE_WORKER=3).engine_options()
+
+  assert api["pool_size"] == 10
+  assert worker["pool_size"] == 3
+  assert api["pool_pre_ping"] is True
+
+
+def test_statement_timeout_is_sent_as_startup_option():
+  """Test that server-side timeouts are set for every connection."""
+  options = _settings(DB_STATEMENT_TIMEOUT_MS=5000).engine_options()
+
+  assert "-c statement_timeout=5000" in options["connect_args"]["options"]
+
+
+def test_idle_in_transaction_timeout_follows_role():
+  """Test that workers, idle between statements while scraping, are not cut off."""
+  api = _settings(DB_ROLE="api").engine_options()
+  worker = _settings(DB_ROLE="worker").engine_options()
+
+  assert (
+    "-c idle_in_transaction_session_timeout=60000" in api["connect_args"]["options"]
+  )
+  assert "idle_in_transaction" not in worker["connect_args"]["options"]
+
+
+def test_pgbouncer_mode_disables_prepared_statements():
+  """Test the PgBouncer-compatible connection arguments."""
+  options = _settings(DB_PGBOUNCER=True).engine_options()
+
+  assert options["connect_args"] == {"prepare_threshold": None}
+
+
+def test_pool_metrics_track_waits():
+  """Test checkout wait accounting."""
+  metrics = PoolMetrics(slow_wait_seconds=0.1)
+  metrics.observe_wait(0.01, timed_out=False)
+  metrics.observe_wait(0.5, timed_out=True)
+
+  snapshot = metrics.snapshot()
+  assert snapshot["checkouts_total"] == 2
+  assert snapshot["checkout_timeouts_total"] == 1
+  assert snapshot["slow_checkouts_total"] == 1
+  assert snapshot["wait_seconds_max"] == 0.5
+
+
+class _FakeConnection:
+  def rollback(self):
+    pass
+
+  def close(self):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_connect_time_is_not_counted_as_waiting():
+  """Test that opening a connection is reported apart from the queue wait."""
+
+  def slow_connect():
+    time.sleep(0.2)
+    return _FakeConnection()
+
+  pool = InstrumentedAsyncQueuePool(slow_connect, pool_size=1, max_overflow=0)
+
+  def check_out_twice():
+    for _ in range(2):
+      pool.connect().close()
+
+  await greenlet_spawn(check_out_twice)
+
+  stats = pool.stats()
+  assert stats["checkouts_total"] == 2
+  assert stats["wait_seconds_max"] < 0.1
+  assert stats["connects_total"] == 1
+  assert stats["connect_seconds_max"] >= 0.2
+
+
+def test_engine_passes_metrics_to_pool():
+  """Test that metrics reach the pool through create_engine."""
+  metrics = PoolMetrics(slow_wait_seconds=1)
+  engine = create_async_engine(
+    "postgresql+psycopg://postgres@localhost/app",
+    poolclass=InstrumentedAsyncQueuePool,
+    metrics=metrics,
+  )
+
+  assert engine.sync_engine.pool.metrics is metrics  # type: ignore[attr-defined]
+  assert engine.sync_engine.pool.recreate().metrics is metrics  # type: ignore[attr-defined]
@@ -0,0 +1,83 @@
+"""Tests for the perceptual image hash used for duplicate detection."""
+
+import io
+import random
+
+from PIL import Image as PILImage
+
+from app.utils.image_hash import (
+  HASH_BANDS,
+  MAX_INDEXED_DISTANCE,
+  dhash,
+  hamming_distance,
+  hash_band,
+  is_informative,
+)
+
+
+def _blocks_image(size: tuple[int, int], fmt: str = "PNG", mirror=False) -> bytes:
+  """Create an image of distinct grey blocks and return its encoded bytes."""
+
+  values = random.Random(42).sample(range(0, 256, 3), 72)
+  blocks = PILImage.new("L", (9, 8))
+  blocks.putdata(values)
+
+  if mirror:
+    blocks = blocks.transpose(PILImage.Transpose.FLIP_LEFT_RIGHT)
+
+  buffer = io.BytesIO()
+  blocks.resize(size, PILImage.Resampling.NEAREST).convert("RGB").save(
+    buffer, format=fmt
+  )
+  return buffer.getvalue()
+
+
+class TestDhash:
+  """Test suite for the dhash function."""
+
+  def test_same_content_same_hash(self):
+    """Test that re-encoded and resized copies hash (almost) identically."""
+    original = dhash(_blocks_image((640, 480)))
+    resized = dhash(_blocks_image((320, 240), fmt="JPEG"))
+
+    assert hamming_distance(original, resized) <= MAX_INDEXED_DISTANCE
+
+  def test_different_content_different_hash(self):
+    """Test that visually different images are far apart."""
+    a = dhash(_blocks_image((640, 480)))
+    b = dhash(_blocks_image((640, 480), mirror=True))
+
+    assert hamming_distance(a, b) > MAX_INDEXED_DISTANCE
+
+  def test_hash_fits_bigint(self):
+    """Test that hashes fit in a signed 64-bit column."""
+    value = dhash(_blocks_image((640, 480), mirror=True))
+
+    assert -(2**63) <= value < 2**63
+
+  def test_flat_image_is_not_informative(self):
+    """Test that solid colour images are excluded from matching."""
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (100, 100), "white").save(buffer, format="PNG")
+
+    assert not is_informative(dhash(buffer.getvalue()))
+
+
+class TestHashBands:
+  """Test suite for the bit-sliced band helpers."""
+
+  def test_close_hashes_share_a_band(self):
+    """Test the pigeonhole guarantee behind the band indexes."""
+    value = 0x0123_4567_89AB_CDEF
+    # Flip one bit in each of MAX_INDEXED_DISTANCE different bands
+    other = value ^ 0x0001_0001_0001_0000
+
+    assert hamming_distance(value, other) == MAX_INDEXED_DISTANCE
+    assert any(
+      hash_band(value, band) == hash_band(other, band) for band in range(HASH_BANDS)
+    )
+
+  def test_negative_hashes(self):
+    """Test that signed hashes compare like their unsigned form."""
+    assert hamming_distance(-1, 0) == 64
+    assert hash_band(-1, HASH_BANDS - 1) == 0xFFFF
@@ -0,0 +1,122 @@
+"""
+Tests that reference storage keys survive deletion of the image they point at.
+
+Needs a disposable Postgres database, see test_query_plans.
+"""
+
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, create_engine, delete, insert, select, text
+from sqlalchemy.pool import NullPool
+from sqlmodel import col
+
+from app.data.image import make_image_ref
+from app.models import Author, Image, Post
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+CONTENT = "data:image/jpeg;base64,AAAA"
+
+
+@pytest.fixture
+def connection() -> Iterator[Connection]:
+  """A connection to a scratch database migrated to head."""
+
+  if not DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set")
+
+  engine = create_engine(DATABASE_URL, poolclass=NullPool)
+
+  with engine.connect() as connection:
+    connection.execute(text("DROP SCHEMA public CASCADE"))
+    connection.execute(text("CREATE SCHEMA public"))
+    connection.commit()
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "app/alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+    connection.commit()
+
+    yield connection
+
+  engine.dispose()
+
+
+def _add_post(
+  connection: Connection,
+  post_id: str,
+  images: Dict[uuid.UUID, str],
+) -> None:
+  """Inserts a post with the given image IDs and storage keys."""
+
+  author_id = uuid.uuid4()
+  now = datetime.now(timezone.utc)
+
+  connection.execute(
+    insert(Author), [{"id": author_id, "username": post_id, "created_at": now}]
+  )
+  connection.execute(
+    insert(Post), [{"id": post_id, "author_id": author_id, "created_at": now}]
+  )
+  connection.execute(
+    insert(Image),
+    [
+      {
+        "id": image_id,
+        "post_id": post_id,
+        "storage_key": storage_key,
+        "width": 1080,
+        "height": 1350,
+        "is_primary": position == 0,
+        "created_at": now,
+      }
+      for position, (image_id, storage_key) in enumerate(images.items())
+    ],
+  )
+
+
+def _storage_keys(connection: Connection) -> Dict[uuid.UUID, str]:
+  return dict(
+    connection.execute(select(col(Image.id), col(Image.storage_key))).tuples().all()
+  )
+
+
+def test_deleting_canonical_image_repoints_references(connection):
+  """Test that the oldest reference inherits the content and the rest follow."""
+  canonical, first, second = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+  _add_post(connection, "canonical", {canonical: CONTENT})
+  _add_post(connection, "first", {first: make_image_ref(canonical, first)})
+  _add_post(connection, "second", {second: make_image_ref(canonical, second)})
+
+  connection.execute(delete(Post).where(Post.id == "canonical"))
+
+  assert _storage_keys(connection) == {
+    first: CONTENT,
+    second: make_image_ref(first, second),
+  }
+
+
+def test_deleting_canonical_together_with_its_references(connection):
+  """Test that a post holding both the content and its references deletes."""
+  canonical, copy = uuid.uuid4(), uuid.uuid4()
+
+  _add_post(
+    connection,
+    "canonical",
+    {canonical: CONTENT, copy: make_image_ref(canonical, copy)},
+  )
+
+  connection.execute(delete(Post).where(Post.id == "canonical"))
+
+  assert _storage_keys(connection) == {}
@@ -0,0 +1,150 @@
+"""Tests for the rate-limited instaloader executor."""
+
+import instaloader
+import pytest
+import requests
+
+from app.service.instaloader_executor import InstaloaderExecutor
+from app.service.proxy_pool import ProxyPool
+from app.utils.instagram import InstagramThrottledError
+
+THROTTLE_PENALTY = 60
+LOGIN_PENALTY = 600
+
+
+@pytest.fixture
+def executor():
+  """An executor with a single anonymous loader that never sleeps."""
+
+  executor = InstaloaderExecutor(
+    max_workers=1,
+    session_usernames=[],
+    session_dir=None,
+    rate_per_minute=600,
+    burst=10,
+    session_rate_per_minute=600,
+    session_burst=10,
+    throttle_penalty_seconds=THROTTLE_PENALTY,
+    login_penalty_seconds=LOGIN_PENALTY,
+    acquire_timeout_seconds=1,
+  )
+  (slot,) = executor._all_slots
+  slot.loader.context.sleep = False
+
+  yield executor
+
+  executor.shutdown()
+
+
+def _too_many_requests(url: str) -> requests.Response:
+  response = requests.Response()
+  response.status_code = 429
+  response.reason = "Too Many Requests"
+  response.url = url
+  response.headers["Content-Type"] = "text/html"
+  response._content = b""
+  return response
+
+
+def _penalty(executor: InstaloaderExecutor) -> float:
+  (stats,) = executor.stats()
+  return stats["penalized_for"]
+
+
+def _raise_from_loader(monkeypatch, error: Exception) -> None:
+  def from_shortcode(context, shortcode):
+    raise error
+
+  monkeypatch.setattr(instaloader.Post, "from_shortcode", from_shortcode)
+
+
+def _wrapped_429() -> Exception:
+  """A 429 as instaloader reports it once a query runs out of attempts."""
+
+  try:
+    try:
+      raise instaloader.exceptions.TooManyRequestsException("429 Too Many Requests")
+
+    except instaloader.exceptions.TooManyRequestsException as e:
+      raise instaloader.exceptions.ConnectionException("JSON Query failed") from e
+
+  except instaloader.exceptions.ConnectionException as e:
+    return e
+
+
+class TestInstaloaderExecutor:
+  """Test suite for InstaloaderExecutor."""
+
+  def test_http_429_penalizes_session(self, executor, monkeypatch):
+    """Test that a 429 from Instagram reaches the penalty box."""
+    requested = []
+
+    def request(session, method, url, **kwargs):
+      requested.append(url)
+      return _too_many_requests(url)
+
+    monkeypatch.setattr(requests.Session, "request", request)
+
+    with pytest.raises(InstagramThrottledError, match="429"):
+      executor._run("ABC123")
+
+    # The rate controller raises instead of retrying the query
+    assert len(requested) == 1
+    assert _penalty(executor) > THROTTLE_PENALTY - 5
+
+  @pytest.mark.parametrize(
+    "error,penalty",
+    [
+      (instaloader.exceptions.TooManyRequestsException("429"), THROTTLE_PENALTY),
+      (_wrapped_429(), THROTTLE_PENALTY),
+      (instaloader.exceptions.LoginRequiredException("login"), LOGIN_PENALTY),
+      (instaloader.exceptions.AbortDownloadException("logged out"), LOGIN_PENALTY),
+    ],
+  )
+  def test_throttling_errors_penalize_session(
+    self, executor, monkeypatch, error, penalty
+  ):
+    """Test that throttles and login walls put the session in the penalty box."""
+    _raise_from_loader(monkeypatch, error)
+
+    with pytest.raises(InstagramThrottledError, match="Could not fetch post"):
+      executor._run("ABC123")
+
+    assert penalty - 5 < _penalty(executor) <= penalty
+
+  def test_missing_post_does_not_penalize_session(self, executor, monkeypatch):
+    """Test that errors about the post itself leave the session usable."""
+    _raise_from_loader(
+      monkeypatch,
+      instaloader.exceptions.QueryReturnedNotFoundException("404 Not Found"),
+    )
+
+    with pytest.raises(ValueError, match="Could not fetch post") as exc_info:
+      executor._run("ABC123")
+
+    assert not isinstance(exc_info.value, InstagramThrottledError)
+    assert _penalty(executor) == 0
+
+  def test_queries_go_through_the_session_proxy(self, executor, monkeypatch):
+    """Test that the proxy also applies to the session copies of queries."""
+    proxy_url = "http://proxy.example.com:8080"
+    executor.proxy_pool = ProxyPool(
+      urls=[proxy_url],
+      max_concurrency=1,
+      rate_per_minute=600,
+      burst=10,
+      cooldown_seconds=60,
+      ewma_alpha=0.2,
+    )
+    proxies = []
+
+    def request(session, method, url, **kwargs):
+      proxies.append(session.proxies)
+      return _too_many_requests(url)
+
+    monkeypatch.setattr(requests.Session, "request", request)
+
+    with pytest.raises(InstagramThrottledError):
+      executor._run("ABC123")
+
+    assert proxies == [{"http": proxy_url, "https": proxy_url}]
@@ -0,0 +1,96 @@
+"""Tests for the concurrent carousel media fetch."""
+
+import asyncio
+import io
+import random
+
+import httpx
+import pytest
+from PIL import Image as PILImage
+
+from app.models import Image
+from app.service.media_fetcher import fetch_post_media
+
+
+def _png() -> bytes:
+  pixels = PILImage.new("L", (9, 8))
+  pixels.putdata(random.Random(7).sample(range(256), 72))
+
+  buffer = io.BytesIO()
+  pixels.resize((90, 80)).save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+def _images(count: int) -> list[Image]:
+  return [
+    Image(
+      post_id="ABC123",
+      storage_key=f"https://cdn.example.com/{i}.jpg",
+      width=1080,
+      height=1080,
+      is_primary=(i == 0),
+    )
+    for i in range(count)
+  ]
+
+
+class TestFetchPostMedia:
+  """Test suite for fetch_post_media."""
+
+  @pytest.mark.asyncio
+  async def test_yields_in_completion_order(self):
+    """Test that fast images are not held back by slow ones."""
+    content = _png()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+      # The first image is the slowest
+      if request.url.path == "/0.jpg":
+        await asyncio.sleep(0.05)
+      return httpx.Response(200, content=content)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+      results = [
+        fetched async for fetched in fetch_post_media(_images(3), 3, client=client)
+      ]
+
+    assert results[-1].image.storage_key.endswith("/0.jpg")
+    assert all(fetched.dhash is not None for fetched in results)
+
+  @pytest.mark.asyncio
+  async def test_caps_concurrency(self):
+    """Test that no more than `concurrency` downloads run at once."""
+    active = peak = 0
+    content = _png()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+      nonlocal active, peak
+      active += 1
+      peak = max(peak, active)
+      await asyncio.sleep(0.01)
+      active -= 1
+      return httpx.Response(200, content=content)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+      async for _ in fetch_post_media(_images(10), 2, client=client):
+        pass
+
+    assert peak == 2
+
+  @pytest.mark.asyncio
+  async def test_failures_are_reported_not_raised(self):
+    """Test that an expired CDN URL does not fail the other images."""
+    content = _png()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+      if request.url.path == "/1.jpg":
+        return httpx.Response(403)
+      return httpx.Response(200, content=content)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+      results = [
+        fetched async for fetched in fetch_post_media(_images(2), 2, client=client)
+      ]
+
+    errors = [fetched for fetched in results if fetched.error]
+    assert len(errors) == 1
+    assert errors[0].image.storage_key.endswith("/1.jpg")
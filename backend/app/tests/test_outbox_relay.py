@@ -0,0 +1,111 @@
+"""Tests for publishing outbox messages to Redis Streams."""
+
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.models import OutboxMessage
+from app.workers import outbox_relay_worker
+
+
+class FakePipeline:
+  def __init__(self, redis: "FakeRedis"):
+    self.redis = redis
+    self.commands: List[Tuple[str, Dict[str, Any]]] = []
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc_info):
+    return False
+
+  def xadd(self, stream, fields):
+    self.commands.append((stream, fields))
+
+  async def execute(self):
+    if self.redis.fail:
+      raise RedisConnectionError("connection lost")
+
+    self.redis.streams.extend(self.commands)
+    self.redis.round_trips += 1
+
+
+class FakeRedis:
+  def __init__(self, fail: bool = False):
+    self.fail = fail
+    self.streams: List[Tuple[str, Dict[str, Any]]] = []
+    self.round_trips = 0
+
+  def pipeline(self, transaction=True):
+    return FakePipeline(self)
+
+
+class FakeSession:
+  def __init__(self):
+    self.committed = False
+    self.rolled_back = False
+
+  async def commit(self):
+    self.committed = True
+
+  async def rollback(self):
+    self.rolled_back = True
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+  """Replaces the outbox queries with an in-memory table."""
+
+  rows = [
+    OutboxMessage(id=i, stream="tasks:stream", payload={"task_id": str(i)})
+    for i in range(1, 6)
+  ]
+
+  async def claim(session, limit):
+    return rows[:limit]
+
+  async def delete(session, message_ids):
+    rows[:] = [row for row in rows if row.id not in message_ids]
+
+  monkeypatch.setattr(outbox_relay_worker, "claim_outbox_messages", claim)
+  monkeypatch.setattr(outbox_relay_worker, "delete_outbox_messages", delete)
+  return rows
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_one_round_trip_and_deletes(outbox):
+  """Test that a batch is pipelined, then deleted in the same transaction."""
+  redis = FakeRedis()
+  session = FakeSession()
+
+  published = await outbox_relay_worker.relay_batch(session, redis, batch_size=3)
+
+  assert published == 3
+  assert redis.round_trips == 1
+  assert [fields["task_id"] for _, fields in redis.streams] == ["1", "2", "3"]
+  assert [row.id for row in outbox] == [4, 5]
+  assert session.committed
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_messages_when_redis_fails(outbox):
+  """Test that unpublished messages stay in the outbox for the next pass."""
+  session = FakeSession()
+
+  with pytest.raises(RedisConnectionError):
+    await outbox_relay_worker.relay_batch(session, FakeRedis(fail=True), batch_size=3)
+
+  assert len(outbox) == 5
+  assert session.rolled_back
+  assert not session.committed
+
+
+@pytest.mark.asyncio
+async def test_relay_with_empty_outbox(outbox):
+  """Test that an empty outbox costs no Redis round trip."""
+  outbox.clear()
+  redis = FakeRedis()
+
+  assert await outbox_relay_worker.relay_batch(FakeSession(), redis, 10) == 0
+  assert redis.round_trips == 0
@@ -0,0 +1,33 @@
+"""Tests for keyset pagination cursors."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+  """Test that a cursor decodes back to its position."""
+  created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+  id = uuid.uuid4()
+
+  cursor = decode_cursor(encode_cursor(created_at, id))
+
+  assert cursor.created_at == created_at
+  assert cursor.id == id
+
+
+def test_cursor_is_url_safe():
+  """Test that cursors can be passed as query parameters unescaped."""
+  cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+
+  assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJ4Il0"])
+def test_invalid_cursor_is_rejected(cursor):
+  """Test that malformed cursors raise InvalidCursorError."""
+  with pytest.raises(InvalidCursorError):
+    decode_cursor(cursor)
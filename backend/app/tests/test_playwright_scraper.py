@@ -8,16 +8,22 @@ For CI/CD environments, also run:
     playwright install-deps chromium
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.models import Image
 from app.service.playwright_scraper import (
+  BrowserContextPool,
   PlaywrightScraperService,
+  PlaywrightTimeoutError,
   ScrapedPostResult,
+  _should_block,
+  parse_post_payload,
   scrape_instagram_post_with_playwright,
 )
+from app.service.proxy_pool import ProxyPool
 
 
 class TestPlaywrightScraperService:
@@ -128,6 +134,292 @@ class TestPlaywrightScraperService:
     pass
 
 
+class FakePage:
+  def __init__(self, heap_bytes: int = 0):
+    self.heap_bytes = heap_bytes
+    self.closed = False
+
+  async def evaluate(self, script):
+    return self.heap_bytes
+
+  async def close(self):
+    self.closed = True
+
+
+class FakeContext:
+  def __init__(self, crashed: bool = False):
+    self.crashed = crashed
+    self.pages: list[FakePage] = []
+    self.closed = False
+
+  async def new_page(self):
+    if self.crashed:
+      raise Exception("Target page, context or browser has been closed")
+
+    page = FakePage()
+    self.pages.append(page)
+    return page
+
+  async def route(self, pattern, handler):
+    pass
+
+  async def close(self):
+    self.closed = True
+
+
+class FakeBrowser:
+  def __init__(self) -> None:
+    self.contexts: list[FakeContext] = []
+    self.connected = True
+    self.crash_next_context = False
+
+  async def new_context(self, **options):
+    context = FakeContext(crashed=self.crash_next_context)
+    self.crash_next_context = False
+    self.contexts.append(context)
+    return context
+
+  def is_connected(self):
+    return self.connected
+
+  async def close(self):
+    self.connected = False
+
+
+class FakeResponse:
+  def __init__(self, url: str, payload=None, status: int = 200):
+    self.url = url
+    self.payload = payload
+    self.status = status
+    self.ok = status < 400
+
+  async def json(self):
+    return self.payload
+
+
+class FakePostPage:
+  """Page whose post images never render, optionally answering GraphQL."""
+
+  def __init__(self, payload=None):
+    self.url = "https://www.instagram.com/p/ABC123/"
+    self.payload = payload
+    self.handlers = []
+
+  def on(self, event, handler):
+    self.handlers.append(handler)
+
+  async def goto(self, url, **kwargs):
+    if self.payload:
+      response = FakeResponse("https://www.instagram.com/graphql/query", self.payload)
+
+      async def respond_later():
+        await asyncio.sleep(0.01)
+        for handler in self.handlers:
+          await handler(response)
+
+      asyncio.create_task(respond_later())
+
+    return FakeResponse(url)
+
+  async def evaluate(self, script, *args):
+    return []
+
+  async def wait_for_selector(self, selector, timeout):
+    await asyncio.sleep(0.1)
+    raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+def _pool(browser: FakeBrowser, **overrides) -> BrowserContextPool:
+  options = {
+    "size": 1,
+    "pages_per_context": 2,
+    "max_navigations": 100,
+    "max_heap_bytes": 512 * 1024 * 1024,
+  }
+  options.update(overrides)
+  return BrowserContextPool(browser=browser, **options)  # type: ignore[arg-type]
+
+
+class TestBrowserContextPool:
+  """Test suite for the pooled browser contexts, driven by a fake browser."""
+
+  @pytest.mark.asyncio
+  async def test_pages_per_context_are_capped(self):
+    """Test that callers beyond the page capacity wait for a free slot."""
+    browser = FakeBrowser()
+    pool = _pool(browser, pages_per_context=2)
+    await pool.warm_up()
+
+    async with pool.page(), pool.page():
+      assert pool.stats()["active_pages"] == 2
+
+      async def third_page():
+        async with pool.page():
+          return pool.stats()["active_pages"]
+
+      waiting = asyncio.create_task(third_page())
+      await asyncio.sleep(0)
+
+      assert not waiting.done()
+      assert pool.stats()["queue_depth"] == 1
+
+    assert await waiting == 1
+    assert len(browser.contexts) == 1
+
+  @pytest.mark.asyncio
+  async def test_context_is_recycled_after_max_navigations(self):
+    """Test that a context is closed and replaced once it served N pages."""
+    browser = FakeBrowser()
+    pool = _pool(browser, max_navigations=2)
+    await pool.warm_up()
+
+    for _ in range(2):
+      async with pool.page():
+        pass
+
+    first = browser.contexts[0]
+    assert first.closed
+    assert all(page.closed for page in first.pages)
+
+    async with pool.page():
+      pass
+
+    assert len(browser.contexts) == 2
+    assert len(browser.contexts[1].pages) == 1
+    assert pool.stats()["contexts"] == 1
+
+  @pytest.mark.asyncio
+  async def test_bloated_context_is_recycled(self):
+    """Test that a page over the heap limit retires its context."""
+    browser = FakeBrowser()
+    pool = _pool(browser, max_heap_bytes=1024)
+    await pool.warm_up()
+
+    async with pool.page() as page:
+      page.heap_bytes = 2048
+
+    assert browser.contexts[0].closed
+
+  @pytest.mark.asyncio
+  async def test_crashed_context_is_replaced(self):
+    """Test that a context failing to open pages is retired, not reused."""
+    browser = FakeBrowser()
+    browser.crash_next_context = True
+    pool = _pool(browser)
+    await pool.warm_up()
+
+    with pytest.raises(Exception, match="has been closed"):
+      async with pool.page():
+        pass
+
+    assert browser.contexts[0].closed
+
+    async with pool.page():
+      pass
+
+    assert len(browser.contexts) == 2
+    assert pool.stats() == {
+      "contexts": 1,
+      "draining_contexts": 0,
+      "active_pages": 0,
+      "capacity": 2,
+      "queue_depth": 0,
+    }
+
+  @pytest.mark.asyncio
+  async def test_pages_spend_proxy_tokens(self):
+    """Test that each page waits for a token of its context's proxy."""
+    proxy_pool = ProxyPool(
+      urls=["http://127.0.0.1:3128"],
+      max_concurrency=1,
+      rate_per_minute=600,
+      burst=1,
+      cooldown_seconds=60,
+      ewma_alpha=0.5,
+    )
+    pool = _pool(FakeBrowser(), proxy_pool=proxy_pool)
+    await pool.warm_up()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    for _ in range(2):
+      async with pool.page():
+        pass
+
+    # The burst of one is spent by the first page; the second waits 0.1s
+    assert loop.time() - start >= 0.09
+
+  @pytest.mark.asyncio
+  @patch("app.service.playwright_scraper.get_proxy_pool", return_value=None)
+  @patch("app.service.playwright_scraper.async_playwright")
+  async def test_browser_is_relaunched_after_crash(self, mock_playwright, _):
+    """Test that a disconnected browser is replaced together with its pool."""
+    crashed, relaunched = FakeBrowser(), FakeBrowser()
+
+    mock_playwright.return_value.start = AsyncMock(
+      return_value=MagicMock(
+        chromium=MagicMock(launch=AsyncMock(side_effect=[crashed, relaunched]))
+      )
+    )
+
+    scraper = PlaywrightScraperService()
+    await scraper._init_browser()
+    pool = scraper._pool
+
+    crashed.connected = False
+    await scraper._init_browser()
+
+    assert scraper.browser is relaunched
+    assert scraper._pool is not pool
+    assert all(context.closed for context in crashed.contexts)
+    assert relaunched.contexts
+
+
+class TestScrapePage:
+  """Test suite for reading a post once the page has been navigated to."""
+
+  @pytest.mark.asyncio
+  async def test_graphql_response_without_rendered_media(self):
+    """Test that a captured GraphQL payload is used when images never render."""
+    payload = {
+      "data": {
+        "xdt_shortcode_media": {
+          "shortcode": "ABC123",
+          "display_url": "https://cdn.example.com/1.jpg",
+          "dimensions": {"width": 1080, "height": 1350},
+          "owner": {"username": "testuser"},
+        }
+      }
+    }
+    page = FakePostPage(payload)
+
+    result = await PlaywrightScraperService()._scrape_page(
+      page,  # type: ignore[arg-type]
+      page.url,
+      "ABC123",
+    )
+
+    assert result.success is True
+    assert [image.storage_key for image in result.images] == [
+      "https://cdn.example.com/1.jpg"
+    ]
+
+  @pytest.mark.asyncio
+  async def test_no_media_and_no_payload(self):
+    """Test that the selector timeout is reported when nothing was captured."""
+    page = FakePostPage()
+
+    result = await PlaywrightScraperService()._scrape_page(
+      page,  # type: ignore[arg-type]
+      page.url,
+      "ABC123",
+    )
+
+    assert result.success is False
+    assert result.error == "No images found on the page"
+
+
 class TestScrapedPostResult:
   """Test suite for ScrapedPostResult class."""
 
@@ -176,6 +468,118 @@ class TestScrapedPostResult:
     assert result.error is None
 
 
+class TestResourceBlocking:
+  """Test suite for request interception rules."""
+
+  @pytest.mark.parametrize(
+    "resource_type,url",
+    [
+      ("font", "https://static.cdninstagram.com/font.woff2"),
+      ("media", "https://scontent.cdninstagram.com/video.mp4"),
+      ("script", "https://connect.facebook.net/en_US/fbevents.js"),
+      ("script", "https://www.googletagmanager.com/gtag/js"),
+      ("xhr", "https://www.instagram.com/api/v1/web/logging/falco"),
+    ],
+  )
+  def test_blocks_heavy_and_tracking_requests(self, resource_type, url):
+    """Test that fonts, media, analytics and third-party scripts are blocked."""
+    assert _should_block(resource_type, url)
+
+  @pytest.mark.parametrize(
+    "resource_type,url",
+    [
+      ("document", "https://www.instagram.com/p/ABC123/"),
+      ("script", "https://static.cdninstagram.com/rsrc.php/app.js"),
+      ("image", "https://scontent.cdninstagram.com/v/t51/photo.jpg"),
+      ("xhr", "https://www.instagram.com/graphql/query"),
+    ],
+  )
+  def test_allows_post_data_requests(self, resource_type, url):
+    """Test that the page, its own scripts, images and GraphQL go through."""
+    assert not _should_block(resource_type, url)
+
+
+class TestParsePostPayload:
+  """Test suite for parsing structured post payloads."""
+
+  def test_graphql_sidecar(self):
+    """Test parsing a GraphQL carousel, skipping video children."""
+    payload = {
+      "data": {
+        "xdt_shortcode_media": {
+          "shortcode": "ABC123",
+          "display_url": "https://cdn.example.com/cover.jpg",
+          "owner": {"username": "testuser"},
+          "taken_at_timestamp": 1700000000,
+          "edge_media_to_caption": {"edges": [{"node": {"text": "Caption"}}]},
+          "edge_sidecar_to_children": {
+            "edges": [
+              {
+                "node": {
+                  "display_url": "https://cdn.example.com/1.jpg",
+                  "dimensions": {"width": 1080, "height": 1350},
+                }
+              },
+              {"node": {"is_video": True, "display_url": "https://cdn.example.com/v"}},
+              {
+                "node": {
+                  "display_url": "https://cdn.example.com/2.jpg",
+                  "dimensions": {"width": 1080, "height": 1080},
+                }
+              },
+            ]
+          },
+        }
+      }
+    }
+
+    result = parse_post_payload(payload, "ABC123")
+
+    assert result.success is True
+    assert [image.storage_key for image in result.images] == [
+      "https://cdn.example.com/1.jpg",
+      "https://cdn.example.com/2.jpg",
+    ]
+    assert [image.is_primary for image in result.images] == [True, False]
+    assert result.owner_username == "testuser"
+    assert result.description == "Caption"
+    assert result.taken_at.timestamp() == 1700000000
+
+  def test_api_v1_single_image(self):
+    """Test parsing an API v1 media item, picking the largest candidate."""
+    payload = {
+      "items": [
+        {
+          "code": "ABC123",
+          "media_type": 1,
+          "taken_at": 1700000000,
+          "user": {"username": "testuser"},
+          "caption": {"text": "Caption"},
+          "image_versions2": {
+            "candidates": [
+              {"url": "https://cdn.example.com/s.jpg", "width": 320, "height": 320},
+              {"url": "https://cdn.example.com/l.jpg", "width": 1440, "height": 1440},
+            ]
+          },
+        }
+      ]
+    }
+
+    result = parse_post_payload(payload, "ABC123")
+
+    assert result.success is True
+    assert len(result.images) == 1
+    assert result.images[0].storage_key == "https://cdn.example.com/l.jpg"
+    assert result.images[0].width == 1440
+    assert result.owner_username == "testuser"
+
+  def test_other_post_is_ignored(self):
+    """Test that payloads for other posts are not mistaken for the target."""
+    payload = {"shortcode": "OTHER", "display_url": "https://cdn.example.com/x.jpg"}
+
+    assert parse_post_payload(payload, "ABC123") is None
+
+
 class TestConvenienceFunction:
   """Test suite for the convenience wrapper function."""
 
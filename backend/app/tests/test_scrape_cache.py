@@ -0,0 +1,106 @@
+"""Tests for the shortcode-level scrape cache."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import Image
+from app.service.scrape_cache import ScrapeCache
+
+
+class InMemoryRedis:
+  """Minimal async stand-in for the Redis commands used by the cache."""
+
+  def __init__(self):
+    self.data = {}
+
+  async def get(self, key):
+    return self.data.get(key)
+
+  async def set(self, key, value, nx=False, ex=None):
+    if nx and key in self.data:
+      return None
+
+    self.data[key] = value
+    return True
+
+  async def eval(self, script, numkeys, key, token):
+    if self.data.get(key) == token:
+      del self.data[key]
+      return 1
+
+    return 0
+
+
+def _post_data(shortcode: str) -> dict:
+  return {
+    "id": shortcode,
+    "owner_username": "testuser",
+    "description": "Caption",
+    "taken_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "images": [
+      Image(
+        post_id=shortcode,
+        storage_key="https://cdn.example.com/1.jpg",
+        width=1080,
+        height=1080,
+        is_primary=True,
+      )
+    ],
+  }
+
+
+class TestScrapeCache:
+  """Test suite for ScrapeCache."""
+
+  @pytest.mark.asyncio
+  async def test_concurrent_requests_scrape_once(self):
+    """Test that concurrent callers share a single scrape."""
+    calls = 0
+
+    async def scrape():
+      nonlocal calls
+      calls += 1
+      await asyncio.sleep(0.01)
+      return _post_data("ABC123")
+
+    cache = ScrapeCache(InMemoryRedis(), ttl_seconds=60, lock_ttl_seconds=10)
+    results = await asyncio.gather(
+      *(cache.get_or_scrape("ABC123", scrape) for _ in range(10))
+    )
+
+    assert calls == 1
+    assert all(result["owner_username"] == "testuser" for result in results)
+    # Every caller gets its own Image rows to insert
+    assert len({id(result["images"][0]) for result in results}) == 10
+
+  @pytest.mark.asyncio
+  async def test_cache_hit_skips_scrape(self):
+    """Test that a cached payload is served without scraping."""
+    redis = InMemoryRedis()
+    first = ScrapeCache(redis, ttl_seconds=60, lock_ttl_seconds=10)
+    await first.get_or_scrape("ABC123", lambda: asyncio.sleep(0, _post_data("ABC123")))
+
+    async def fail():
+      raise AssertionError("should not scrape")
+
+    second = ScrapeCache(redis, ttl_seconds=60, lock_ttl_seconds=10)
+    result = await second.get_or_scrape("ABC123", fail)
+
+    assert result["taken_at"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert result["images"][0].storage_key == "https://cdn.example.com/1.jpg"
+
+  @pytest.mark.asyncio
+  async def test_failed_scrape_releases_lock(self):
+    """Test that a failure is propagated and the lock is released."""
+    redis = InMemoryRedis()
+    cache = ScrapeCache(redis, ttl_seconds=60, lock_ttl_seconds=10)
+
+    async def fail():
+      raise ValueError("blocked")
+
+    with pytest.raises(ValueError):
+      await cache.get_or_scrape("ABC123", fail)
+
+    assert redis.data == {}
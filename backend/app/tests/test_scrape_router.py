@@ -0,0 +1,113 @@
+"""Tests for the scraper backend router."""
+
+import pytest
+
+from app.service.scrape_router import ScrapeRouter
+from app.utils.instagram import InstagramThrottledError, ScraperUnavailableError
+
+
+def _router(backends):
+  return ScrapeRouter(
+    backends=backends,
+    window=20,
+    min_weight=0.05,
+    latency_scale_seconds=10,
+  )
+
+
+async def _ok(url, shortcode):
+  return {"id": shortcode}
+
+
+async def _fail(url, shortcode):
+  raise InstagramThrottledError("blocked")
+
+
+async def _unavailable(url, shortcode):
+  raise ScraperUnavailableError("browser crashed")
+
+
+async def _video(url, shortcode):
+  raise ValueError("video posts are not supported")
+
+
+class TestScrapeRouter:
+  """Test suite for ScrapeRouter."""
+
+  @pytest.mark.asyncio
+  async def test_fails_over_to_other_backend(self):
+    """Test that a failed scrape is retried on the other backend."""
+    router = _router({"A": _fail, "B": _ok})
+
+    for _ in range(10):
+      assert await router.scrape("url", "ABC123") == {"id": "ABC123"}
+
+    assert router.health["B"].samples == 10
+
+  @pytest.mark.asyncio
+  async def test_weights_shift_to_healthy_backend(self):
+    """Test that failing backends lose traffic down to the floor."""
+    router = _router({"A": _fail, "B": _ok})
+
+    for _ in range(20):
+      await router.scrape("url", "ABC123")
+
+    weights = router.weights()
+    assert weights["B"] == pytest.approx(0.95)
+    assert weights["A"] == pytest.approx(0.05)
+
+  def test_floor_is_kept_after_renormalizing(self):
+    """Test that floored backends get the floor, not less."""
+    router = _router({"A": _ok, "B": _ok, "C": _ok})
+
+    for _ in range(20):
+      router.health["A"].record(True, 1)
+      router.health["B"].record(False, 1)
+      router.health["C"].record(False, 1)
+
+    weights = router.weights()
+
+    assert weights["B"] == weights["C"] == pytest.approx(0.05)
+    assert weights["A"] == pytest.approx(0.9)
+
+  @pytest.mark.asyncio
+  async def test_all_backends_failing_raises(self):
+    """Test that the last error surfaces when every backend fails."""
+    router = _router({"A": _fail, "B": _fail})
+
+    with pytest.raises(InstagramThrottledError, match="blocked"):
+      await router.scrape("url", "ABC123")
+
+  @pytest.mark.asyncio
+  async def test_unavailable_backend_fails_over(self):
+    """Test that a backend that could not scrape at all is failed over."""
+    router = _router({"A": _unavailable, "B": _ok})
+
+    for _ in range(10):
+      assert await router.scrape("url", "ABC123") == {"id": "ABC123"}
+
+    assert router.health["B"].samples == 10
+
+  @pytest.mark.asyncio
+  async def test_content_errors_are_raised_without_failover(self):
+    """Test that an unscrapable post is tried once and counts against no one."""
+    calls = []
+
+    async def video(url, shortcode):
+      calls.append(shortcode)
+      return await _video(url, shortcode)
+
+    router = _router({"A": video, "B": video})
+
+    with pytest.raises(ValueError, match="video") as exc_info:
+      await router.scrape("url", "ABC123")
+
+    assert type(exc_info.value) is ValueError
+    assert calls == ["ABC123"]
+    assert router.health["A"].samples == router.health["B"].samples == 0
+
+  def test_new_backends_split_evenly(self):
+    """Test that backends without history share traffic equally."""
+    weights = _router({"A": _ok, "B": _ok}).weights()
+
+    assert weights == {"A": 0.5, "B": 0.5}
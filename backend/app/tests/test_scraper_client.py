@@ -0,0 +1,103 @@
+"""Tests for the scraper service client."""
+
+import json
+
+import httpx
+import pytest
+
+from app.service.scraper_client import ScraperServiceClient
+from app.utils.instagram import InstagramThrottledError, ScraperUnavailableError
+
+PAYLOAD = {
+  "id": "ABC123",
+  "owner_username": "testuser",
+  "description": "Caption",
+  "taken_at": "2024-01-01T00:00:00+00:00",
+  "images": [
+    {
+      "storage_key": "https://cdn.example.com/1.jpg",
+      "width": 1080,
+      "height": 1080,
+      "is_primary": True,
+    }
+  ],
+}
+
+
+def _client(handler) -> ScraperServiceClient:
+  return ScraperServiceClient(
+    base_url="http://scraper",
+    timeout=5,
+    max_connections=2,
+    transport=httpx.MockTransport(handler),
+  )
+
+
+class TestScraperServiceClient:
+  """Test suite for ScraperServiceClient."""
+
+  @pytest.mark.asyncio
+  async def test_scrape_returns_post_data(self):
+    """Test that the service payload is rebuilt into scraper output."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+      assert json.loads(request.content)["shortcode"] == "ABC123"
+      return httpx.Response(200, json=PAYLOAD)
+
+    post_data = await _client(handler).scrape(
+      "https://instagram.com/p/ABC123/", "ABC123"
+    )
+
+    assert post_data["owner_username"] == "testuser"
+    assert post_data["images"][0].post_id == "ABC123"
+    assert post_data["taken_at"].year == 2024
+
+  @pytest.mark.asyncio
+  async def test_scrape_failure_raises_value_error(self):
+    """Test that failed scrapes surface like in-process scraper errors."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+      return httpx.Response(422, json={"detail": {"error": "No images found"}})
+
+    with pytest.raises(ValueError, match="No images found") as exc_info:
+      await _client(handler).scrape("https://instagram.com/p/ABC123/", "ABC123")
+
+    assert not isinstance(
+      exc_info.value, (InstagramThrottledError, ScraperUnavailableError)
+    )
+
+  @pytest.mark.asyncio
+  async def test_throttled_scrape_raises_throttled_error(self):
+    """Test that the service's throttled flag survives the round trip."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+      return httpx.Response(
+        422,
+        json={"detail": {"error": "Login required", "throttled": True}},
+      )
+
+    with pytest.raises(InstagramThrottledError, match="Login required"):
+      await _client(handler).scrape("https://instagram.com/p/ABC123/", "ABC123")
+
+  @pytest.mark.asyncio
+  async def test_browser_failure_raises_unavailable_error(self):
+    """Test that the service's unavailable flag survives the round trip."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+      return httpx.Response(
+        422,
+        json={"detail": {"error": "Browser crashed", "unavailable": True}},
+      )
+
+    with pytest.raises(ScraperUnavailableError, match="Browser crashed"):
+      await _client(handler).scrape("https://instagram.com/p/ABC123/", "ABC123")
+
+  @pytest.mark.asyncio
+  async def test_overloaded_service_raises_unavailable_error(self):
+    """Test that a full scraper queue fails the task instead of crashing."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+      return httpx.Response(503, json={"detail": "Scraper queue is full"})
+
+    with pytest.raises(ScraperUnavailableError, match="503"):
+      await _client(handler).scrape("https://instagram.com/p/ABC123/", "ABC123")
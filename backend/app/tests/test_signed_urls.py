@@ -0,0 +1,154 @@
+"""Tests for signed, expiring image URLs and subscription tokens."""
+
+import time
+import uuid
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import proxy
+from app.core.security import (
+  create_signed_image_url,
+  create_subscription_token,
+  sign_value,
+  verify_image_signature,
+  verify_signed_value,
+  verify_subscription_token,
+)
+
+
+def _parse(url: str) -> tuple[str, int, str]:
+  """Split a signed image URL into image ID, expiry and signature."""
+
+  parsed = urlparse(url)
+  query = parse_qs(parsed.query)
+  image_id = parsed.path.split("/")[-2]
+
+  return image_id, int(query["exp"][0]), query["sig"][0]
+
+
+class FakeImageService:
+  def __init__(self, storage_key: Optional[str]):
+    self.storage_key = storage_key
+    self.lookups = 0
+
+  async def get_storage_key(self, image_id: uuid.UUID) -> Optional[str]:
+    self.lookups += 1
+    return self.storage_key
+
+
+async def _view(image_service: FakeImageService, image_id: uuid.UUID):
+  _, expires, signature = _parse(create_signed_image_url(image_id))
+
+  return await proxy.view_signed_image(
+    None,  # type: ignore[arg-type]
+    image_service=image_service,  # type: ignore[arg-type]
+    image_id=image_id,
+    exp=expires,
+    sig=signature,
+  )
+
+
+def test_signed_image_url_roundtrip():
+  """Test that a minted URL verifies for its own image."""
+  image_id = uuid.uuid4()
+  signed_id, expires, signature = _parse(create_signed_image_url(image_id))
+
+  assert signed_id == str(image_id)
+  assert verify_image_signature(image_id, expires, signature)
+
+
+def test_signature_is_bound_to_image():
+  """Test that a signature cannot be reused for another image."""
+  _, expires, signature = _parse(create_signed_image_url(uuid.uuid4()))
+
+  assert not verify_image_signature(uuid.uuid4(), expires, signature)
+
+
+def test_tampered_expiry_is_rejected():
+  """Test that extending the expiry invalidates the signature."""
+  image_id = uuid.uuid4()
+  _, expires, signature = _parse(create_signed_image_url(image_id))
+
+  assert not verify_image_signature(image_id, expires + 3600, signature)
+
+
+def test_expired_signature_is_rejected():
+  """Test that signatures stop verifying once expired."""
+  expires = int(time.time()) - 1
+
+  assert not verify_signed_value("image:x", expires, sign_value("image:x", expires))
+
+
+def test_urls_are_stable_within_a_bucket():
+  """Test that repeated listings mint the same cacheable URL."""
+  image_id = uuid.uuid4()
+
+  assert create_signed_image_url(image_id) == create_signed_image_url(image_id)
+
+
+def test_subscription_token_roundtrip():
+  """Test that a subscription token verifies for its own task."""
+  resource = f"task:{uuid.uuid4()}"
+
+  assert verify_subscription_token(resource, create_subscription_token(resource))
+
+
+def test_subscription_token_is_bound_to_resource():
+  """Test that a task token cannot be used to watch another task or batch."""
+  task_id = uuid.uuid4()
+  token = create_subscription_token(f"task:{task_id}")
+
+  assert not verify_subscription_token(f"task:{uuid.uuid4()}", token)
+  assert not verify_subscription_token(f"batch:{task_id}", token)
+
+
+def test_malformed_subscription_token_is_rejected():
+  """Test that garbage tokens are rejected instead of raising."""
+  resource = f"task:{uuid.uuid4()}"
+
+  assert not verify_subscription_token(resource, "")
+  assert not verify_subscription_token(resource, "not-a-token")
+  assert not verify_subscription_token(resource, "123.abc")
+
+
+@pytest.mark.asyncio
+async def test_signed_view_caches_data_urls():
+  """Test that inline uploads are served from the cache after the first view."""
+  image_service = FakeImageService("data:image/png;base64,AAAA")
+  image_id = uuid.uuid4()
+
+  first = await _view(image_service, image_id)
+  second = await _view(image_service, image_id)
+
+  assert first.body == second.body == b"\x00\x00\x00"
+  assert second.media_type == "image/png"
+  assert image_service.lookups == 1
+
+
+def test_expiring_cdn_urls_are_not_cached():
+  """Test that only CDN URLs outliving the cache entry are cached."""
+  cdn_url = "https://scontent.cdninstagram.com/v/1_n.jpg?oe={oe}"
+  soon = int(time.time()) + proxy.STORAGE_KEY_CACHE_SECONDS // 2
+  later = int(time.time()) + proxy.STORAGE_KEY_CACHE_SECONDS * 2
+
+  assert proxy._is_cacheable("data:image/png;base64,AAAA")
+  assert proxy._is_cacheable(cdn_url.format(oe=format(later, "X")))
+  assert not proxy._is_cacheable(cdn_url.format(oe=format(soon, "X")))
+
+
+@pytest.mark.asyncio
+async def test_signed_view_caches_missing_images():
+  """Test that views of a deleted image do not query the database again."""
+  image_service = FakeImageService(None)
+  image_id = uuid.uuid4()
+
+  for _ in range(2):
+    with pytest.raises(HTTPException) as exc_info:
+      await _view(image_service, image_id)
+
+    assert exc_info.value.status_code == 404
+
+  assert image_service.lookups == 1
@@ -0,0 +1,144 @@
+"""
+Tests for monthly task partition naming and retention planning.
+
+The maintenance tests need a disposable Postgres database, see
+test_query_plans.
+"""
+
+import os
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.data.task_partitions import (
+  DEFAULT_PARTITION,
+  TaskPartition,
+  add_months,
+  partition_month,
+  partition_name,
+)
+from app.workers.task_partition_worker import maintain_partitions, plan_partitions
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def database_url() -> Iterator[str]:
+  """The URL of a scratch database migrated to head."""
+
+  if not DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set")
+
+  engine = create_engine(DATABASE_URL, poolclass=NullPool)
+
+  with engine.connect() as connection:
+    connection.execute(text("DROP SCHEMA public CASCADE"))
+    connection.execute(text("CREATE SCHEMA public"))
+    connection.commit()
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "app/alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+    connection.commit()
+
+  engine.dispose()
+  yield DATABASE_URL
+
+
+def _partition(year: int, month: int, attached: bool = True) -> TaskPartition:
+  month_date = date(year, month, 1)
+  return TaskPartition(partition_name(month_date), month_date, attached)
+
+
+def test_partition_names_round_trip():
+  """Test that partition names encode their month and nothing else parses."""
+  assert partition_name(date(2026, 3, 1)) == "tasks_p202603"
+  assert partition_month("tasks_p202603") == date(2026, 3, 1)
+  assert partition_month("tasks_unpartitioned") is None
+  assert partition_month("tasks_p202603; DROP TABLE users") is None
+
+
+def test_add_months_crosses_years():
+  """Test month arithmetic across year boundaries."""
+  assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+  assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_plan_creates_missing_months_ahead():
+  """Test that only months without a partition are created."""
+  partitions = [_partition(2026, 10), _partition(2026, 11)]
+
+  missing, expired = plan_partitions(
+    partitions, today=date(2026, 10, 19), months_ahead=3, retention_months=6
+  )
+
+  assert missing == [date(2026, 12, 1), date(2027, 1, 1)]
+  assert expired == []
+
+
+def test_plan_retires_partitions_outside_retention():
+  """Test that the retention window counts the current month."""
+  partitions = [
+    _partition(2026, 3, attached=False),
+    _partition(2026, 4),
+    _partition(2026, 5),
+    _partition(2026, 10),
+  ]
+
+  _, expired = plan_partitions(
+    partitions, today=date(2026, 10, 1), months_ahead=0, retention_months=6
+  )
+
+  assert [partition.name for partition in expired] == [
+    "tasks_p202603",
+    "tasks_p202604",
+  ]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_moves_tasks_out_of_default_partition(
+  database_url, monkeypatch, tmp_path
+):
+  """Test that tasks of a month without a partition get one, and timeouts reset."""
+  monkeypatch.setattr(settings.db, "TASKS_ARCHIVE_DIR", str(tmp_path))
+  future = add_months(TODAY, settings.db.TASKS_PARTITION_MONTHS_AHEAD + 6)
+
+  engine = create_async_engine(database_url, poolclass=NullPool)
+  async with engine.connect() as conn:
+    await conn.execute(
+      text(
+        "INSERT INTO tasks (id, type, created_at) "
+        f"VALUES ('{uuid.uuid4()}', 'instagram_download', '{future}')"
+      )
+    )
+    await conn.commit()
+
+    assert await conn.scalar(text("SELECT tableoid::regclass::text FROM tasks")) == (
+      DEFAULT_PARTITION
+    )
+    await conn.execute(text("SET lock_timeout = '1s'"))
+    await conn.commit()
+
+    await maintain_partitions(conn, TODAY)
+
+    assert await conn.scalar(text("SELECT tableoid::regclass::text FROM tasks")) == (
+      partition_name(future)
+    )
+    assert await conn.scalar(text("SHOW lock_timeout")) == "1s"
+    assert await conn.scalar(text("SHOW statement_timeout")) == "0"
+
+  await engine.dispose()
@@ -0,0 +1,109 @@
+"""Tests for the incrementally maintained per-user task stats."""
+
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.data import task_stats
+from app.models import GenerationMetadata
+from app.schemas import TaskStatus, TaskType
+from app.service.task_service import TaskService
+
+
+class FakeSession:
+  def __init__(self):
+    self.info = {}
+    self.statements = []
+
+  async def execute(self, statement):
+    self.statements.append(statement)
+
+
+def _stats_row(day: date, task_type: TaskType, **counters) -> SimpleNamespace:
+  row = dict.fromkeys(task_stats.COUNTERS, 0)
+  row.update(counters)
+  return SimpleNamespace(day=day, type=task_type, **row)
+
+
+def test_only_finished_statuses_are_terminal():
+  """Test which transitions are counted."""
+  assert task_stats.is_terminal(TaskStatus.done)
+  assert task_stats.is_terminal(TaskStatus.failed)
+  assert task_stats.is_terminal(TaskStatus.skipped)
+  assert not task_stats.is_terminal(TaskStatus.in_progress)
+  assert not task_stats.is_terminal(None)
+
+
+@pytest.mark.asyncio
+async def test_record_task_outcome_is_one_atomic_upsert():
+  """Test that counters are incremented in SQL, not read and written back."""
+  session = FakeSession()
+
+  await task_stats.record_task_outcome(
+    session,
+    user_id=uuid.uuid4(),
+    day=date(2026, 10, 19),
+    task_type=TaskType.llm_generate,
+    status=TaskStatus.done,
+    duration=timedelta(seconds=1.5),
+    generation=GenerationMetadata(
+      model_used="gemini-2.5-flash",
+      prompt_token_count=500,
+      candidates_token_count=300,
+      total_token_count=800,
+      analysis_duration_ms=1200,
+    ),
+  )
+
+  (statement,) = session.statements
+  compiled = statement.compile(dialect=postgresql.dialect())
+  sql = str(compiled)
+
+  assert "ON CONFLICT (user_id, day, type) DO UPDATE" in sql
+  assert "user_task_stats.done_count + excluded.done_count" in sql
+  assert compiled.params["done_count"] == 1
+  assert compiled.params["failed_count"] == 0
+  assert compiled.params["duration_ms_total"] == 1500
+  assert compiled.params["total_token_count"] == 800
+
+
+@pytest.mark.asyncio
+async def test_service_totals_days(monkeypatch):
+  """Test success rate and averages over the rows of several days."""
+  end_day = date(2026, 10, 19)
+  rows = [
+    _stats_row(
+      end_day - timedelta(days=1),
+      TaskType.instagram_download,
+      done_count=3,
+      failed_count=1,
+      skipped_count=2,
+      duration_ms_total=4000,
+      duration_count=4,
+    ),
+    _stats_row(
+      end_day,
+      TaskType.llm_generate,
+      done_count=1,
+      duration_ms_total=6000,
+      duration_count=1,
+      total_token_count=800,
+    ),
+  ]
+
+  async def get_task_stats(session, start_day, end_day, user_id=None):
+    return rows
+
+  monkeypatch.setattr(task_stats, "get_task_stats", get_task_stats)
+
+  stats = await TaskService(FakeSession()).get_task_stats(days=7, end_day=end_day)
+
+  assert stats.start_day == date(2026, 10, 13)
+  assert (stats.done, stats.failed, stats.skipped) == (4, 1, 2)
+  assert stats.success_rate == 0.8
+  assert stats.avg_duration_ms == 2000
+  assert stats.total_tokens == 800
+  assert [item.avg_duration_ms for item in stats.days] == [1000, 6000]
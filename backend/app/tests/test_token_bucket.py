@@ -0,0 +1,72 @@
+"""Tests for the thread-safe token bucket."""
+
+import threading
+import time
+
+import pytest
+
+from app.utils.token_bucket import TokenBucket, acquire_all
+
+
+class TestTokenBucket:
+  """Test suite for TokenBucket."""
+
+  def test_allows_burst_up_to_capacity(self):
+    """Test that a full bucket serves `capacity` requests immediately."""
+    bucket = TokenBucket(rate=1, capacity=3)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() > 0
+
+  def test_refills_over_time(self):
+    """Test that tokens come back at the configured rate."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.try_acquire()
+
+    assert bucket.acquire(timeout=1)
+
+  def test_acquire_times_out(self):
+    """Test that acquire gives up when the wait exceeds the timeout."""
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.try_acquire()
+
+    start = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    assert time.monotonic() - start < 0.05
+
+  def test_concurrent_acquire_never_overspends(self):
+    """Test that threads cannot take more tokens than the bucket holds."""
+    bucket = TokenBucket(rate=0.001, capacity=5)
+    taken = []
+
+    def worker():
+      taken.append(bucket.try_acquire() == 0)
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    assert sum(taken) == 5
+
+  def test_acquire_all_refunds_when_one_bucket_is_empty(self):
+    """Test that giving up on one bucket does not spend the others."""
+    shared = TokenBucket(rate=0.1, capacity=2)
+    empty = TokenBucket(rate=0.1, capacity=1)
+    empty.try_acquire()
+
+    assert not acquire_all([shared, empty], timeout=0.05)
+    assert [shared.try_acquire() for _ in range(2)] == [0, 0]
+
+  def test_acquire_all_takes_from_every_bucket(self):
+    """Test that every bucket pays for the request."""
+    buckets = [TokenBucket(rate=0.1, capacity=1) for _ in range(3)]
+
+    assert acquire_all(buckets, timeout=0)
+    assert all(bucket.try_acquire() > 0 for bucket in buckets)
+
+  def test_rejects_invalid_configuration(self):
+    """Test that a bucket that could never serve a request is refused."""
+    with pytest.raises(ValueError):
+      TokenBucket(rate=0, capacity=1)
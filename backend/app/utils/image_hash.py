@@ -0,0 +1,75 @@
+import io
+
+from PIL import Image as PILImage
+
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+# The 64-bit hash is split into bands that are indexed separately. By the
+# pigeonhole principle, two hashes within `HASH_BANDS - 1` bits of each other
+# share at least one identical band, so band equality is an exact pre-filter
+# for Hamming-radius lookups up to that distance.
+HASH_BANDS = 4
+BAND_BITS = HASH_BITS // HASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_INDEXED_DISTANCE = HASH_BANDS - 1
+
+_UNSIGNED_MASK = (1 << HASH_BITS) - 1
+
+
+def _to_signed(value: int) -> int:
+  """Converts an unsigned 64-bit value to a Postgres BIGINT-compatible one."""
+
+  return value - (1 << HASH_BITS) if value >= (1 << (HASH_BITS - 1)) else value
+
+
+def dhash(content: bytes | bytearray) -> int:
+  """
+  Computes the difference hash (dHash) of an image.
+
+  The image is reduced to a (HASH_SIZE + 1) x HASH_SIZE grayscale thumbnail
+  and each bit records whether a pixel is brighter than its right neighbour.
+  The result is returned as a signed 64-bit integer so it can be stored in a
+  BIGINT column. This is CPU-bound and is meant to run in a worker thread.
+  """
+
+  with PILImage.open(io.BytesIO(content)) as image:
+    # Lets the JPEG decoder downscale while decoding instead of afterwards
+    image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+    thumbnail = image.convert("L").resize(
+      (HASH_SIZE + 1, HASH_SIZE),
+      PILImage.Resampling.LANCZOS,
+    )
+    pixels = thumbnail.tobytes()
+
+  value = 0
+  for row in range(HASH_SIZE):
+    offset = row * (HASH_SIZE + 1)
+
+    for col in range(HASH_SIZE):
+      value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+  return _to_signed(value)
+
+
+def hamming_distance(a: int, b: int) -> int:
+  """Returns the number of differing bits between two hashes."""
+
+  return ((a ^ b) & _UNSIGNED_MASK).bit_count()
+
+
+def hash_band(value: int, band: int) -> int:
+  """Returns the `band`-th BAND_BITS-wide slice of a hash."""
+
+  return (value >> (band * BAND_BITS)) & BAND_MASK
+
+
+def is_informative(value: int) -> bool:
+  """
+  Checks that a hash carries information.
+
+  Flat images (solid colours, blank frames) hash to all zeros or all ones
+  and would match each other regardless of content.
+  """
+
+  return value not in (0, -1)
@@ -1,4 +1,31 @@
 import re
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+USER_AGENT = (
+  "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+  "AppleWebKit/537.36 (KHTML, like Gecko) "
+  "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class InstagramThrottledError(ValueError):
+  """
+  Raised when Instagram rate limited a scrape or demanded a login.
+
+  The post itself may well be fine; retrying through another session, proxy
+  or scraper backend later can succeed.
+  """
+
+
+class ScraperUnavailableError(ValueError):
+  """
+  Raised when a scraper backend could not attempt a scrape at all.
+
+  The browser, network or scraper service failed, or the backend ran out of
+  sessions, proxies or request budget; another backend may still succeed.
+  """
 
 
 def extract_shortcode_from_url(url: str) -> str:
@@ -9,3 +36,31 @@ def extract_shortcode_from_url(url: str) -> str:
     raise ValueError("Invalid or unsupported Instagram post URL format.")
 
   return match.group(2)
+
+
+def parse_cdn_expiry(url: str) -> Optional[datetime]:
+  """
+  Reads the expiry of a signed Instagram CDN URL.
+
+  CDN URLs carry their expiry as a hex unix timestamp in the `oe` query
+  parameter, after which the CDN answers 403.
+
+  Returns:
+    The expiry as an aware datetime, or None if the URL has no `oe`.
+  """
+
+  values = parse_qs(urlparse(url).query).get("oe")
+  if not values:
+    return None
+
+  try:
+    return datetime.fromtimestamp(int(values[0], 16), tz=timezone.utc)
+
+  except (ValueError, OverflowError, OSError):
+    return None
+
+
+def cdn_filename(url: str) -> str:
+  """Returns the media filename of a CDN URL, stable across re-signing."""
+
+  return urlparse(url).path.rsplit("/", 1)[-1]
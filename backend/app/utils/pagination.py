@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, literal, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class InvalidCursorError(ValueError):
+  """Raised when a pagination cursor cannot be decoded."""
+
+
+class Cursor(NamedTuple):
+  """Position after the last row of a page, ordered by (created_at, id)."""
+
+  created_at: datetime
+  id: UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+  """Encodes a keyset position as an opaque, URL-safe cursor."""
+
+  raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+  return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+  """
+  Decodes a cursor produced by `encode_cursor`.
+
+  Raises:
+    InvalidCursorError: If the cursor is malformed.
+  """
+
+  try:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+    return Cursor(created_at=datetime.fromisoformat(created_at), id=UUID(id))
+
+  except (ValueError, TypeError) as e:
+    raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def after_cursor(
+  created_at_column: Any,
+  id_column: Any,
+  cursor: Optional[Cursor],
+) -> Optional[ColumnElement[bool]]:
+  """
+  Builds the keyset condition for newest-first pages.
+
+  The row-value comparison lets Postgres seek straight into an index on
+  (..., created_at, id) instead of skipping over OFFSET rows.
+  """
+
+  if not cursor:
+    return None
+
+  return tuple_(created_at_column, id_column) < tuple_(
+    literal(cursor.created_at), literal(cursor.id)
+  )
+
+
+async def estimate_count(session: AsyncSession, stmt: Select) -> int:
+  """
+  Estimates the number of rows a query returns from the planner's statistics.
+
+  Uses EXPLAIN rather than COUNT(*), so the cost does not grow with the
+  table. The figure is approximate and meant for display only.
+  """
+
+  compiled = (
+    stmt.limit(None)
+    .order_by(None)
+    .compile(
+      dialect=postgresql.dialect(),
+      compile_kwargs={"literal_binds": True},
+    )
+  )
+  result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+  plan = result.scalar_one()
+
+  if isinstance(plan, str):
+    plan = json.loads(plan)
+
+  return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Optional, Sequence
+
+
+class TokenBucket:
+  """
+  Thread-safe token bucket rate limiter.
+
+  Tokens refill continuously at `rate` per second up to `capacity`, so
+  short bursts are allowed while the long-run rate stays bounded.
+  """
+
+  def __init__(self, rate: float, capacity: float):
+    if rate <= 0 or capacity < 1:
+      raise ValueError("rate must be positive and capacity at least 1")
+
+    self.rate = rate
+    self.capacity = capacity
+    self._tokens = capacity
+    self._updated_at = time.monotonic()
+    self._lock = threading.Lock()
+
+  def _refill(self, now: float) -> None:
+    elapsed = now - self._updated_at
+    self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+    self._updated_at = now
+
+  def try_acquire(self, tokens: float = 1) -> float:
+    """
+    Takes tokens if available.
+
+    Returns:
+      0 if the tokens were taken, otherwise the seconds until they will be.
+    """
+
+    with self._lock:
+      self._refill(time.monotonic())
+
+      if self._tokens >= tokens:
+        self._tokens -= tokens
+        return 0
+
+      return (tokens - self._tokens) / self.rate
+
+  def refund(self, tokens: float = 1) -> None:
+    """Gives back tokens that were taken but not spent."""
+
+    with self._lock:
+      self._tokens = min(self.capacity, self._tokens + tokens)
+
+  def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+    """
+    Blocks until tokens are available. Meant to be called from worker threads.
+
+    Returns:
+      True if the tokens were taken, False if the timeout expired first.
+    """
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+      wait = self.try_acquire(tokens)
+      if not wait:
+        return True
+
+      if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining < wait:
+          return False
+
+      time.sleep(wait)
+
+
+def acquire_all(buckets: Sequence[TokenBucket], timeout: float) -> bool:
+  """
+  Takes a token from every bucket, or from none of them.
+
+  Tokens taken before another bucket turns out to be empty are refunded,
+  so a caller that gives up never drains the budgets it was waiting on.
+
+  Returns:
+    True if the tokens were taken, False if the timeout expired first.
+  """
+
+  deadline = time.monotonic() + timeout
+
+  while True:
+    taken = []
+    wait = 0.0
+
+    for bucket in buckets:
+      wait = bucket.try_acquire()
+      if wait:
+        break
+
+      taken.append(bucket)
+
+    if not wait:
+      return True
+
+    for bucket in taken:
+      bucket.refund()
+
+    if deadline - time.monotonic() < wait:
+      return False
+
+    time.sleep(wait)
@@ -0,0 +1,103 @@
+import base64
+import hashlib
+import io
+from typing import NamedTuple
+
+from fastapi import UploadFile
+from PIL import Image as PILImage
+
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Maps the uploaded content type to the format Pillow must detect
+ALLOWED_IMAGE_FORMATS = {
+  "image/jpeg": "JPEG",
+  "image/jpg": "JPEG",
+  "image/png": "PNG",
+}
+
+
+class UploadTooLargeError(ValueError):
+  """Raised when an upload exceeds the maximum allowed size."""
+
+  def __init__(self, size: int, max_size: int):
+    self.size = size
+    self.max_size = max_size
+    super().__init__(
+      f"File size exceeds maximum allowed size of {max_size / 1024 / 1024:.0f}MB."
+    )
+
+
+class ReadUpload(NamedTuple):
+  """Raw upload content and its SHA-256 digest."""
+
+  content: bytearray
+  sha256: str
+
+
+class ImageProbe(NamedTuple):
+  """Dimensions and format of a verified image."""
+
+  width: int
+  height: int
+  format: str
+
+
+async def read_upload(
+  file: UploadFile,
+  max_size: int = MAX_UPLOAD_SIZE,
+  chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> ReadUpload:
+  """
+  Reads an upload in chunks into a single buffer, hashing it on the fly.
+
+  The declared size is checked before anything is read, and the running
+  size is checked per chunk, so oversized uploads are rejected without
+  ever being buffered in full.
+
+  Raises:
+    UploadTooLargeError: If the upload is larger than `max_size`.
+  """
+
+  if file.size is not None and file.size > max_size:
+    raise UploadTooLargeError(size=file.size, max_size=max_size)
+
+  hasher = hashlib.sha256()
+  buffer = bytearray()
+
+  while chunk := await file.read(chunk_size):
+    if len(buffer) + len(chunk) > max_size:
+      raise UploadTooLargeError(size=len(buffer) + len(chunk), max_size=max_size)
+
+    hasher.update(chunk)
+    buffer.extend(chunk)
+
+  return ReadUpload(content=buffer, sha256=hasher.hexdigest())
+
+
+def probe_image(content: bytes | bytearray, expected_format: str) -> ImageProbe:
+  """
+  Reads image dimensions from the header and verifies the file integrity.
+
+  `PILImage.open` only parses the header, so the size is known without
+  decoding pixels; `verify` then checks the rest of the stream. This is
+  CPU-bound and is meant to run in a worker thread.
+
+  Raises:
+    ValueError: If the content is not a valid image of the expected format.
+  """
+
+  with PILImage.open(io.BytesIO(content)) as image:
+    if image.format != expected_format:
+      raise ValueError(f"Expected {expected_format} image, got {image.format}")
+
+    width, height = image.size
+    image.verify()
+
+  return ImageProbe(width=width, height=height, format=expected_format)
+
+
+def to_data_url(content: bytes | bytearray, mime_type: str) -> str:
+  """Encodes image content as a base64 data URL."""
+
+  return f"data:{mime_type};base64,{base64.b64encode(content).decode('ascii')}"
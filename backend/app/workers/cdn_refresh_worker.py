@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Set, Tuple
+from uuid import UUID
+
+from dotenv import load_dotenv
+from redis.asyncio import Redis, from_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.data.image import (
+  get_remote_images_by_post_ids,
+  get_remote_images_page,
+  update_storage_keys,
+)
+from app.service.scraper import get_scrape_cache, scrape_post
+from app.utils.instagram import cdn_filename, parse_cdn_expiry
+from app.utils.token_bucket import TokenBucket
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(
+  level=logging.INFO,
+  format="%(asctime)s %(levelname)s: %(message)s",
+)
+
+SCAN_PAGE_SIZE = 500
+
+# (image_id, storage_key) pairs of a post's stored images
+StoredImages = List[Tuple[UUID, str]]
+
+
+async def find_stale_posts(
+  session: AsyncSession,
+  expires_before: datetime,
+) -> Dict[str, StoredImages]:
+  """
+  Finds posts with at least one CDN URL expiring before the cutoff.
+
+  The scan keeps only the IDs of stale posts; their images are loaded
+  afterwards, so memory grows with the expiring posts, not the table.
+
+  Returns:
+    All stored images of each such post, keyed by post ID.
+  """
+
+  stale_posts: Set[str] = set()
+  after_id = None
+
+  while True:
+    rows = await get_remote_images_page(
+      session=session,
+      after_id=after_id,
+      limit=SCAN_PAGE_SIZE,
+    )
+    if not rows:
+      break
+
+    for _, post_id, storage_key in rows:
+      expires_at = parse_cdn_expiry(storage_key)
+      if expires_at and expires_at <= expires_before:
+        stale_posts.add(post_id)
+
+    after_id = rows[-1][0]
+
+  images_by_post: Dict[str, StoredImages] = defaultdict(list)
+  post_ids = sorted(stale_posts)
+
+  for i in range(0, len(post_ids), SCAN_PAGE_SIZE):
+    rows = await get_remote_images_by_post_ids(
+      session=session,
+      post_ids=post_ids[i : i + SCAN_PAGE_SIZE],
+    )
+    for image_id, post_id, storage_key in rows:
+      images_by_post[post_id].append((image_id, storage_key))
+
+  return dict(images_by_post)
+
+
+def match_fresh_urls(stored: StoredImages, fresh_urls: List[str]) -> Dict[UUID, str]:
+  """
+  Pairs stored images with re-signed URLs by their CDN filename.
+
+  The filename survives re-signing while the query string does not.
+  Images whose filename is no longer in the post are left untouched.
+  """
+
+  fresh_by_filename = {cdn_filename(url): url for url in fresh_urls}
+  updates = {}
+
+  for image_id, storage_key in stored:
+    fresh_url = fresh_by_filename.get(cdn_filename(storage_key))
+    if fresh_url and fresh_url != storage_key:
+      updates[image_id] = fresh_url
+
+  return updates
+
+
+async def refresh_post(
+  redis_client: Redis,
+  post_id: str,
+  stored: StoredImages,
+) -> Dict[UUID, str]:
+  """Re-scrapes a post and returns the new storage keys of its images."""
+
+  url = f"https://www.instagram.com/p/{post_id}/"
+  post_data = await scrape_post(redis_client, url, post_id)
+
+  # Keep the shared scrape cache from handing out the old URLs
+  await get_scrape_cache(redis_client).put(post_id, post_data)
+
+  return match_fresh_urls(stored, [image.storage_key for image in post_data["images"]])
+
+
+async def refresh_stale_urls(redis_client: Redis, bucket: TokenBucket) -> int:
+  """
+  Refreshes every CDN URL that is expired or about to expire.
+
+  Posts are re-scraped one at a time within the refresh rate budget, and
+  the new URLs are written with one bulk UPDATE per batch.
+
+  Returns:
+    The number of images updated.
+  """
+
+  config = settings.scraper
+  expires_before = datetime.now(timezone.utc) + timedelta(
+    seconds=config.CDN_REFRESH_LEAD_SECONDS
+  )
+
+  async with async_session() as session:
+    stale_posts = await find_stale_posts(session, expires_before)
+
+  logger.info(f"Found {len(stale_posts)} posts with expiring CDN URLs")
+
+  post_ids = list(stale_posts)
+  updated = 0
+
+  for i in range(0, len(post_ids), config.CDN_REFRESH_BATCH_SIZE):
+    batch_updates: Dict[UUID, str] = {}
+
+    for post_id in post_ids[i : i + config.CDN_REFRESH_BATCH_SIZE]:
+      while wait := bucket.try_acquire():
+        await asyncio.sleep(wait)
+
+      try:
+        batch_updates.update(
+          await refresh_post(redis_client, post_id, stale_posts[post_id])
+        )
+
+      except ValueError as e:
+        logger.warning(f"Could not refresh post {post_id}: {e}")
+
+    try:
+      async with async_session() as session:
+        await update_storage_keys(session, batch_updates)
+
+    except SQLAlchemyError:
+      logger.exception("Failed to store refreshed CDN URLs")
+      continue
+
+    updated += len(batch_updates)
+    logger.info(f"Refreshed {len(batch_updates)} image URLs")
+
+  return updated
+
+
+async def start_worker():
+  """Start the worker."""
+
+  redis_url = os.getenv("REDIS_URL")
+  if not redis_url:
+    logger.warning("REDIS_URL is not set!")
+    return
+
+  redis_client = from_url(redis_url, decode_responses=True)
+  bucket = TokenBucket(
+    rate=settings.scraper.CDN_REFRESH_RATE_PER_MINUTE / 60,
+    capacity=1,
+  )
+  logger.info("CDN refresh worker started")
+
+  while True:
+    try:
+      updated = await refresh_stale_urls(redis_client, bucket)
+      logger.info(f"CDN refresh pass complete: {updated} images updated")
+
+    except asyncio.CancelledError:
+      logger.info("Worker cancelled.")
+      break
+
+    except SQLAlchemyError:
+      logger.exception("Error in CDN refresh pass")
+
+    await asyncio.sleep(settings.scraper.CDN_REFRESH_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+  try:
+    asyncio.run(start_worker())
+
+  except KeyboardInterrupt:
+    print("Worker stopped by user.")
@@ -15,7 +15,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.db import async_engine
+from app.core.db import async_session
 from app.data.author import (
   create_author,
   get_author_by_id,
@@ -26,13 +26,14 @@ from app.data.image import (
 )
 from app.data.post import update_post
 from app.data.task import update_task
+from app.models import Image
 from app.schemas import (
   PostUpdate,
   TaskStatus,
   TaskUpdate,
 )
-from app.service.instagram import download_instagram_post
-from app.service.playwright_scraper import scrape_instagram_post_with_playwright
+from app.service.media_fetcher import fetch_post_media
+from app.service.scraper import get_scrape_cache, scrape_post
 from app.utils.instagram import extract_shortcode_from_url
 
 load_dotenv()
@@ -87,6 +88,35 @@ async def _publish_task_update(
     logger.error(f"Failed to publish update to {stream_name}: {e}")
 
 
+async def _fetch_media(redis_client: Redis, task_id: str, images: List[Image]):
+  """
+  Fetches and hashes a post's images concurrently.
+
+  Each image is handled as soon as its download finishes: its hash is set
+  on the (pending) row and progress is published, so a 10-image carousel
+  reports steadily instead of all at once. The hashes are persisted with
+  the task update.
+  """
+
+  total = len(images)
+  done = 0
+
+  async for fetched in fetch_post_media(images):
+    done += 1
+
+    if fetched.dhash is not None:
+      fetched.image.dhash = fetched.dhash
+
+    await _publish_task_update(
+      redis_client,
+      task_id,
+      {
+        "status": TaskStatus.in_progress.value,
+        "detail": f"Fetched image {done}/{total}",
+      },
+    )
+
+
 async def handle_message(
   session: AsyncSession,
   redis_client: Redis,
@@ -153,18 +183,17 @@ async def handle_message(
       await session.commit()
       return
 
-    # Choose scraper backend based on configuration
-    scraper_backend = settings.ai.INSTAGRAM_SCRAPER
-    logger.info(f"Using Instagram scraper backend: {scraper_backend}")
+    # End the read transaction rather than hold it open through the scrape
+    await session.commit()
 
-    if scraper_backend == "PLAYWRIGHT":
-      # Use Playwright scraper (browser automation)
-      post_data = await scrape_instagram_post_with_playwright(
-        url=url, shortcode=post_id
+    if settings.scraper.SCRAPE_CACHE_ENABLED:
+      # The same post imported by many users is scraped only once
+      post_data = await get_scrape_cache(redis_client).get_or_scrape(
+        post_id,
+        lambda: scrape_post(redis_client, url, post_id),
       )
     else:
-      # Use instaloader (default)
-      post_data = await asyncio.to_thread(download_instagram_post, shortcode=post_id)
+      post_data = await scrape_post(redis_client, url, post_id)
 
     images_to_add = post_data["images"]
     username = post_data["owner_username"]
@@ -185,8 +214,15 @@ async def handle_message(
     )
 
     images = await create_images(session=session, images=images_to_add)
+
+    if settings.scraper.MEDIA_FETCH_ENABLED:
+      await _fetch_media(redis_client, task_id, images)
+
+    # The perceptual hash stays internal, like in the public image schema
+    images_dicts = [
+      image.model_dump(mode="json", exclude={"dhash"}) for image in images
+    ]
     await session.flush()
-    images_dicts = [image.model_dump(mode="json") for image in images]
 
     await _publish_task_update(
       redis_client,
@@ -247,7 +283,7 @@ async def _process_entry(redis_client: Redis, entry_id: str, data: dict):
       for k, v in data.items()
     }
 
-    async with AsyncSession(async_engine) as session:
+    async with async_session() as session:
       await handle_message(session, redis_client, payload)
 
     await redis_client.xack(REDIS_STREAM, CONSUMER_GROUP, entry_id)
@@ -6,7 +6,7 @@ import os
 import time
 from datetime import date, datetime, timedelta, timezone
 from json import JSONDecodeError
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 import httpx
@@ -17,13 +17,16 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.db import async_engine
+from app.core.db import async_session
+from app.data.image import find_similar_images, set_image_dhash
 from app.data.task import update_task
+from app.models import Compliment
 from app.schemas import TaskStatus, TaskUpdate
 from app.service.compliment_service import ComplimentService
 from app.service.gemini_service.gemini_service import GeminiService
 from app.service.image_service import ImageService
 from app.service.llama_service import LlamaService
+from app.utils.image_hash import dhash, is_informative
 
 load_dotenv()
 
@@ -79,6 +82,64 @@ async def _publish_task_update(
     logger.error(f"Failed to publish update to {stream_name}: {e}")
 
 
+async def _load_image_bytes(storage_key: str) -> bytes:
+  """Load image content from a base64 data URL or a remote URL."""
+
+  # Handle both URL-based images (Instagram) and base64 data URLs (uploads)
+  if storage_key.startswith("data:"):
+    # This is a base64 data URL (from file upload)
+    # Format: data:image/jpeg;base64,/9j/4AAQ...
+    try:
+      # Extract the base64 data part after the comma
+      _, encoded = storage_key.split(",", 1)
+      return base64.b64decode(encoded)
+
+    except Exception as e:
+      raise ValueError(f"Failed to decode base64 image data: {e}")
+
+  # This is a URL (from Instagram)
+  async with httpx.AsyncClient() as client:
+    http_response = await client.get(storage_key)
+    http_response.raise_for_status()
+    return http_response.content
+
+
+async def _reuse_duplicate_analysis(
+  session: AsyncSession,
+  compliment_service: ComplimentService,
+  image_id: UUID,
+  image_hash: int,
+) -> Optional[list[Compliment]]:
+  """
+  Reuse the compliments of an already analyzed duplicate image.
+
+  Returns the copied compliments, or None if no duplicate was found and
+  the image has to go through the LLM.
+  """
+
+  if not settings.ai.IMAGE_DEDUP_ENABLED or not is_informative(image_hash):
+    return None
+
+  duplicates = await find_similar_images(
+    session=session,
+    dhash=image_hash,
+    max_distance=settings.ai.IMAGE_DEDUP_MAX_DISTANCE,
+    exclude_image_id=image_id,
+    analyzed_only=True,
+  )
+  if not duplicates:
+    return None
+
+  logger.info(f"Image {image_id} duplicates analyzed image {duplicates[0].id}")
+
+  compliments = await compliment_service.copy_compliments(
+    source_image_id=duplicates[0].id,
+    image_id=image_id,
+  )
+
+  return compliments or None
+
+
 async def handle_message(
   session: AsyncSession,
   redis_client: Redis,
@@ -128,41 +189,66 @@ async def handle_message(
     if not image:
       raise ValueError(f"No primary image found for post ID {post_id}")
 
-    # Handle both URL-based images (Instagram) and base64 data URLs (uploads)
-    storage_key = image.storage_key
-    if storage_key.startswith("data:"):
-      # This is a base64 data URL (from file upload)
-      # Format: data:image/jpeg;base64,/9j/4AAQ...
-      try:
-        # Extract the base64 data part after the comma
-        header, encoded = storage_key.split(",", 1)
-        image_bytes = base64.b64decode(encoded)
-      except Exception as e:
-        raise ValueError(f"Failed to decode base64 image data: {e}")
-    else:
-      # This is a URL (from Instagram)
-      async with httpx.AsyncClient() as client:
-        http_response = await client.get(storage_key)
-        http_response.raise_for_status()
-        image_bytes = http_response.content
-
-    (
-      generation_metadata,
-      candidates_data,
-    ) = await llm_service.create_chat(image_bytes=image_bytes)
-
-    await compliment_service.create_compliments(
-      image_id=image.id,
-      generation_metadata_id=generation_metadata.id,
-      candidates=candidates_data,
-    )
+    # Uploads are hashed at ingest, so duplicates can be found without
+    # fetching the image at all
+    reused = None
+    image_hash = await image_service.get_dhash(image.id)
+    if image_hash is not None:
+      reused = await _reuse_duplicate_analysis(
+        session=session,
+        compliment_service=compliment_service,
+        image_id=image.id,
+        image_hash=image_hash,
+      )
+
+    if reused is None:
+      storage_key = await image_service.resolve_storage_key(image.storage_key)
+      if not storage_key:
+        raise ValueError(f"Referenced image content for post ID {post_id} is gone")
+
+      image_bytes = await _load_image_bytes(storage_key)
+
+      if image_hash is None and settings.ai.IMAGE_DEDUP_ENABLED:
+        try:
+          image_hash = await asyncio.to_thread(dhash, image_bytes)
+
+        except Exception as e:
+          logger.warning(f"Could not hash image {image.id}: {e}")
+          image_hash = None
+
+        if image_hash is not None:
+          await set_image_dhash(session=session, image_id=image.id, dhash=image_hash)
+
+          reused = await _reuse_duplicate_analysis(
+            session=session,
+            compliment_service=compliment_service,
+            image_id=image.id,
+            image_hash=image_hash,
+          )
+
+    generation_metadata = None
+    if reused is None:
+      (
+        generation_metadata,
+        candidates_data,
+      ) = await llm_service.create_chat(image_bytes=image_bytes)
+
+      await compliment_service.create_compliments(
+        image_id=image.id,
+        generation_metadata_id=generation_metadata.id,
+        candidates=candidates_data,
+      )
 
     await _publish_task_update(
       redis_client,
       task_id,
       {
         "status": TaskStatus.done.value,
-        "result": "Compliments created successfully",
+        "result": (
+          "Compliments reused from a duplicate image"
+          if reused is not None
+          else "Compliments created successfully"
+        ),
       },
     )
 
@@ -176,6 +262,8 @@ async def handle_message(
         ended_at=datetime.now(timezone.utc),
         duration=timedelta(seconds=time.monotonic() - start),
       ),
+      # Reused analyses made no model call and add no tokens
+      generation=generation_metadata,
     )
     await session.commit()
 
@@ -220,7 +308,7 @@ async def _process_entry(
       for k, v in data.items()
     }
 
-    async with AsyncSession(async_engine) as session:
+    async with async_session() as session:
       await handle_message(session, redis_client, payload)
 
     await redis_client.xack(REDIS_STREAM, CONSUMER_GROUP, entry_id)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+from redis.asyncio import Redis, from_url
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.data.outbox import claim_outbox_messages, delete_outbox_messages
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(
+  level=logging.INFO,
+  format="%(asctime)s %(levelname)s: %(message)s",
+)
+
+ERROR_BACKOFF_SECONDS = 1
+
+
+async def relay_batch(
+  session: AsyncSession,
+  redis_client: Redis,
+  batch_size: int,
+) -> int:
+  """
+  Publishes up to `batch_size` outbox messages to their Redis Streams.
+
+  The messages are locked, sent with one pipelined round trip and deleted
+  in the same transaction. If publishing fails the transaction is rolled
+  back and the messages are retried. Delivery is at least once: a crash
+  between the XADDs and the commit publishes them again.
+
+  Returns:
+    The number of messages published.
+  """
+
+  messages = await claim_outbox_messages(session, limit=batch_size)
+  if not messages:
+    return 0
+
+  try:
+    async with redis_client.pipeline(transaction=False) as pipe:
+      for message in messages:
+        pipe.xadd(message.stream, message.payload)  # type: ignore[arg-type]
+
+      await pipe.execute()
+
+  except RedisError:
+    await session.rollback()
+    raise
+
+  await delete_outbox_messages(
+    session,
+    [message.id for message in messages if message.id is not None],
+  )
+  await session.commit()
+
+  return len(messages)
+
+
+async def start_worker():
+  """Start the worker."""
+
+  redis_url = os.getenv("REDIS_URL")
+  if not redis_url:
+    logger.warning("REDIS_URL is not set!")
+    return
+
+  redis_client = from_url(redis_url, decode_responses=True)
+  batch_size = settings.db.OUTBOX_BATCH_SIZE
+  logger.info("Outbox relay worker started")
+
+  while True:
+    try:
+      async with async_session() as session:
+        published = await relay_batch(session, redis_client, batch_size)
+
+      if published:
+        logger.info(f"Published {published} outbox messages")
+
+      # A full batch means more messages are probably waiting
+      if published < batch_size:
+        await asyncio.sleep(settings.db.OUTBOX_POLL_INTERVAL_SECONDS)
+
+    except asyncio.CancelledError:
+      logger.info("Worker cancelled.")
+      break
+
+    except (SQLAlchemyError, RedisError):
+      logger.exception("Error relaying outbox messages")
+      await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+
+if __name__ == "__main__":
+  try:
+    asyncio.run(start_worker())
+
+  except KeyboardInterrupt:
+    print("Worker stopped by user.")
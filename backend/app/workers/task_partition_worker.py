@@ -0,0 +1,203 @@
+import asyncio
+import gzip
+import logging
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.data.task_partitions import (
+  TaskPartition,
+  add_months,
+  create_task_partitions,
+  detach_task_partition,
+  drop_task_partition,
+  list_default_months,
+  list_task_partitions,
+  month_start,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(
+  level=logging.INFO,
+  format="%(asctime)s %(levelname)s: %(message)s",
+)
+
+# DDL waits at most this long for locks instead of queueing writes behind it
+LOCK_TIMEOUT = "5s"
+
+
+def plan_partitions(
+  partitions: Sequence[TaskPartition],
+  today: date,
+  months_ahead: int,
+  retention_months: int,
+) -> Tuple[List[date], List[TaskPartition]]:
+  """
+  Decides which partitions to create and which to retire.
+
+  Returns:
+    The months from the current one to `months_ahead` ahead that have no
+    partition, and the tables older than the retention window, oldest first.
+  """
+
+  current = month_start(today)
+  existing = {partition.month for partition in partitions}
+
+  missing = [
+    month
+    for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+    if month not in existing
+  ]
+
+  cutoff = add_months(current, 1 - max(retention_months, 1))
+  expired = [partition for partition in partitions if partition.month < cutoff]
+
+  return missing, expired
+
+
+async def archive_partition(
+  conn: AsyncConnection,
+  partition: TaskPartition,
+  archive_dir: Path,
+) -> Path:
+  """
+  Streams a detached partition to a gzipped CSV file with a header row.
+
+  The file is written under a temporary name and renamed once complete,
+  so an archive that exists is never truncated.
+
+  Returns:
+    The archive path.
+  """
+
+  expected = await conn.scalar(text(f"SELECT count(*) FROM {partition.name}"))
+
+  archive_dir.mkdir(parents=True, exist_ok=True)
+  path = archive_dir / f"{partition.name}.csv.gz"
+  tmp_path = path.with_name(f"{path.name}.tmp")
+
+  raw = await conn.get_raw_connection()
+  async with raw.driver_connection.cursor() as cur:  # type: ignore[union-attr]
+    with gzip.open(tmp_path, "wb") as archive:
+      async with cur.copy(
+        f"COPY {partition.name} TO STDOUT WITH (FORMAT csv, HEADER)"
+      ) as copy:
+        async for chunk in copy:
+          archive.write(chunk)
+
+    copied = cur.rowcount
+
+  if copied != expected:
+    tmp_path.unlink(missing_ok=True)
+    raise RuntimeError(
+      f"Archived {copied} of {expected} rows from {partition.name}, keeping it"
+    )
+
+  os.replace(tmp_path, path)
+  return path
+
+
+async def _set_timeouts(conn: AsyncConnection) -> None:
+  """Sets the timeouts of the maintenance transaction that `conn` is in."""
+
+  # SET LOCAL ends with the transaction, so the pooled connection does not
+  # carry these back to the API
+  await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+  # Archiving a month of tasks can outlast the API's statement timeout
+  await conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+
+async def maintain_partitions(conn: AsyncConnection, today: date) -> None:
+  """
+  Creates upcoming task partitions and archives expired ones.
+
+  Tasks stranded in the default partition are moved into monthly ones.
+  Expired partitions are detached, copied to TASKS_ARCHIVE_DIR and then
+  dropped. Each step commits on its own and is idempotent, so a run that
+  fails part way is completed by the next one.
+  """
+
+  async with conn.begin():
+    await _set_timeouts(conn)
+
+    partitions = await list_task_partitions(conn)
+    missing, expired = plan_partitions(
+      partitions,
+      today=today,
+      months_ahead=settings.db.TASKS_PARTITION_MONTHS_AHEAD,
+      retention_months=settings.db.TASKS_RETENTION_MONTHS,
+    )
+
+    existing = {partition.month for partition in partitions}
+    stranded = [
+      month for month in await list_default_months(conn) if month not in existing
+    ]
+    if stranded:
+      logger.warning(
+        "Tasks of months without a partition are in the default partition: "
+        + ", ".join(month.isoformat() for month in stranded)
+      )
+
+    for name in await create_task_partitions(
+      conn, sorted(set(missing) | set(stranded))
+    ):
+      logger.info(f"Created partition {name}")
+
+  archive_dir = Path(settings.db.TASKS_ARCHIVE_DIR)
+
+  for partition in expired:
+    if partition.attached:
+      # Detaching locks tasks exclusively, so it commits before archiving
+      async with conn.begin():
+        await _set_timeouts(conn)
+        await detach_task_partition(conn, partition)
+
+      partition = partition._replace(attached=False, detach_pending=False)
+      logger.info(f"Detached partition {partition.name}")
+
+    async with conn.begin():
+      await _set_timeouts(conn)
+      path = await archive_partition(conn, partition, archive_dir)
+      await drop_task_partition(conn, partition)
+
+    logger.info(f"Archived partition {partition.name} to {path}")
+
+
+async def start_worker():
+  """Start the worker."""
+
+  interval = settings.db.TASKS_MAINTENANCE_INTERVAL_SECONDS
+  logger.info("Task partition worker started")
+
+  while True:
+    try:
+      async with async_engine.connect() as conn:
+        await maintain_partitions(conn, datetime.now(timezone.utc).date())
+
+      await asyncio.sleep(interval)
+
+    except asyncio.CancelledError:
+      logger.info("Worker cancelled.")
+      break
+
+    except (SQLAlchemyError, OSError, RuntimeError):
+      logger.exception("Error maintaining task partitions")
+      await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+  try:
+    asyncio.run(start_worker())
+
+  except KeyboardInterrupt:
+    print("Worker stopped by user.")